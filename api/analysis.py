@@ -1,59 +1,115 @@
 
-import re
+import os
 from collections import Counter
-from textblob import TextBlob
-from deep_translator import GoogleTranslator
+from functools import lru_cache
+from translation import translate_segments
+from sentiment import get_sentiment_backend
 import math
-import speech_recognition as sr
-import librosa
 import numpy as np
-import tempfile
-from concurrent.futures import ThreadPoolExecutor, as_completed
-
-
-def _translate_and_analyze(text):
-    try:
-        translated = GoogleTranslator(source='ar', target='en').translate(text)
-        polarity = TextBlob(translated).sentiment.polarity
-        if polarity > 0.1:
-            return "positive"
-        elif polarity < -0.1:
-            return "negative"
-        else:
-            return "neutral"
-    except Exception:
-        return "neutral"
-
-def analyze_sentiment(transcript):
+from keyword_matcher import KeywordMatcher
+from tokenization import TokenizedTranscript, normalize_phrase, surface_words
+from stages import Stage, run_stages
+from utils import decode_audio, AUDIO_SAMPLE_RATE
+from prosody import analyze_prosody
+
+# قواميس الكلمات المفتاحية لجميع المحللات، تُجمع في مطابق واحد يمر على النص مرة واحدة
+LEXICONS = {
+    # مؤشرات نفسية
+    "confidence": ["أعتقد", "أؤكد", "متأكد", "بالتأكيد", "بثقة", "أعرف", "مقتنع"],
+    "uncertainty": ["ربما", "قد", "ممكن", "لا أعرف", "غير متأكد", "أظن", "يبدو"],
+    "stress": ["توتر", "قلق", "خوف", "ضغط", "مشكلة", "صعب", "مؤلم", "أزمة"],
+    "emotional": ["حب", "فرح", "حزن", "غضب", "خوف", "أمل", "يأس", "سعادة"],
+    # مؤشرات الخداع والصدق
+    "deception": [
+        "في الواقع", "صدقني", "بصراحة", "والله", "أقسم",
+        "لا أكذب", "حقيقة", "أؤكد لك", "بالفعل", "حقاً"
+    ],
+    "deception_hesitation": [
+        "آآآ", "إممم", "يعني", "كيف أقول", "أقصد",
+        "بمعنى", "أي", "ألا وهو", "كما تعلم"
+    ],
+    # سمات الشخصية الخمس الكبرى
+    "openness": ["جديد", "مختلف", "إبداع", "فكرة", "تجربة", "مغامرة", "تغيير"],
+    "conscientiousness": ["منظم", "دقيق", "مسؤول", "الوقت", "خطة", "هدف", "إنجاز"],
+    "extraversion": ["اجتماع", "ناس", "أصدقاء", "حفلة", "نشاط", "طاقة", "متحمس"],
+    "agreeableness": ["مساعدة", "تعاون", "لطيف", "صبر", "تفهم", "احترام", "سلام"],
+    "neuroticism": ["قلق", "توتر", "خوف", "حزن", "غضب", "ضغط", "مشكلة"],
+    # جودة الاستجابة
+    "depth": ["تحليل", "أثبت", "ناقش", "استنتج", "يفسر", "مقارنة", "تقييم", "أسباب", "نتائج", "أدلة"],
+    "specificity": ["تحديدًا", "بالضبط", "تشير الأبحاث", "في عام", "حسب دراسة",
+                    "في مجال", "وفقًا لـ", "تجربة", "اسم باحث", "نوع معين", "مكان معين"],
+    "examples": ["مثال", "مثل"],
+    "analytical": ["تحليل", "أثبت", "استنتج", "ناقش"],
+    "field": ["مجال", "موضوع", "تخصص"],
+    "precision": ["بالضبط", "تحديدًا", "على وجه التحديد", "بالتفصيل"],
+    "coherence": ["لذلك", "بالتالي", "علاوة على ذلك", "من ناحية أخرى"],
+    # أنماط التردد
+    "hesitation_sounds": ["ممم", "اااه", "هممم", "إيه", "ازاي", "يعني كده"],
+    # مستوى المشاركة
+    "engagement_high": ['لماذا', 'كيف', 'هل يمكن', 'أعتقد', 'برأيي', 'اقتراح', 'سؤال', 'نقاش', 'ما رأيكم'],
+    "engagement_medium": ['جميل', 'مفيد', 'شكرا', 'ممتاز', 'رائع', 'أحببت', 'موافق'],
+    "engagement_low": ['.', '...', 'نعم', 'لا'],
+}
+
+# المهارات الناعمة
+SOFT_SKILLS_KEYWORDS = {
+    "التواصل": ["تواصل", "إقناع", "استماع", "عرض", "شرح", "نقاش", "حوار", "توضيح"],
+    "القيادة": ["قيادة", "توجيه", "إلهام", "إدارة", "تحفيز", "ريادة", "مسؤولية"],
+    "العمل الجماعي": ["فريق", "تعاون", "تنسيق", "جماعي", "مشترك", "شراكة"],
+    "حل المشكلات": ["حل", "مشكلة", "تحدي", "تحليل", "حلول", "معالجة"],
+    "التفكير النقدي": ["تفكير", "نقد", "منطق", "أدلة", "تقييم", "استنتاج"],
+    "إدارة الوقت": ["تنظيم", "وقت", "جدول", "التزام", "أولوية", "تخطيط"],
+    "المرونة": ["تأقلم", "مرونة", "ظروف", "تغيير", "تكيف", "استجابة"],
+    "الإبداع": ["ابتكار", "إبداع", "أفكار", "خارج الصندوق", "خلاقة", "مبتكر"]
+}
+for _skill, _keywords in SOFT_SKILLS_KEYWORDS.items():
+    LEXICONS[f"soft_skill:{_skill}"] = _keywords
+
+# مهلة مرحلة الترجمة وتحليل المشاعر، أطول من بقية المراحل لأنها تعتمد على الشبكة
+SENTIMENT_STAGE_TIMEOUT = float(os.getenv("SENTIMENT_STAGE_TIMEOUT", "300"))
+
+_keyword_matcher = None
+
+def scan_keywords(text):
+    """مسح النص مرة واحدة لجميع القواميس وإرجاع مواضع كل كلمة"""
+    global _keyword_matcher
+    if _keyword_matcher is None:
+        _keyword_matcher = KeywordMatcher(LEXICONS)
+    return _keyword_matcher.scan(text)
+
+
+def analyze_sentiment(transcript, sentiment_result=None):
+    """تحليل المشاعر باستخدام الواجهة الخلفية المحددة (SENTIMENT_BACKEND)"""
+    backend = get_sentiment_backend()
+    if sentiment_result is None:
+        sentiment_result = backend.analyze([item['text'] for item in transcript])
     sentiments = {"positive": 0, "neutral": 0, "negative": 0}
     total = len(transcript)
-    with ThreadPoolExecutor(max_workers=8) as executor:
-        futures = [executor.submit(_translate_and_analyze, item['text']) for item in transcript]
-        for future in as_completed(futures):
-            result = future.result()
-            sentiments[result] += 1
+    for label in sentiment_result.labels:
+        sentiments[label] += 1
     for k in sentiments:
         sentiments[k] = f"{round((sentiments[k] / total) * 100, 2)}%"
+    sentiments["backend"] = backend.name
+    # المقاطع التي اعتُبرت محايدة بسبب فشل الترجمة أو التحليل
+    sentiments["unscored_segments"] = sentiment_result.unscored
     return sentiments
 
-def analyze_psychological_patterns(transcript):
+def analyze_psychological_patterns(transcript, hits=None, tokens=None):
     """تحليل نفسي متقدم للأنماط السلوكية والشخصية"""
-    text = " ".join([item['text'] for item in transcript])
-    total_words = len(text.split())
+    if tokens is None:
+        tokens = TokenizedTranscript(transcript)
+    total_words = tokens.total_words
+    if hits is None:
+        hits = scan_keywords(tokens.text)
     
     # مؤشرات نفسية
-    confidence_indicators = ["أعتقد", "أؤكد", "متأكد", "بالتأكيد", "بثقة", "أعرف", "مقتنع"]
-    uncertainty_indicators = ["ربما", "قد", "ممكن", "لا أعرف", "غير متأكد", "أظن", "يبدو"]
-    stress_indicators = ["توتر", "قلق", "خوف", "ضغط", "مشكلة", "صعب", "مؤلم", "أزمة"]
-    emotional_words = ["حب", "فرح", "حزن", "غضب", "خوف", "أمل", "يأس", "سعادة"]
-    
-    confidence_score = sum(1 for word in confidence_indicators if word in text)
-    uncertainty_score = sum(1 for word in uncertainty_indicators if word in text)
-    stress_level = sum(1 for word in stress_indicators if word in text)
-    emotional_intensity = sum(1 for word in emotional_words if word in text)
+    confidence_score = hits.presence_count("confidence")
+    uncertainty_score = hits.presence_count("uncertainty")
+    stress_level = hits.presence_count("stress")
+    emotional_intensity = hits.presence_count("emotional")
     
     # تحليل سرعة الكلام النفسية
-    speech_rate = calculate_overall_speech_rate(transcript)
+    speech_rate = calculate_overall_speech_rate(transcript, tokens)
     
     psychological_profile = {
         "confidence_level": min(100, (confidence_score / max(1, uncertainty_score)) * 20),
@@ -84,26 +140,18 @@ def get_speech_pattern_meaning(rate):
     else:
         return "سرعة منخفضة جداً - قد يشير إلى تردد أو قلق"
 
-def analyze_deception_indicators(transcript):
+def analyze_deception_indicators(transcript, hits=None, tokens=None):
     """تحليل مؤشرات الخداع والصدق"""
-    deception_words = [
-        "في الواقع", "صدقني", "بصراحة", "والله", "أقسم", 
-        "لا أكذب", "حقيقة", "أؤكد لك", "بالفعل", "حقاً"
-    ]
-    
-    hesitation_patterns = [
-        "آآآ", "إممم", "يعني", "كيف أقول", "أقصد", 
-        "بمعنى", "أي", "ألا وهو", "كما تعلم"
-    ]
-    
-    text = " ".join([item['text'] for item in transcript])
+    if tokens is None:
+        tokens = TokenizedTranscript(transcript)
+    if hits is None:
+        hits = scan_keywords(tokens.text)
     
-    deception_score = sum(1 for word in deception_words if word in text)
-    hesitation_score = sum(1 for pattern in hesitation_patterns if pattern in text)
+    deception_score = hits.presence_count("deception")
+    hesitation_score = hits.presence_count("deception_hesitation")
     
     # تحليل التكرار المفرط
-    word_frequency = Counter(text.split())
-    repetition_score = sum(1 for count in word_frequency.values() if count > 5)
+    repetition_score = sum(1 for count in tokens.frequencies.values() if count > 5)
     
     credibility_analysis = {
         "deception_indicators": deception_score,
@@ -131,31 +179,15 @@ def get_credibility_notes(deception, hesitation, repetition):
         
     return notes
 
-def analyze_personality_traits(transcript):
+def analyze_personality_traits(transcript, hits=None):
     """تحليل سمات الشخصية الخمس الكبرى"""
-    text = " ".join([item['text'] for item in transcript])
-    
-    # الانفتاح على التجربة
-    openness_words = ["جديد", "مختلف", "إبداع", "فكرة", "تجربة", "مغامرة", "تغيير"]
-    
-    # الضمير الحي
-    conscientiousness_words = ["منظم", "دقيق", "مسؤول", "الوقت", "خطة", "هدف", "إنجاز"]
-    
-    # الانبساط
-    extraversion_words = ["اجتماع", "ناس", "أصدقاء", "حفلة", "نشاط", "طاقة", "متحمس"]
-    
-    # الوداعة
-    agreeableness_words = ["مساعدة", "تعاون", "لطيف", "صبر", "تفهم", "احترام", "سلام"]
-    
-    # العصابية
-    neuroticism_words = ["قلق", "توتر", "خوف", "حزن", "غضب", "ضغط", "مشكلة"]
+    if hits is None:
+        hits = scan_keywords(" ".join([item['text'] for item in transcript]))
     
+    # الانفتاح، الضمير الحي، الانبساط، الوداعة، العصابية
     traits = {
-        "openness": sum(1 for word in openness_words if word in text),
-        "conscientiousness": sum(1 for word in conscientiousness_words if word in text), 
-        "extraversion": sum(1 for word in extraversion_words if word in text),
-        "agreeableness": sum(1 for word in agreeableness_words if word in text),
-        "neuroticism": sum(1 for word in neuroticism_words if word in text)
+        trait: hits.presence_count(trait)
+        for trait in ["openness", "conscientiousness", "extraversion", "agreeableness", "neuroticism"]
     }
     
     # تحويل إلى نسب مئوية
@@ -185,46 +217,44 @@ def get_personality_summary(profile):
     
     return summaries.get(dominant, "شخصية متوازنة")
 
-def translate_to_english(transcript):
+def translate_to_english(transcript, translations=None, placeholder="[Translation failed] Please check internet connection"):
     """ترجمة النص العربي إلى الإنجليزية الفعلية"""
-    translations = []
-    for t in transcript:
-        try:
-            # ترجمة النص العربي إلى الإنجليزية
-            translated_text = GoogleTranslator(source='ar', target='en').translate(t['text'])
-            translations.append({
+    if translations is None:
+        translations = translate_segments([item['text'] for item in transcript])
+    output = []
+    for t, translated_text in zip(transcript, translations):
+        if translated_text is not None:
+            output.append({
                 "start": t["start"],
                 "end": t["end"],
                 "arabic_text": t['text'],  # النص العربي الأصلي
                 "english_text": translated_text  # الترجمة الإنجليزية
             })
-        except Exception as e:
-            print(f"Translation error: {e}")
+        else:
             # في حالة فشل الترجمة، احتفظ بالنص الأصلي مع ملاحظة
-            translations.append({
+            output.append({
                 "start": t["start"], 
                 "end": t["end"],
                 "arabic_text": t['text'],
-                "english_text": f"[Translation failed] Please check internet connection"
+                "english_text": placeholder
             })
-    return translations
+    return output
 
-def analyze_word_repetition(transcript):
+def analyze_word_repetition(transcript, tokens=None):
     """تحليل تكرار الكلام وما يدل عليه نفسياً"""
-    text = " ".join([item['text'] for item in transcript])
-    words = text.split()
-    word_frequency = Counter(words)
+    if tokens is None:
+        tokens = TokenizedTranscript(transcript)
     
     # تحليل التكرار
-    total_words = len(words)
-    unique_words = len(set(words))
+    total_words = tokens.total_words
+    unique_words = tokens.unique_words
     repetition_ratio = (total_words - unique_words) / total_words if total_words > 0 else 0
     
-    # الكلمات الأكثر تكراراً
-    most_repeated = word_frequency.most_common(10)
+    # الكلمات الأكثر تكراراً (تُعرض بالصيغة المنطوقة)
+    most_repeated = [(tokens.surface(word), count) for word, count in tokens.frequencies.most_common(10)]
     
     # تحليل أنماط التكرار
-    excessive_repetition = [word for word, count in word_frequency.items() if count > 5 and len(word) > 2]
+    excessive_repetition = [tokens.surface(word) for word, count in tokens.frequencies.items() if count > 5 and len(word) > 2]
     
     # التفسير النفسي للتكرار
     psychological_meaning = get_repetition_psychological_meaning(repetition_ratio, excessive_repetition)
@@ -280,59 +310,115 @@ def get_repetition_level(ratio):
     else:
         return "منخفض"
 
-def count_total_words(transcript):
-    return sum(len(item['text'].split()) for item in transcript)
-    return sum(len(item['text'].split()) for item in transcript)
+def count_total_words(transcript, tokens=None):
+    if tokens is None:
+        tokens = TokenizedTranscript(transcript)
+    return tokens.total_words
 
-def get_frequent_words(transcript, top_n=10):
-    text = " ".join([item['text'] for item in transcript])
-    # إزالة الكلمات الشائعة
-    stop_words = ["في", "من", "على", "إلى", "عن", "مع", "هذا", "هذه", "ذلك", "التي", "الذي", "و", "أن", "لا", "ما", "كان", "كانت"]
-    words = [word for word in re.findall(r'\b\w+\b', text) if word not in stop_words and len(word) > 2]
-    counter = Counter(words)
-    return counter.most_common(top_n)
+# الكلمات الشائعة المستبعدة من الكلمات الأكثر تكراراً
+STOP_WORDS = ["في", "من", "على", "إلى", "عن", "مع", "هذا", "هذه", "ذلك", "التي", "الذي", "و", "أن", "لا", "ما", "كان", "كانت"]
+_NORMALIZED_STOP_WORDS = {normalize_phrase(word)[0] for word in STOP_WORDS}
 
-def calculate_overall_speech_rate(transcript):
-    total_words = sum(len(item['text'].split()) for item in transcript)
+def get_frequent_words(transcript, top_n=10, tokens=None):
+    if tokens is None:
+        tokens = TokenizedTranscript(transcript)
+    # إزالة الكلمات الشائعة
+    counter = Counter({word: count for word, count in tokens.frequencies.items()
+                       if word not in _NORMALIZED_STOP_WORDS and len(word) > 2})
+    return [(tokens.surface(word), count) for word, count in counter.most_common(top_n)]
+
+def calculate_overall_speech_rate(transcript, tokens=None):
+    if tokens is None:
+        tokens = TokenizedTranscript(transcript)
+    total_words = tokens.total_words
     total_duration = sum(item['end'] - item['start'] for item in transcript)
     return total_words / total_duration if total_duration > 0 else 0.0
 
+# قائمة الكلمات الحساسة الافتراضية
+SENSITIVE_WORDS = [
+    "تهديد", "سلاح", "خيانة", "تفجير", "اغتيال", "قتل",
+    "عنف", "إرهاب", "مؤامرة", "اعتداء", "انفجار", "رصاص",
+    "هجوم", "كمين", "حرب", "صراع", "دمار", "ذبح", "مسدس",
+    "مجزرة", "موت", "مهاجمة", "تفخيخ", "قنص", "عدوان",
+    "خطف", "ابتزاز", "جريمة", "دماء", "إصابة", "معركة",
+    "قنبلة", "عبوة ناسفة", "اجتياح", "عصابة", "تحريض"
+]
+
+@lru_cache(maxsize=32)
+def _sensitive_matcher(words):
+    """مطابق مُجمّع لكل قائمة مراقبة، يُبنى مرة واحدة ويُعاد استخدامه"""
+    return KeywordMatcher({"sensitive": words})
+
+def _word_spans(segment):
+    """مواضع كلمات Whisper داخل نص المقطع مع توقيتاتها"""
+    text = segment['text']
+    spans = []
+    cursor = 0
+    for word in segment.get('words') or []:
+        token = word['word'].strip()
+        index = text.find(token, cursor) if token else -1
+        if index == -1:
+            continue
+        spans.append((index, index + len(token), word['start'], word['end']))
+        cursor = index + len(token)
+    return spans
+
+def _occurrence_timing(segment, spans, char_start, char_end):
+    """توقيت الكلمة الحساسة من كلمات Whisper، أو تقدير خطي داخل المقطع عند غيابها"""
+    covered = [span for span in spans if span[0] < char_end and span[1] > char_start]
+    if covered:
+        return covered[0][2], covered[-1][3], "word"
+    length = len(segment['text']) or 1
+    duration = segment['end'] - segment['start']
+    return (segment['start'] + duration * char_start / length,
+            segment['start'] + duration * char_end / length,
+            "estimated")
+
 def detect_sensitive_words(transcript, sensitive_words=None):
-    if sensitive_words is None:
-        sensitive_words = [
-            "تهديد", "سلاح", "خيانة", "تفجير", "اغتيال", "قتل",
-            "عنف", "إرهاب", "مؤامرة", "اعتداء", "انفجار", "رصاص",
-            "هجوم", "كمين", "حرب", "صراع", "دمار", "ذبح", "مسدس",
-            "مجزرة", "موت", "مهاجمة", "تفخيخ", "قنص", "عدوان",
-            "خطف", "ابتزاز", "جريمة", "دماء", "إصابة", "معركة",
-            "قنبلة", "عبوة ناسفة", "اجتياح", "عصابة", "تحريض"
-        ]
+    """كشف الكلمات الحساسة بمسح واحد لكل مقطع مع مواضع الأحرف وتوقيت الكلمات"""
+    words = tuple(dict.fromkeys(w.strip() for w in (sensitive_words or SENSITIVE_WORDS) if w and w.strip()))
+    matcher = _sensitive_matcher(words)
     alerts = []
     for item in transcript:
-        for word in sensitive_words:
-            if word in item['text']:
-                alerts.append({
-                    "start": item["start"],
-                    "end": item["end"],
-                    "word": word,
-                    "text": item['text']
+        hits = matcher.scan(item['text'])
+        found = hits.found("sensitive")
+        if not found:
+            continue
+        spans = _word_spans(item)
+        for word in found:
+            occurrences = []
+            for char_start in hits.positions[word]:
+                char_end = char_start + len(word)
+                start, end, timing = _occurrence_timing(item, spans, char_start, char_end)
+                occurrences.append({
+                    "char_start": char_start,
+                    "char_end": char_end,
+                    "start": round(start, 2),
+                    "end": round(end, 2),
+                    "timing": timing
                 })
+            alerts.append({
+                "start": item["start"],
+                "end": item["end"],
+                "word": word,
+                "text": item['text'],
+                "occurrences": occurrences
+            })
     return alerts
 
-def generate_comprehensive_report(analysis_data, transcript):
-    """إنشاء تقرير شامل للتحليل النفسي والجنائي باللغة العربية"""
-    
-    # حساب المؤشرات الرئيسية
-    speech_rate = analysis_data.get('speech_rate_wps', 0)
-    total_words = analysis_data.get('total_words', 0)
+def _report_indicators(analysis_data):
+    """المؤشرات الرئيسية التي تشترك فيها أقسام التقرير"""
     sentiment = analysis_data.get('sentiment', {})
-    repetition_data = analysis_data.get('word_repetition_analysis', {})
-    
-    positive_pct = float(sentiment.get('positive', '0%').replace('%', ''))
-    negative_pct = float(sentiment.get('negative', '0%').replace('%', ''))
-    
-    report = {
-        "executive_summary": f"""
+    return {
+        "speech_rate": analysis_data.get('speech_rate_wps', 0),
+        "total_words": analysis_data.get('total_words', 0),
+        "repetition_data": analysis_data.get('word_repetition_analysis', {}),
+        "positive_pct": float(sentiment.get('positive', '0%').replace('%', '')),
+        "negative_pct": float(sentiment.get('negative', '0%').replace('%', '')),
+    }
+
+def _executive_summary(analysis_data, speech_rate, total_words, repetition_data, positive_pct, negative_pct):
+    return f"""
 📋 الملخص التنفيذي للتحليل النفسي والجنائي:
 
 🔍 البيانات الأساسية:
@@ -347,51 +433,83 @@ def generate_comprehensive_report(analysis_data, transcript):
 
 🧠 نمط الشخصية المهيمن:
 {get_personality_classification(positive_pct, negative_pct, speech_rate)}
-        """,
-        
-        "speech_pattern_analysis": {
-            "rate_analysis": get_arabic_speech_analysis(speech_rate),
-            "consistency_rating": "متسق ومنتظم" if 1.5 <= speech_rate <= 2.5 else "غير منتظم وقد يشير لتوتر",
-            "psychological_indicators": get_speech_psychological_indicators(speech_rate),
-            "forensic_assessment": get_forensic_speech_assessment(speech_rate)
-        },
-        
-        "repetition_analysis": {
-            "overview": f"مستوى التكرار: {repetition_data.get('repetition_level', 'غير محدد')}",
-            "psychological_meaning": repetition_data.get('psychological_analysis', []),
-            "excessive_words": repetition_data.get('excessive_repetition', []),
-            "interpretation": get_repetition_interpretation(repetition_data.get('repetition_ratio', 0))
-        },
-        
-        "emotional_stability": {
-            "overall_rating": get_emotional_stability_rating(negative_pct),
-            "risk_assessment": get_risk_assessment(negative_pct, speech_rate),
-            "recommendations": get_emotional_recommendations(negative_pct, positive_pct)
-        },
-        
-        "psychological_profile": {
-            "communication_style": get_arabic_communication_style(speech_rate, total_words),
-            "dominant_traits": get_arabic_dominant_traits(positive_pct, negative_pct, speech_rate),
-            "behavioral_indicators": get_behavioral_indicators(analysis_data),
-            "personality_assessment": get_personality_assessment(positive_pct, negative_pct)
-        },
-        
-        "forensic_analysis": {
-            "credibility_assessment": get_credibility_assessment(analysis_data),
-            "deception_indicators": get_deception_summary(analysis_data),
-            "interview_suitability": calculate_interview_suitability(analysis_data),
-            "risk_factors": identify_risk_factors(analysis_data)
-        },
-        
-        "final_recommendations": {
-            "psychological_development": get_psychological_recommendations(positive_pct, negative_pct, speech_rate),
-            "communication_improvement": get_communication_recommendations(speech_rate, repetition_data),
-            "professional_suitability": get_professional_assessment(analysis_data),
-            "follow_up_suggestions": get_followup_suggestions(analysis_data)
-        }
+        """
+
+def _speech_pattern_analysis(analysis_data, speech_rate, **_):
+    return {
+        "rate_analysis": get_arabic_speech_analysis(speech_rate),
+        "consistency_rating": "متسق ومنتظم" if 1.5 <= speech_rate <= 2.5 else "غير منتظم وقد يشير لتوتر",
+        "psychological_indicators": get_speech_psychological_indicators(speech_rate),
+        "forensic_assessment": get_forensic_speech_assessment(speech_rate)
+    }
+
+def _repetition_analysis(analysis_data, repetition_data, **_):
+    return {
+        "overview": f"مستوى التكرار: {repetition_data.get('repetition_level', 'غير محدد')}",
+        "psychological_meaning": repetition_data.get('psychological_analysis', []),
+        "excessive_words": repetition_data.get('excessive_repetition', []),
+        "interpretation": get_repetition_interpretation(repetition_data.get('repetition_ratio', 0))
+    }
+
+def _emotional_stability(analysis_data, speech_rate, positive_pct, negative_pct, **_):
+    return {
+        "overall_rating": get_emotional_stability_rating(negative_pct),
+        "risk_assessment": get_risk_assessment(negative_pct, speech_rate),
+        "recommendations": get_emotional_recommendations(negative_pct, positive_pct)
+    }
+
+def _psychological_profile(analysis_data, speech_rate, total_words, positive_pct, negative_pct, **_):
+    return {
+        "communication_style": get_arabic_communication_style(speech_rate, total_words),
+        "dominant_traits": get_arabic_dominant_traits(positive_pct, negative_pct, speech_rate),
+        "behavioral_indicators": get_behavioral_indicators(analysis_data),
+        "personality_assessment": get_personality_assessment(positive_pct, negative_pct)
+    }
+
+def _forensic_analysis(analysis_data, **_):
+    return {
+        "credibility_assessment": get_credibility_assessment(analysis_data),
+        "deception_indicators": get_deception_summary(analysis_data),
+        "interview_suitability": calculate_interview_suitability(analysis_data),
+        "risk_factors": identify_risk_factors(analysis_data)
+    }
+
+def _final_recommendations(analysis_data, speech_rate, repetition_data, positive_pct, negative_pct, **_):
+    return {
+        "psychological_development": get_psychological_recommendations(positive_pct, negative_pct, speech_rate),
+        "communication_improvement": get_communication_recommendations(speech_rate, repetition_data),
+        "professional_suitability": get_professional_assessment(analysis_data),
+        "follow_up_suggestions": get_followup_suggestions(analysis_data)
     }
-    
-    return report
+
+# أقسام التقرير الشامل بترتيبها؛ كل قسم يُبنى مستقلاً عند طلبه
+REPORT_SECTIONS = {
+    "executive_summary": _executive_summary,
+    "speech_pattern_analysis": _speech_pattern_analysis,
+    "repetition_analysis": _repetition_analysis,
+    "emotional_stability": _emotional_stability,
+    "psychological_profile": _psychological_profile,
+    "forensic_analysis": _forensic_analysis,
+    "final_recommendations": _final_recommendations,
+}
+
+def generate_comprehensive_report(analysis_data, transcript=None, sections=None):
+    """إنشاء تقرير شامل للتحليل النفسي والجنائي باللغة العربية
+
+    `sections` أسماء الأقسام المطلوبة فقط (الافتراضي: جميع الأقسام)
+    """
+    indicators = _report_indicators(analysis_data)
+    return {name: REPORT_SECTIONS[name](analysis_data, **indicators)
+            for name in (sections or REPORT_SECTIONS)}
+
+def report_for_result(result, sections=None):
+    """بناء أقسام التقرير من نتيجة تحليل مخزنة، متجاهلاً المراحل التي فشلت
+
+    لم يعد التقرير يُبنى داخل analyze_all؛ يُولّد عند طلبه من النتيجة.
+    """
+    failed = result.get("stage_errors", {})
+    analysis_data = {name: result[name] for name in OUTPUT_STAGES if name in result and name not in failed}
+    return generate_comprehensive_report(analysis_data, sections=sections)
 
 def get_personality_classification(positive, negative, rate):
     """تصنيف الشخصية الرئيسي"""
@@ -669,28 +787,23 @@ def get_professional_assessment(analysis_data):
     else:
         return "يحتاج تطوير مهني"
 
-def evaluate_response_quality(text):
+def evaluate_response_quality(text, hits=None):
     """تقييم جودة الاستجابة - العمق والخصوصية"""
     score = 0
-
-    # كلمات العمق
-    depth_keywords = ["تحليل", "أثبت", "ناقش", "استنتج", "يفسر", "مقارنة", "تقييم", "أسباب", "نتائج", "أدلة"]
-    
-    # كلمات الخصوصية
-    specificity_keywords = ["تحديدًا", "بالضبط", "تشير الأبحاث", "في عام", "حسب دراسة",
-                           "في مجال", "وفقًا لـ", "تجربة", "اسم باحث", "نوع معين", "مكان معين"]
+    if hits is None:
+        hits = scan_keywords(text)
 
     # تقييم العمق
-    if any(word in text for word in depth_keywords):
+    if hits.any("depth"):
         score += 0.5
 
     # تقييم الخصوصية
-    if any(word in text for word in specificity_keywords):
+    if hits.any("specificity"):
         score += 0.5
 
     # تقييمات إضافية
     # وجود أمثلة
-    if "مثال" in text or "مثل" in text:
+    if hits.any("examples"):
         score += 0.15
 
     # الطول وعدد الجمل
@@ -698,19 +811,19 @@ def evaluate_response_quality(text):
         score += 0.15
 
     # وجود كلمات تحليلية
-    if any(w in text for w in ["تحليل", "أثبت", "استنتج", "ناقش"]):
+    if hits.any("analytical"):
         score += 0.2
 
     # التخصص أو ذكر مجال محدد
-    if any(w in text for w in ["مجال", "موضوع", "تخصص"]):
+    if hits.any("field"):
         score += 0.15
 
     # دقة/خصوصية
-    if any(w in text for w in ["بالضبط", "تحديدًا", "على وجه التحديد", "بالتفصيل"]):
+    if hits.any("precision"):
         score += 0.15
 
     # ترابط ووضوح
-    if any(w in text for w in ["لذلك", "بالتالي", "علاوة على ذلك", "من ناحية أخرى"]):
+    if hits.any("coherence"):
         score += 0.2
 
     final_score = round(min(score, 1.0), 2)
@@ -727,28 +840,25 @@ def evaluate_response_quality(text):
     return {
         "score": final_score,
         "level": level,
-        "depth_indicators": [word for word in depth_keywords if word in text],
-        "specificity_indicators": [word for word in specificity_keywords if word in text]
+        "depth_indicators": hits.found("depth"),
+        "specificity_indicators": hits.found("specificity")
     }
 
-def analyze_hesitation_patterns(text):
+def analyze_hesitation_patterns(text, hits=None, tokens=None):
     """تحليل أنماط التردد وكلمات الحشو"""
-    import re
-    from collections import Counter
+    if tokens is None:
+        tokens = TokenizedTranscript.from_text(text)
+    if hits is None:
+        hits = scan_keywords(text)
     
-    # كلمات الحشو والتردد الشائعة في العربية
+    # كلمات الحشو الشائعة في العربية (تُعد ككلمات أو عبارات كاملة)
     filler_words = ["يعني", "هو", "بس", "كده", "اه", "ايوة", "طيب", "خلاص", "ما هو", "يا إما"]
-    hesitation_patterns = ["ممم", "اااه", "هممم", "إيه", "ازاي", "يعني كده"]
-    
-    # تنظيف النص
-    text_clean = re.sub(r'[^\w\s]', '', text.lower())
-    words = text_clean.split()
     
     # حساب كلمات الحشو
     filler_count = {}
     total_fillers = 0
     for word in filler_words:
-        count = words.count(word)
+        count = tokens.count(word)
         if count > 0:
             filler_count[word] = count
             total_fillers += count
@@ -756,14 +866,14 @@ def analyze_hesitation_patterns(text):
     # حساب أنماط التردد
     hesitation_count = {}
     total_hesitations = 0
-    for pattern in hesitation_patterns:
-        count = text.lower().count(pattern)
+    for pattern in LEXICONS["hesitation_sounds"]:
+        count = hits.count_non_overlapping(pattern)
         if count > 0:
             hesitation_count[pattern] = count
             total_hesitations += count
     
     # حساب النسب
-    total_words = len(words)
+    total_words = tokens.total_words
     filler_ratio = (total_fillers / total_words * 100) if total_words > 0 else 0
     hesitation_ratio = (total_hesitations / total_words * 100) if total_words > 0 else 0
     
@@ -787,28 +897,16 @@ def analyze_hesitation_patterns(text):
         "total_hesitations": total_hesitations
     }
 
-def detect_soft_skills(text):
+def detect_soft_skills(text, hits=None):
     """كشف المهارات الناعمة"""
-    
-    soft_skills_keywords = {
-        "التواصل": ["تواصل", "إقناع", "استماع", "عرض", "شرح", "نقاش", "حوار", "توضيح"],
-        "القيادة": ["قيادة", "توجيه", "إلهام", "إدارة", "تحفيز", "ريادة", "مسؤولية"],
-        "العمل الجماعي": ["فريق", "تعاون", "تنسيق", "جماعي", "مشترك", "شراكة"],
-        "حل المشكلات": ["حل", "مشكلة", "تحدي", "تحليل", "حلول", "معالجة"],
-        "التفكير النقدي": ["تفكير", "نقد", "منطق", "أدلة", "تقييم", "استنتاج"],
-        "إدارة الوقت": ["تنظيم", "وقت", "جدول", "التزام", "أولوية", "تخطيط"],
-        "المرونة": ["تأقلم", "مرونة", "ظروف", "تغيير", "تكيف", "استجابة"],
-        "الإبداع": ["ابتكار", "إبداع", "أفكار", "خارج الصندوق", "خلاقة", "مبتكر"]
-    }
+    if hits is None:
+        hits = scan_keywords(text)
     
     found_skills = {}
     skill_scores = {}
     
-    for skill, keywords in soft_skills_keywords.items():
-        skill_keywords_found = []
-        for keyword in keywords:
-            if keyword in text:
-                skill_keywords_found.append(keyword)
+    for skill, keywords in SOFT_SKILLS_KEYWORDS.items():
+        skill_keywords_found = hits.found(f"soft_skill:{skill}")
         
         if skill_keywords_found:
             found_skills[skill] = skill_keywords_found
@@ -821,18 +919,15 @@ def detect_soft_skills(text):
         "skills_count": len(found_skills)
     }
 
-def measure_engagement_level(text):
+def measure_engagement_level(text, hits=None):
     """قياس مستوى المشاركة والحماس"""
+    # القواميس لا تحتوي على حروف لاتينية، لذا لا حاجة لتحويل النص إلى أحرف صغيرة
+    if hits is None:
+        hits = scan_keywords(text)
     
-    high_engagement_keywords = ['لماذا', 'كيف', 'هل يمكن', 'أعتقد', 'برأيي', 'اقتراح', 'سؤال', 'نقاش', 'ما رأيكم']
-    medium_engagement_keywords = ['جميل', 'مفيد', 'شكرا', 'ممتاز', 'رائع', 'أحببت', 'موافق']
-    low_engagement_keywords = ['.', '...', 'نعم', 'لا']
-    
-    text_lower = text.lower()
-    
-    high_score = sum(1 for word in high_engagement_keywords if word in text_lower)
-    medium_score = sum(1 for word in medium_engagement_keywords if word in text_lower)
-    low_score = sum(1 for word in low_engagement_keywords if word in text_lower)
+    high_score = hits.presence_count("engagement_high")
+    medium_score = hits.presence_count("engagement_medium")
+    low_score = hits.presence_count("engagement_low")
     
     total_indicators = high_score + medium_score + low_score
     
@@ -853,9 +948,9 @@ def measure_engagement_level(text):
         "medium_engagement_count": medium_score,
         "low_engagement_count": low_score,
         "engagement_indicators": {
-            "high": [word for word in high_engagement_keywords if word in text_lower],
-            "medium": [word for word in medium_engagement_keywords if word in text_lower],
-            "low": [word for word in low_engagement_keywords if word in text_lower]
+            "high": hits.found("engagement_high"),
+            "medium": hits.found("engagement_medium"),
+            "low": hits.found("engagement_low")
         }
     }
 
@@ -967,98 +1062,198 @@ def get_improvement_areas(negative, rate):
         
     return areas if areas else ["مواصلة التطوير المستمر"]
 
-def analyze_all(transcript):
-    """التحليل الشامل مع جميع المكونات الجديدة"""
-    # تحويل النص إلى نص مفرد للدوال الجديدة
-    combined_text = " ".join([item['text'] for item in transcript])
-
-    basic_analysis = {
-        "sentiment": analyze_sentiment(transcript),
-        "total_words": count_total_words(transcript),
-        "frequent_words": get_frequent_words(transcript),
-        "speech_rate_wps": calculate_overall_speech_rate(transcript),
-        "sensitive_words": detect_sensitive_words(transcript),
-        "translation": translate_to_english(transcript)
-    }
+NO_AUDIO_ERROR = "No audio available for this analysis"
+
+def load_analysis_audio(audio_path, work_dir=None):
+    """فك الصوت مرة واحدة إلى مصفوفة float32 مشتركة بين جميع المحللات الصوتية
+
+    المصفوفة مربوطة بملف مؤقت في `work_dir` (memory-mapped) فلا تُحمّل المقابلة
+    كاملة في الذاكرة؛ النطق يقرأ منها مقاطع الكلمات والنغمة تمر عليها دفعة دفعة.
+    """
+    if not audio_path:
+        return None
+    return decode_audio(audio_path, AUDIO_SAMPLE_RATE, output_dir=work_dir)
+
+def warm_up():
+    """تهيئة المحللات قبل أول طلب: بناء المطابقات والتقطيع ومحرك النغمة على نص وصوت قصيرين"""
+    transcript = [{"start": 0.0, "end": 1.0, "text": "أنا متأكد يعني من النتائج"}]
+    scan_keywords(TokenizedTranscript(transcript).text)
+    detect_sensitive_words(transcript)
+    analyze_pitch_and_waveform(np.zeros(AUDIO_SAMPLE_RATE, dtype=np.float32), transcript=transcript)
+
+# مفاتيح نتيجة التحليل بترتيبها في الاستجابة
+OUTPUT_STAGES = [
+    "sentiment", "total_words", "frequent_words", "speech_rate_wps", "sensitive_words", "translation",
+    "psychological_analysis", "deception_analysis", "personality_traits", "word_repetition_analysis",
+    "response_quality", "hesitation_patterns", "soft_skills", "engagement_level",
+    "letter_pronunciation", "filler_and_repeated_words", "pitch_analysis",
+]
+
+def build_analysis_stages(transcript, sensitive_words=None, audio_path=None, work_dir=None):
+    """مخطط مراحل التحليل: كل مرحلة تعلن المراحل التي تعتمد عليها"""
+    sentiment_backend = get_sentiment_backend()
+    texts = [item['text'] for item in transcript]
+    return [
+        # تقطيع النص وتطبيعه ومسح القواميس مرة واحدة لجميع المحللات
+        Stage("tokens", lambda: TokenizedTranscript(transcript)),
+        Stage("hits", lambda tokens: scan_keywords(tokens.text), ["tokens"]),
+        # ترجمة كل مقطع مرة واحدة فقط واستخدامها في تحليل المشاعر والترجمة (مرحلة شبكية)
+        Stage("sentiment_result", lambda: sentiment_backend.analyze(texts), timeout=SENTIMENT_STAGE_TIMEOUT),
+        Stage("sentiment", lambda sentiment_result: analyze_sentiment(transcript, sentiment_result), ["sentiment_result"]),
+        Stage("translation", lambda sentiment_result: translate_to_english(
+            transcript, sentiment_result.translations, sentiment_backend.translation_placeholder), ["sentiment_result"]),
+
+        Stage("total_words", lambda tokens: count_total_words(transcript, tokens), ["tokens"]),
+        Stage("frequent_words", lambda tokens: get_frequent_words(transcript, tokens=tokens), ["tokens"]),
+        Stage("speech_rate_wps", lambda tokens: calculate_overall_speech_rate(transcript, tokens), ["tokens"]),
+        Stage("sensitive_words", lambda: detect_sensitive_words(transcript, sensitive_words)),
+
+        # التحليلات المتقدمة
+        Stage("psychological_analysis", lambda hits, tokens: analyze_psychological_patterns(transcript, hits, tokens), ["hits", "tokens"]),
+        Stage("deception_analysis", lambda hits, tokens: analyze_deception_indicators(transcript, hits, tokens), ["hits", "tokens"]),
+        Stage("personality_traits", lambda hits: analyze_personality_traits(transcript, hits), ["hits"]),
+        Stage("word_repetition_analysis", lambda tokens: analyze_word_repetition(transcript, tokens), ["tokens"]),
+        Stage("response_quality", lambda tokens, hits: evaluate_response_quality(tokens.text, hits), ["tokens", "hits"]),
+        Stage("hesitation_patterns", lambda tokens, hits: analyze_hesitation_patterns(tokens.text, hits, tokens), ["tokens", "hits"]),
+        Stage("soft_skills", lambda tokens, hits: detect_soft_skills(tokens.text, hits), ["tokens", "hits"]),
+        Stage("engagement_level", lambda tokens, hits: measure_engagement_level(tokens.text, hits), ["tokens", "hits"]),
+
+        # ميزات الصوت والنطق: يُفك صوت الطلب مرة واحدة ويُشارك بين المحللات
+        Stage("audio", lambda: load_analysis_audio(audio_path, work_dir)),
+        # النطق يعمل من كلمات Whisper حتى لو تعذر فك الصوت
+        Stage("letter_pronunciation", lambda audio=None: analyze_letter_pronunciation(transcript, audio),
+              ["audio"], partial=True),
+        Stage("filler_and_repeated_words", lambda tokens: analyze_filler_and_repeated_words(tokens.text, tokens), ["tokens"]),
+        Stage("pitch_analysis", lambda audio: analyze_pitch_and_waveform(audio, transcript=transcript), ["audio"]),
+    ]
 
-    # إضافة التحليلات المتقدمة
-    basic_analysis["psychological_analysis"] = analyze_psychological_patterns(transcript)
-    basic_analysis["deception_analysis"] = analyze_deception_indicators(transcript)
-    basic_analysis["personality_traits"] = analyze_personality_traits(transcript)
-    basic_analysis["word_repetition_analysis"] = analyze_word_repetition(transcript)
+# الأقسام التي ليست قواميس؛ القسم الفاشل يأخذ قيمة فارغة من نوعه نفسه
+_EMPTY_SECTIONS = {"total_words": 0, "speech_rate_wps": 0.0, "frequent_words": [], "sensitive_words": [], "translation": []}
+
+def empty_section(name):
+    """قيمة فارغة بنوع القسم المعتاد، تحل محل قسم فشلت مرحلته"""
+    empty = _EMPTY_SECTIONS.get(name, {})
+    return type(empty)() if isinstance(empty, (list, dict)) else empty
+
+def analyze_all(transcript, sensitive_words=None, audio_path=None, on_section=None, work_dir=None):
+    """التحليل الشامل مع جميع المكونات الجديدة
+
+    تعمل المراحل المستقلة بالتوازي؛ المرحلة التي تفشل أو تتجاوز مهلتها يبقى
+    قسمها بنوعه المعتاد لكن فارغاً (انظر empty_section) ويُسجل سبب الفشل في
+    `stage_errors` بدلاً من إفشال التحليل كله.
+    `sensitive_words` قائمة مراقبة مخصصة تحل محل القائمة الافتراضية
+    `audio_path` ملف الصوت (أو الفيديو) الخاص بهذا الطلب للتحليلات الصوتية
+    `on_section(name, value, error)` يُستدعى فور انتهاء كل قسم من أقسام النتيجة
+    `work_dir` مجلد عمل الطلب، يُكتب فيه الصوت المفكوك
+    التقرير الشامل لا يُبنى هنا؛ انظر report_for_result
+    """
+    sections = set(OUTPUT_STAGES)
+
+    def stage_done(name, value, error):
+        if on_section is not None and name in sections:
+            on_section(name, value if error is None else empty_section(name), error)
+
+    values, errors = run_stages(build_analysis_stages(transcript, sensitive_words, audio_path, work_dir), on_done=stage_done,
+                                span_prefix="analysis.")
+
+    basic_analysis = {}
+    for name in OUTPUT_STAGES:
+        basic_analysis[name] = values[name] if name in values else empty_section(name)
+    if errors:
+        basic_analysis["stage_errors"] = errors
 
-    # إضافة التحليلات الجديدة باستخدام النص المدمج
-    basic_analysis["response_quality"] = evaluate_response_quality(combined_text)
-    basic_analysis["hesitation_patterns"] = analyze_hesitation_patterns(combined_text)
-    basic_analysis["soft_skills"] = detect_soft_skills(combined_text)
-    basic_analysis["engagement_level"] = measure_engagement_level(combined_text)
+    return basic_analysis
 
-    # ميزات جديدة
-    basic_analysis["letter_pronunciation"] = analyze_letter_pronunciation()
-    basic_analysis["filler_and_repeated_words"] = analyze_filler_and_repeated_words(combined_text)
-    basic_analysis["pitch_analysis"] = analyze_pitch_and_waveform()
+# تحليل دقّة مخارج الحروف وجودة النطق (حرف الراء والسين والقاف)
+TARGET_LETTERS = ['ر', 'س', 'ق']
 
-    # التقرير الشامل
-    basic_analysis["comprehensive_report"] = generate_comprehensive_report(basic_analysis, transcript)
+def _timed_words(transcript):
+    """كلمات Whisper مع توقيتها، أو كلمات المقطع بتوقيت المقطع عند غيابها"""
+    for item in transcript:
+        if item.get('words'):
+            for word in item['words']:
+                yield word['word'], word['start'], word['end']
+        else:
+            for word in item['text'].split():
+                yield word, item['start'], item['end']
+
+def _word_acoustics(audio, sample_rate, start, end):
+    """مدة الكلمة وطاقتها من مقطعها في الصوت المفكوك"""
+    samples = audio[int(start * sample_rate):int(end * sample_rate)]
+    if len(samples) == 0:
+        return {}
+    energy = float(np.mean(np.square(samples, dtype=np.float64)))
+    return {
+        "duration": round(end - start, 2),
+        "energy_db": round(10 * math.log10(energy + 1e-10), 2)
+    }
 
-    return basic_analysis
+def analyze_letter_pronunciation(transcript, audio=None, sample_rate=AUDIO_SAMPLE_RATE):
+    """مواضع الحروف المستهدفة في كلمات Whisper مع توقيت كل كلمة
 
-# تحليل دقّة مخارج الحروف وجودة النطق (حرف الراء والسين والقاف)
-def analyze_letter_pronunciation(audio_path=None):
+    لا حاجة لتمرير الصوت إلى خدمة تعرّف كلام ثانية؛ `audio` اختياري ويضيف
+    مدة وطاقة كل كلمة من الصوت المفكوك للطلب.
+    """
     try:
-        recognizer = sr.Recognizer()
-        # Use temp.wav if no path provided
-        if not audio_path:
-            audio_path = tempfile.gettempdir() + "/temp.wav"
-        with sr.AudioFile(audio_path) as source:
-            audio_data = recognizer.record(source)
-        text = recognizer.recognize_google(audio_data, language='ar-EG')
-        target_letters = ['ر', 'س', 'ق']
         positions = {'بداية': [], 'وسط': [], 'نهاية': []}
-        words = text.split()
-        for word in words:
-            for letter in target_letters:
-                if word.startswith(letter):
-                    positions['بداية'].append(word)
-                elif word.endswith(letter):
-                    positions['نهاية'].append(word)
-                elif letter in word:
-                    positions['وسط'].append(word)
+        letter_counts = {letter: 0 for letter in TARGET_LETTERS}
+        for raw_word, start, end in _timed_words(transcript):
+            for word in surface_words(raw_word):
+                acoustics = None
+                for letter in TARGET_LETTERS:
+                    if word.startswith(letter):
+                        position = 'بداية'
+                    elif word.endswith(letter):
+                        position = 'نهاية'
+                    elif letter in word:
+                        position = 'وسط'
+                    else:
+                        continue
+                    entry = {"word": word, "letter": letter, "start": round(start, 2), "end": round(end, 2)}
+                    if audio is not None:
+                        if acoustics is None:
+                            acoustics = _word_acoustics(audio, sample_rate, start, end)
+                        entry.update(acoustics)
+                    positions[position].append(entry)
+                    letter_counts[letter] += 1
         return {
             "الكلمات التي تبدأ بالحروف": positions['بداية'],
             "الكلمات التي تحتوي الحروف في الوسط": positions['وسط'],
-            "الكلمات التي تنتهي بالحروف": positions['نهاية']
+            "الكلمات التي تنتهي بالحروف": positions['نهاية'],
+            "letter_counts": letter_counts
         }
     except Exception as e:
         return {"error": str(e)}
 
 # تحليل التأتأة واللزامات اللغوية
-def analyze_filler_and_repeated_words(text):
-    filler_words = ["يعني", "أمم", "مثلاً", "آآه", "ها"]
-    word_freq = {}
-    for word in text.split():
-        word_freq[word] = word_freq.get(word, 0) + 1
-    repeated_words = {w: c for w, c in word_freq.items() if c > 1}
-    fillers_found = [w for w in text.split() if w in filler_words]
+def analyze_filler_and_repeated_words(text, tokens=None):
+    if tokens is None:
+        tokens = TokenizedTranscript.from_text(text)
+    filler_words = {normalize_phrase(w)[0] for w in ["يعني", "أمم", "مثلاً", "آآه", "ها"]}
+    repeated_words = {tokens.surface(w): c for w, c in tokens.frequencies.items() if c > 1}
+    fillers_found = [tokens.surface(w) for w in tokens.tokens if w in filler_words]
     return {
         "كلمات حشو": fillers_found,
         "كلمات مكررة": repeated_words
     }
 
 # خصائص الصوت ونغماته
-def analyze_pitch_and_waveform(audio_path=None):
+def analyze_pitch_and_waveform(audio=None, sample_rate=AUDIO_SAMPLE_RATE, transcript=()):
+    """`audio` هو الصوت المفكوك للطلب الحالي (float32 أحادي القناة)
+
+    يُحلل الصوت على دفعات (prosody.py) فتبقى الذاكرة محدودة مهما طالت المقابلة،
+    وتُحسب النغمة والطاقة والتوقفات لكل مقطع من النص.
+    """
+    if audio is None:
+        return {"error": NO_AUDIO_ERROR}
     try:
-        # Use temp.wav if no path provided
-        if not audio_path:
-            audio_path = tempfile.gettempdir() + "/temp.wav"
-        y, sr_ = librosa.load(audio_path)
-        pitches, magnitudes = librosa.piptrack(y=y, sr=sr_)
-        pitch_values = pitches[magnitudes > np.median(magnitudes)]
-        avg_pitch = float(np.mean(pitch_values)) if len(pitch_values) > 0 else 0.0
-        std_pitch = float(np.std(pitch_values)) if len(pitch_values) > 0 else 0.0
+        block = sample_rate * 10
+        prosody = analyze_prosody((audio[i:i + block] for i in range(0, len(audio), block)),
+                                  sorted(transcript, key=lambda item: item['start']), sample_rate)
         return {
-            "معدل الحدة": round(avg_pitch, 2),
-            "انحراف النغمة": round(std_pitch, 2)
+            "معدل الحدة": prosody["pitch_mean_hz"],
+            "انحراف النغمة": prosody["pitch_std_hz"],
+            **prosody
         }
     except Exception as e:
         return {"error": str(e)}
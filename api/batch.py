@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Analyze a directory of interviews from the command line.
+
+Every video under the input directory goes through the same pipeline as
+`POST /video` (audio extraction -> Groq transcription -> analyze_all), without
+HTTP. Work is spread over `--processes` worker processes, each running
+`--threads` videos at a time: processes scale the CPU-bound analysis across
+cores and threads overlap the time spent waiting on Groq and translation.
+
+Results are appended to a JSONL file, one line per video, as soon as each
+finishes. Inputs already recorded there successfully (same relative path,
+size and modification time) are skipped, so an interrupted run can be
+restarted with the same command.
+
+Usage: python batch.py INPUT_DIR [--output results.jsonl] [--processes 2] [--threads 2]
+                       [--extensions .mp4 .mov ...] [--sensitive-words words.txt]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import tempfile
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from dotenv import load_dotenv
+load_dotenv()
+
+VIDEO_EXTENSIONS = [".mp4", ".mov", ".mkv", ".avi", ".webm", ".m4v", ".mp3", ".wav", ".m4a", ".flac", ".ogg"]
+
+
+def discover(input_dir, extensions):
+    extensions = {ext.lower() for ext in extensions}
+    return sorted(path for path in Path(input_dir).rglob("*") if path.is_file() and path.suffix.lower() in extensions)
+
+
+def input_key(path, input_dir):
+    stat = path.stat()
+    return {"path": path.relative_to(input_dir).as_posix(), "size": stat.st_size, "mtime": int(stat.st_mtime)}
+
+
+def load_processed(output):
+    """Keys of inputs that already have a successful line in `output`."""
+    processed = set()
+    if not os.path.exists(output):
+        return processed
+    with open(output, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # a line cut short by an interrupted run
+            if record.get("status") == "ok":
+                processed.add((record["path"], record["size"], record["mtime"]))
+    return processed
+
+
+def process_file(path, key, sensitive_words=None):
+    """Run the full pipeline on one file and return its JSONL record."""
+    import metrics
+    from analysis import report_for_result
+    from pipeline import run_pipeline
+    from utils import file_sha256
+
+    job_id = uuid.uuid4().hex
+    record = dict(key)
+    started = time.perf_counter()
+    try:
+        with metrics.job_context(job_id), tempfile.TemporaryDirectory(prefix="batch_") as work_dir:
+            _, content_hash = file_sha256(path)
+            record["sha256"] = content_hash
+            result = run_pipeline(str(path), content_hash=content_hash, sensitive_words=sensitive_words, work_dir=work_dir)
+        # The API builds the report on request; the JSONL line is the only output here
+        result["comprehensive_report"] = report_for_result(result)
+        record.update(status="ok", seconds=round(time.perf_counter() - started, 3),
+                      result={**result, "timings": metrics.finish_job(job_id)})
+    except Exception as e:
+        metrics.finish_job(job_id)
+        detail = getattr(e, "detail", None) or str(e) or type(e).__name__
+        record.update(status="error", seconds=round(time.perf_counter() - started, 3), error=detail)
+        if not hasattr(e, "detail"):
+            traceback.print_exc()
+    return record
+
+
+def _worker(tasks, results, threads, sensitive_words):
+    """Worker process: `threads` threads take (path, key) tasks until they receive None."""
+    def run():
+        while True:
+            task = tasks.get()
+            if task is None:
+                return
+            path, key = task
+            results.put(process_file(Path(path), key, sensitive_words))
+
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="batch") as pool:
+        for _ in range(threads):
+            pool.submit(run)
+
+
+def run_batch(input_dir, output, processes=1, threads=2, extensions=VIDEO_EXTENSIONS, sensitive_words=None):
+    """Process every new input under `input_dir`, appending records to `output`; returns (ok, failed, skipped)."""
+    input_dir = Path(input_dir).resolve()
+    processed = load_processed(output)
+    pending = []
+    skipped = 0
+    for path in discover(input_dir, extensions):
+        key = input_key(path, input_dir)
+        if (key["path"], key["size"], key["mtime"]) in processed:
+            skipped += 1
+        else:
+            pending.append((str(path), key))
+    print(f"📦 {len(pending)} videos to process, {skipped} already done ({processes} processes x {threads} threads)")
+
+    ok = failed = 0
+    # spawn: the pipeline's thread pools must not be inherited through fork
+    context = multiprocessing.get_context("spawn")
+    tasks, results = context.Queue(), context.Queue()
+    workers = [context.Process(target=_worker, args=(tasks, results, threads, sensitive_words), daemon=True)
+               for _ in range(min(processes, len(pending)))]
+    for path, key in pending:
+        tasks.put((path, key))
+    for _ in range(len(workers) * threads):
+        tasks.put(None)
+    for worker in workers:
+        worker.start()
+
+    started = time.perf_counter()
+    try:
+        with open(output, "a", encoding="utf-8") as out:
+            done = 0
+            while done < len(pending):
+                try:
+                    record = results.get(timeout=1)
+                except queue.Empty:
+                    if not any(worker.is_alive() for worker in workers):
+                        failed += len(pending) - done
+                        print(f"❌ Worker processes exited with {len(pending) - done} videos unprocessed")
+                        break
+                    continue
+                done += 1
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+                if record["status"] == "ok":
+                    ok += 1
+                    print(f"✅ [{done}/{len(pending)}] {record['path']} ({record['seconds']:.1f}s)")
+                else:
+                    failed += 1
+                    print(f"❌ [{done}/{len(pending)}] {record['path']}: {record['error']}")
+    finally:
+        for worker in workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+
+    elapsed = time.perf_counter() - started
+    if pending:
+        print(f"🏁 {ok} succeeded, {failed} failed in {elapsed:.1f}s ({len(pending) / elapsed:.2f} videos/s)")
+    return ok, failed, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input_dir")
+    parser.add_argument("--output", default="results.jsonl")
+    parser.add_argument("--processes", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--threads", type=int, default=2, help="videos in flight per process")
+    parser.add_argument("--extensions", nargs="*", default=VIDEO_EXTENSIONS)
+    parser.add_argument("--sensitive-words", help="file with one watchlist term per line (replaces the default list)")
+    args = parser.parse_args()
+
+    sensitive_words = None
+    if args.sensitive_words:
+        with open(args.sensitive_words, encoding="utf-8") as f:
+            sensitive_words = list(dict.fromkeys(line.strip() for line in f if line.strip())) or None
+
+    _, failed, _ = run_batch(args.input_dir, args.output, max(1, args.processes), max(1, args.threads),
+                             args.extensions, sensitive_words)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
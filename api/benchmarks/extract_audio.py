@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark audio extraction engines: moviepy (44.1 kHz stereo WAV) against
+direct ffmpeg (16 kHz mono FLAC/Opus).
+
+Each run happens in a fresh subprocess so peak RSS includes the engine's own
+ffmpeg children and is not polluted by earlier runs.
+
+Usage: python benchmarks/extract_audio.py video.mp4 [more.mp4 ...] [--repeat 3]
+"""
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+API_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(API_DIR))
+
+ENGINES = ["moviepy", "ffmpeg-flac", "ffmpeg-opus"]
+
+
+def run_engine(engine, video_path):
+    """Extract once in this process and print a JSON measurement."""
+    import utils
+
+    start = time.perf_counter()
+    if engine == "moviepy":
+        audio_path = utils.extract_audio_moviepy(video_path)
+    else:
+        audio_path = utils.extract_audio_ffmpeg(video_path, fmt=engine.split("-", 1)[1])
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss is in KB on Linux
+    peak_rss_kb = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    size = os.path.getsize(audio_path)
+    os.remove(audio_path)
+    print(json.dumps({"wall_time": elapsed, "peak_rss_mb": peak_rss_kb / 1024, "output_bytes": size}))
+
+
+def measure(engine, video_path):
+    completed = subprocess.run(
+        [sys.executable, __file__, "--worker", engine, video_path],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("videos", nargs="+")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_engine(args.worker, args.videos[0])
+        return
+
+    for video_path in args.videos:
+        print(f"🎬 {video_path} ({os.path.getsize(video_path) / (1024 * 1024):.1f} MB)")
+        for engine in ENGINES:
+            runs = [measure(engine, video_path) for _ in range(args.repeat)]
+            wall = statistics.median(r["wall_time"] for r in runs)
+            rss = max(r["peak_rss_mb"] for r in runs)
+            size = runs[0]["output_bytes"] / (1024 * 1024)
+            print(f"   {engine:<12} wall={wall:7.2f}s  peak_rss={rss:7.1f}MB  output={size:7.2f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Keyword lookup cost for the lexicon-based analyzers on long transcripts.
+
+Compares one substring scan per lexicon term (how the analyzers used to test
+each term), the same per-term scans when every occurrence offset is needed,
+and a single pass of the compiled KeywordMatcher over the text. --extra-terms
+adds synthetic terms to see how each approach scales with the lexicon size.
+
+Usage: python benchmarks/keyword_matching.py [--words 20000] [--density 0.03]
+                                             [--extra-terms 0] [--repeat 20]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from analysis import LEXICONS
+from keyword_matcher import KeywordMatcher
+
+FILLER = [
+    "كان", "العمل", "في", "مع", "الشركة", "مشروع", "عندنا", "بعد", "قبل", "كل", "يوم", "هذا",
+    "اشتغلت", "على", "نظام", "للعملاء", "والمبيعات", "وتم", "تسليمه", "الموظفين", "السنة", "الماضية",
+]
+
+
+def synthetic_lexicons(extra_terms, seed=0):
+    rng = random.Random(seed)
+    lexicons = dict(LEXICONS)
+    if extra_terms:
+        letters = "ابتثجحخدذرزسشصضطظعغفقكلمنهوي"
+        lexicons["extra"] = ["".join(rng.choice(letters) for _ in range(rng.randint(4, 9))) for _ in range(extra_terms)]
+    return lexicons
+
+
+def synthetic_transcript(words, density, seed=0):
+    rng = random.Random(seed)
+    terms = [term for terms in LEXICONS.values() for term in terms]
+    return " ".join(rng.choice(terms) if rng.random() < density else rng.choice(FILLER) for _ in range(words))
+
+
+def naive_presence(lexicons, text):
+    return {name: [term for term in terms if term in text] for name, terms in lexicons.items()}
+
+
+def naive_positions(lexicons, text):
+    positions = {}
+    for term in {term for terms in lexicons.values() for term in terms}:
+        start = text.find(term)
+        while start != -1:
+            positions.setdefault(term, []).append(start)
+            start = text.find(term, start + 1)
+    return positions
+
+
+def measure(label, func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"   {label:<30} {elapsed * 1000:8.2f} ms/transcript")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, default=20000)
+    parser.add_argument("--density", type=float, default=0.03, help="fraction of words drawn from the lexicons")
+    parser.add_argument("--extra-terms", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    lexicons = synthetic_lexicons(args.extra_terms)
+    text = synthetic_transcript(args.words, args.density)
+    terms = sum(len(terms) for terms in lexicons.values())
+    print(f"📊 {args.words} words ({len(text)} chars), {len(lexicons)} lexicons, {terms} terms")
+
+    start = time.perf_counter()
+    matcher = KeywordMatcher(lexicons)
+    print(f"   {'compile matcher':<30} {(time.perf_counter() - start) * 1000:8.2f} ms (once per process)")
+
+    present = measure("per-term `in` (presence only)", lambda: naive_presence(lexicons, text), args.repeat)
+    positions = measure("per-term find (all offsets)", lambda: naive_positions(lexicons, text), args.repeat)
+    hits = measure("single matcher pass", lambda: matcher.scan(text), args.repeat)
+    identical = hits.positions == positions and all(hits.found(name) == found for name, found in present.items())
+    print("✅ results identical" if identical else "❌ results differ")
+
+
+if __name__ == "__main__":
+    main()
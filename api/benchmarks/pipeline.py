@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for the analysis pipeline.
+
+Synthetic Arabic transcripts and generated speech-like audio (harmonic tones
+with a moving pitch, separated by pauses) are run through:
+- analyze_all[N]: the whole stage graph on a transcript of N segments (text only)
+- analyzer:<stage>[N]: every analysis stage alone, in dependency order
+- extract_audio[Ss]: extracting the compressed track from S seconds of audio
+- pitch_analysis[Ss]: decoding the audio and running the prosody analysis
+- analyze_all+audio[Ss]: the whole stage graph with the acoustic analyzers
+
+Translation goes through the offline LocalTranslator with a fresh translation
+cache for every repetition, and the synthetic transcripts stand in for ASR,
+so nothing touches the network. Each case group runs in its own subprocess
+so peak RSS is per group. Throughput is segments/sec for transcript cases and
+audio seconds/sec for audio cases.
+
+Results are compared against a baseline JSON when one exists; --save-baseline
+writes the current results as the new baseline. Baselines are machine
+specific, so record one on the machine that runs the comparison. The exit
+status is 1 when a case's p50 latency regressed by more than --tolerance.
+
+Usage: python benchmarks/pipeline.py [--sizes 10 100 1000 10000] [--audio-seconds 30 300 1200]
+                                     [--repeat 5] [--baseline PATH] [--save-baseline]
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+API_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(API_DIR))
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+SAMPLE_RATE = 16000
+
+WORDS = [
+    "أنا", "سعيد", "جداً", "بالعمل", "مع", "الفريق", "لكن", "هناك", "مشكلة", "في",
+    "الوقت", "لست", "متأكد", "من", "النتائج", "كانت", "تجربة", "صعبة", "ومفيدة", "أحب",
+    "التحدي", "والتعلم", "المستمر", "لا", "أشعر", "بالقلق", "النجاح", "يحتاج", "صبر",
+    "الشركة", "المشروع", "العميل", "قررت", "تعلمت", "سنوات", "خبرة", "القرار", "الإدارة",
+]
+
+
+def synthetic_transcript(segments, seed=0, keyword_density=0.05):
+    """Whisper-shaped segments with word timings; a few words come from the analyzer lexicons."""
+    from analysis import LEXICONS
+    rng = random.Random(seed)
+    lexicon_terms = sorted({term for terms in LEXICONS.values() for term in terms})
+    transcript = []
+    clock = 0.0
+    for index in range(segments):
+        words = [rng.choice(lexicon_terms) if rng.random() < keyword_density else rng.choice(WORDS)
+                 for _ in range(rng.randint(6, 18))]
+        words.append(str(index))  # every segment unique, so nothing is served from memoization
+        duration = len(words) * rng.uniform(0.3, 0.5)
+        step = duration / len(words)
+        transcript.append({
+            "start": round(clock, 2),
+            "end": round(clock + duration, 2),
+            "text": " ".join(words),
+            "words": [{"word": word, "start": round(clock + i * step, 2), "end": round(clock + (i + 1) * step, 2)}
+                      for i, word in enumerate(words)],
+        })
+        clock += duration + rng.uniform(0.3, 1.2)  # pause between segments
+    return transcript
+
+
+def transcript_for_duration(seconds, seed=0):
+    transcript = []
+    size = max(1, int(seconds / 5))
+    while not transcript or transcript[-1]["end"] < seconds:
+        transcript = synthetic_transcript(size, seed)
+        size *= 2
+    return [item for item in transcript if item["end"] <= seconds]
+
+
+def write_speech_audio(path, transcript, seconds, seed=0):
+    """16 kHz mono WAV: a gliding harmonic tone during each segment and near-silence between."""
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    block = SAMPLE_RATE * 10
+    with wave.open(str(path), "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(SAMPLE_RATE)
+        for offset in range(0, int(seconds * SAMPLE_RATE), block):
+            t = (offset + np.arange(min(block, int(seconds * SAMPLE_RATE) - offset))) / SAMPLE_RATE
+            f0 = 160 + 40 * np.sin(2 * np.pi * 0.3 * t)
+            phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+            voice = sum(np.sin(k * phase) / k for k in (1, 2, 3))
+            active = np.zeros(len(t), dtype=bool)
+            for item in transcript:
+                if item["end"] >= t[0] and item["start"] <= t[-1]:
+                    active |= (t >= item["start"]) & (t < item["end"])
+            signal = np.where(active, 0.3 * voice, 0.0) + rng.normal(0, 0.002, len(t))
+            out.writeframes((np.clip(signal, -1, 1) * 32767).astype(np.int16).tobytes())
+
+
+def _fresh_translation_cache():
+    import translation
+    translation._cache = translation.TranslationCache(os.path.join(tempfile.mkdtemp(), "translations.sqlite3"))
+
+
+def _timed(func, repeat, before=None, warmup=1):
+    """Latencies of `repeat` calls after `warmup` untimed ones (lazy model and lexicon loading)."""
+    latencies = []
+    for run in range(warmup + repeat):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        func()
+        if run >= warmup:
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def _run_stages_alone(stages, repeat):
+    """Time each stage alone, feeding it the outputs of its dependencies computed beforehand."""
+    values = {}
+    latencies = {}
+    for stage in stages:  # build_analysis_stages lists dependencies first
+        kwargs = {dep: values[dep] for dep in stage.deps if dep in values}
+        if any(dep not in values for dep in stage.deps) and not stage.partial:
+            continue
+        outputs = []
+        try:
+            latencies[stage.name] = _timed(lambda: outputs.append(stage.func(**kwargs)), repeat, _fresh_translation_cache)
+        except Exception as e:
+            print(f"⚠️ {stage.name} failed: {e}", file=sys.stderr)
+            continue
+        values[stage.name] = outputs[-1]
+    return latencies
+
+
+def run_group(group, param, repeat):
+    """Worker: run one case group and print {case: {"latencies": [...], "units": n}} plus peak RSS."""
+    import analysis
+    import utils
+
+    results = {}
+    if group == "transcript":
+        transcript = synthetic_transcript(param)
+        latencies = _timed(lambda: analysis.analyze_all(transcript), repeat, _fresh_translation_cache)
+        results[f"analyze_all[{param}]"] = {"latencies": latencies, "units": param}
+        # Without audio the acoustic stages only return their "no audio" result; the audio group covers them
+        stages = [stage for stage in analysis.build_analysis_stages(transcript)
+                  if stage.name not in ("audio", "pitch_analysis")]
+        for name, runs in _run_stages_alone(stages, repeat).items():
+            results[f"analyzer:{name}[{param}]"] = {"latencies": runs, "units": param}
+    else:
+        transcript = transcript_for_duration(param)
+        workdir = tempfile.mkdtemp(prefix="bench_")
+        audio_path = os.path.join(workdir, f"speech_{param}s.wav")
+        write_speech_audio(audio_path, transcript, param)
+
+        def extract():
+            os.remove(utils.extract_audio(audio_path, output_dir=workdir))
+
+        def pitch():
+            audio = utils.decode_audio(audio_path)
+            analysis.analyze_pitch_and_waveform(audio, transcript=transcript)
+
+        try:
+            results[f"extract_audio[{param}s]"] = {"latencies": _timed(extract, repeat), "units": param}
+            results[f"pitch_analysis[{param}s]"] = {"latencies": _timed(pitch, repeat), "units": param}
+            results[f"analyze_all+audio[{param}s]"] = {
+                "latencies": _timed(lambda: analysis.analyze_all(transcript, audio_path=audio_path), repeat,
+                                    _fresh_translation_cache),
+                "units": param,
+            }
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    # ru_maxrss is in KB on Linux
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({"cases": results, "peak_rss_mb": peak_rss_mb}))
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+def measure(group, param, repeat):
+    env = {**os.environ, "TRANSLATION_PROVIDER": "local", "SENTIMENT_BACKEND": os.getenv("SENTIMENT_BACKEND", "network"),
+           "TRANSLATION_CACHE_PATH": os.path.join(tempfile.mkdtemp(), "translations.sqlite3")}
+    completed = subprocess.run(
+        [sys.executable, __file__, "--worker", group, str(param), "--repeat", str(repeat)],
+        capture_output=True, text=True, env=env,
+    )
+    if completed.returncode != 0:
+        print(completed.stderr[-2000:])
+        raise SystemExit(f"❌ {group}[{param}] failed")
+    output = json.loads(completed.stdout.strip().splitlines()[-1])
+    summary = {}
+    for case, data in output["cases"].items():
+        latencies = data["latencies"]
+        p50 = statistics.median(latencies)
+        summary[case] = {
+            "p50_s": round(p50, 6),
+            "p95_s": round(percentile(latencies, 0.95), 6),
+            "throughput": round(data["units"] / p50, 2) if p50 > 0 else None,
+            "unit": "audio_s/s" if group == "audio" else "segments/s",
+            "peak_rss_mb": round(output["peak_rss_mb"], 1),
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="*", default=[10, 100, 1000, 10000], help="transcript segments")
+    parser.add_argument("--audio-seconds", type=int, nargs="*", default=[30, 300, 1200])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="write these results to --baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p50 slowdown before failing (0.25 = 25%%)")
+    parser.add_argument("--worker", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_group(args.worker[0], int(args.worker[1]), args.repeat)
+        return
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() and not args.save_baseline else {}
+    results = {}
+    regressions = []
+    groups = [("transcript", size) for size in args.sizes] + [("audio", seconds) for seconds in args.audio_seconds]
+    for group, param in groups:
+        print(f"📊 {group} {param}{'s' if group == 'audio' else ' segments'}")
+        for case, stats in measure(group, param, args.repeat).items():
+            results[case] = stats
+            line = (f"   {case:<48} p50={stats['p50_s'] * 1000:10.2f}ms  p95={stats['p95_s'] * 1000:10.2f}ms  "
+                    f"{stats['throughput'] or 0:12.1f} {stats['unit']}  peak_rss={stats['peak_rss_mb']:7.1f}MB")
+            previous = baseline.get("cases", {}).get(case)
+            if previous:
+                ratio = stats["p50_s"] / previous["p50_s"] if previous["p50_s"] else 1.0
+                line += f"  ({ratio:.2f}x baseline)"
+                # Sub-millisecond cases are too noisy to gate on
+                if ratio > 1 + args.tolerance and stats["p50_s"] > 0.001:
+                    regressions.append((case, ratio))
+            print(line)
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps({
+            "python": sys.version.split()[0],
+            "platform": sys.platform,
+            "repeat": args.repeat,
+            "cases": results,
+        }, indent=2, ensure_ascii=False) + "\n")
+        print(f"💾 Baseline saved to {args.baseline}")
+    elif regressions:
+        for case, ratio in regressions:
+            print(f"❌ {case} is {ratio:.2f}x slower than the baseline")
+        sys.exit(1)
+    elif baseline:
+        print("✅ No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
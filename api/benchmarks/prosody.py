@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark pitch analysis: the previous librosa.load + piptrack implementation
+against the block-streaming YIN prosody engine.
+
+Engines:
+- librosa-piptrack: full-file load at 22.05 kHz and one full spectrogram (needs librosa)
+- yin-buffer: decode once into a float32 buffer and analyze it (what the pipeline does)
+- yin-stream: feed ffmpeg's output straight into the engine, never holding the whole track
+
+Each run happens in a fresh subprocess so peak RSS is per engine.
+
+Usage: python benchmarks/prosody.py audio_or_video [more ...] [--repeat 3]
+"""
+
+import argparse
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+API_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(API_DIR))
+
+ENGINES = ["librosa-piptrack", "yin-buffer", "yin-stream"]
+
+
+def run_engine(engine, path):
+    import numpy as np
+    import utils
+    from prosody import analyze_prosody
+
+    start = time.perf_counter()
+    if engine == "librosa-piptrack":
+        import librosa
+        y, sr_ = librosa.load(path)
+        pitches, magnitudes = librosa.piptrack(y=y, sr=sr_)
+        pitch_values = pitches[magnitudes > np.median(magnitudes)]
+        mean_pitch = float(np.mean(pitch_values)) if len(pitch_values) else 0.0
+    elif engine == "yin-buffer":
+        audio = utils.decode_audio(path)
+        block = utils.AUDIO_SAMPLE_RATE * 10
+        mean_pitch = analyze_prosody(audio[i:i + block] for i in range(0, len(audio), block))["pitch_mean_hz"]
+    else:
+        chunks = (np.frombuffer(chunk, dtype=np.float32)
+                  for chunk in utils.stream_audio(path, fmt="f32le", chunk_size=640 * 1024))
+        mean_pitch = analyze_prosody(chunks)["pitch_mean_hz"]
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss is in KB on Linux
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"wall_time": elapsed, "peak_rss_mb": peak_rss_kb / 1024, "mean_pitch": mean_pitch}))
+
+
+def measure(engine, path):
+    completed = subprocess.run(
+        [sys.executable, __file__, "--worker", engine, path],
+        capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        return None
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_engine(args.worker, args.files[0])
+        return
+
+    for path in args.files:
+        print(f"🎵 {path}")
+        for engine in ENGINES:
+            runs = [measure(engine, path) for _ in range(args.repeat)]
+            if None in runs:
+                print(f"   {engine:<18} failed (is librosa installed?)")
+                continue
+            wall = statistics.median(r["wall_time"] for r in runs)
+            rss = max(r["peak_rss_mb"] for r in runs)
+            print(f"   {engine:<18} wall={wall:7.2f}s  peak_rss={rss:7.1f}MB  mean_pitch={runs[0]['mean_pitch']:7.1f}Hz")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Throughput of the sentiment backends in segments/sec.
+
+By default the network backend translates through the offline stand-in
+translator, which isolates TextBlob's cost; pass --live to include real Google
+Translate round-trips (needs network access, results are never cached).
+
+Usage: python benchmarks/sentiment_backends.py [--segments 2000] [--live]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# Keep the benchmark from reading or polluting the real translation cache
+os.environ["TRANSLATION_CACHE_PATH"] = os.path.join(tempfile.mkdtemp(), "translations.sqlite3")
+
+import translation
+from sentiment import ArabicLexiconBackend, NetworkSentimentBackend
+
+WORDS = [
+    "أنا", "سعيد", "جداً", "بالعمل", "مع", "الفريق", "لكن", "هناك", "مشكلة", "في",
+    "الوقت", "لست", "متأكد", "من", "النتائج", "كانت", "تجربة", "صعبة", "ومفيدة", "أحب",
+    "التحدي", "والتعلم", "المستمر", "لا", "أشعر", "بالقلق", "النجاح", "يحتاج", "صبر",
+]
+
+
+def synthetic_segments(count, seed=0):
+    rng = random.Random(seed)
+    # Append the index so every segment is unique and nothing is served from memoization
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 18))) + f" {i}" for i in range(count)]
+
+
+def measure(label, backend, texts, engine=None):
+    start = time.perf_counter()
+    if engine is not None:
+        translations = translation.translate_segments(texts, engine=engine)
+        backend.analyze(texts, translations)
+    else:
+        backend.analyze(texts)
+    elapsed = time.perf_counter() - start
+    print(f"   {label:<28} {len(texts) / elapsed:10.1f} segments/sec ({elapsed:.2f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segments", type=int, default=2000)
+    parser.add_argument("--live", action="store_true", help="translate with Google instead of the local stand-in")
+    args = parser.parse_args()
+
+    texts = synthetic_segments(args.segments)
+    print(f"📊 {len(texts)} synthetic segments")
+    measure("lexicon (offline)", ArabicLexiconBackend(), texts)
+    if args.live:
+        engine = translation.TranslationEngine(translation.GoogleTranslateProvider())
+        measure("network (Google + TextBlob)", NetworkSentimentBackend(), texts, engine)
+    else:
+        engine = translation.TranslationEngine(translation.LocalTranslator())
+        measure("network (stub + TextBlob)", NetworkSentimentBackend(), texts, engine)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Cold-start cost of the API process.
+
+Measures, each in a fresh process:
+- import: `import main`
+- listening: spawning uvicorn until `GET /` answers
+- ready: until `GET /ready` answers 200 (when the endpoint exists)
+- first request / second request: `POST /video` latency of the first and a
+  following upload of the given file
+
+Transcription goes to a local mock Whisper server and translation to the
+offline stand-in, and result caching is disabled, so both uploads run the
+full pipeline and the numbers reflect start-up work rather than the network.
+
+Usage: python benchmarks/startup.py interview.mp4 [--runs 3]
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+API_DIR = Path(__file__).resolve().parent.parent
+
+
+class MockWhisper(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = json.dumps({
+            "text": "أنا سعيد جداً بالعمل مع الفريق",
+            "segments": [{"id": 0, "start": 0.0, "end": 2.0, "text": "أنا سعيد جداً بالعمل مع الفريق"}],
+            "words": [{"word": "أنا", "start": 0.0, "end": 0.4}, {"word": "سعيد", "start": 0.4, "end": 0.9}],
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def measure_import(env):
+    code = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+    completed = subprocess.run([sys.executable, "-c", code], cwd=API_DIR, env=env, capture_output=True, text=True)
+    return float(completed.stdout.strip().splitlines()[-1])
+
+
+def wait_for(url, deadline, accept=(200,)):
+    import requests
+    while time.perf_counter() < deadline:
+        try:
+            response = requests.get(url, timeout=1)
+            if response.status_code in accept:
+                return response.status_code
+        except requests.ConnectionError:
+            pass
+        time.sleep(0.02)
+    raise TimeoutError(url)
+
+
+def measure_server(env, media):
+    import requests
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=API_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for(f"{base}/", started + 120)
+        result = {"listening": time.perf_counter() - started}
+        if wait_for(f"{base}/ready", started + 120, accept=(200, 404)) == 200:
+            result["ready"] = time.perf_counter() - started
+        for label in ("first_request", "second_request"):
+            with open(media, "rb") as f:
+                request_started = time.perf_counter()
+                response = requests.post(f"{base}/video", files={"video": (os.path.basename(media), f)})
+            response.raise_for_status()
+            result[label] = time.perf_counter() - request_started
+        return result
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("media")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    mock = ThreadingHTTPServer(("127.0.0.1", 0), MockWhisper)
+    threading.Thread(target=mock.serve_forever, daemon=True).start()
+    env = {
+        **os.environ,
+        "GROQ_API_KEY": "benchmark",
+        "GROQ_BASE_URL": f"http://127.0.0.1:{mock.server_port}",
+        "TRANSLATION_PROVIDER": "local",
+        "RESULT_CACHE_MAX_MB": "0",
+    }
+
+    imports = []
+    runs = []
+    for _ in range(args.runs):
+        run_env = {**env, "TRANSLATION_CACHE_PATH": os.path.join(tempfile.mkdtemp(), "translations.sqlite3")}
+        imports.append(measure_import(run_env))
+        runs.append(measure_server(run_env, os.path.abspath(args.media)))
+
+    print(f"🚀 Cold start over {args.runs} runs (median)")
+    print(f"   {'import main':<16} {statistics.median(imports) * 1000:8.0f}ms")
+    for key in ("listening", "ready", "first_request", "second_request"):
+        values = [run[key] for run in runs if key in run]
+        if values:
+            print(f"   {key.replace('_', ' '):<16} {statistics.median(values) * 1000:8.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
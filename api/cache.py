@@ -0,0 +1,138 @@
+"""
+Content-addressed on-disk cache for transcripts and analysis results.
+
+Entries are keyed by the SHA-256 of the uploaded video plus a version string,
+stored as gzip-compressed JSON and evicted least-recently-used first once the
+cache grows past RESULT_CACHE_MAX_MB.
+"""
+
+import os
+import gzip
+import json
+import hashlib
+import tempfile
+import threading
+
+RESULT_CACHE_DIR = os.getenv("RESULT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "interview-analyzer-cache"))
+RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_MB", "512")) * 1024 * 1024
+
+# Bump when the extracted audio or the Whisper request changes
+TRANSCRIPT_CACHE_VERSION = "1"
+# Bump whenever analyze_all output changes
+ANALYSIS_CACHE_VERSION = "7"
+
+_VERSIONS = {
+    "transcript": TRANSCRIPT_CACHE_VERSION,
+    "analysis": ANALYSIS_CACHE_VERSION,
+}
+
+
+class ResultCache:
+    # Eviction trims down to this fraction of max_bytes so it doesn't rerun on every write
+    LOW_WATER = 0.9
+    # Writes between directory rescans, which pick up entries written by other processes
+    RESCAN_WRITES = 100
+
+    def __init__(self, directory=RESULT_CACHE_DIR, max_bytes=RESULT_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Size of the cache on disk, scanned on first write and tracked from then on
+        self._total = None
+        self._writes = 0
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def _path(self, content_hash, kind):
+        key = hashlib.sha256(f"{kind}:{_VERSIONS[kind]}:{content_hash}".encode()).hexdigest()
+        return os.path.join(self.directory, key[:2], f"{key}.{kind}.json.gz")
+
+    def get(self, content_hash, kind):
+        if not self.enabled or not content_hash:
+            return None
+        path = self._path(content_hash, kind)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                value = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"⚠️ Dropping unreadable cache entry {path}: {e}")
+            self._remove(path)
+            return None
+        # Touch the entry so eviction sees it as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, content_hash, kind, value):
+        if not self.enabled or not content_hash:
+            return
+        path = self._path(content_hash, kind)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            replaced = os.path.getsize(path)
+        except OSError:
+            replaced = 0
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as f:
+                f.write(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+            # Atomic so readers never see a half-written entry
+            os.replace(tmp_path, path)
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+        with self._lock:
+            self._writes += 1
+            if self._total is None or self._writes % self.RESCAN_WRITES == 0:
+                self._total = self._scan()[1]
+            else:
+                self._total += os.path.getsize(path) - replaced
+            over = self._total > self.max_bytes
+        if over:
+            self.evict(int(self.max_bytes * self.LOW_WATER))
+
+    def _scan(self):
+        """Return `(entries sorted oldest first, total bytes)` of the cache directory."""
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".json.gz"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        entries.sort()
+        return entries, total
+
+    def evict(self, target=None):
+        """Delete least-recently-used entries until the cache fits in `target` bytes (default max_bytes)."""
+        target = self.max_bytes if target is None else target
+        with self._lock:
+            entries, total = self._scan()
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                self._remove(path)
+                total -= size
+            self._total = total
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+result_cache = ResultCache()
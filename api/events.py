@@ -0,0 +1,85 @@
+"""
+Per-job event history for the progress stream (`GET /jobs/{id}/events`).
+
+Pipeline threads publish events (stage changes, transcript chunks, finished
+analysis sections); async subscribers replay the history from any index and
+then wait for new events. Histories live in this process only and are dropped
+EVENT_RETENTION_SECONDS after the job finishes.
+"""
+
+import os
+import time
+import asyncio
+import threading
+
+EVENT_RETENTION_SECONDS = int(os.getenv("EVENT_RETENTION_SECONDS", "600"))
+
+# Events after which a job's stream ends
+TERMINAL_EVENTS = ("completed", "failed")
+
+
+class JobEventLog:
+    def __init__(self, retention=EVENT_RETENTION_SECONDS):
+        self.retention = retention
+        self._lock = threading.Lock()
+        self._jobs = {}
+
+    def open(self, job_id):
+        with self._lock:
+            self._cleanup()
+            self._jobs.setdefault(job_id, {"events": [], "closed_at": None, "waiters": []})
+
+    def known(self, job_id):
+        with self._lock:
+            return job_id in self._jobs
+
+    def publish(self, job_id, event, data=None):
+        with self._lock:
+            log = self._jobs.get(job_id)
+            if log is None or log["closed_at"] is not None:
+                return
+            log["events"].append((event, data or {}))
+            if event in TERMINAL_EVENTS:
+                log["closed_at"] = time.time()
+            waiters, log["waiters"] = log["waiters"], []
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(waiter.set)
+
+    def _cleanup(self):
+        expired = [job_id for job_id, log in self._jobs.items()
+                   if log["closed_at"] is not None and time.time() - log["closed_at"] > self.retention]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    async def stream(self, job_id, after=0, heartbeat=15.0):
+        """Yield `(index, event, data)` from `after` on until a terminal event.
+
+        Yields None every `heartbeat` seconds without events so the caller can
+        keep the connection alive.
+        """
+        index = after
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                log = self._jobs.get(job_id)
+                if log is None:
+                    return
+                pending = log["events"][index:]
+                finished = log["closed_at"] is not None
+                waiter = None
+                if not pending and not finished:
+                    waiter = asyncio.Event()
+                    log["waiters"].append((loop, waiter))
+
+            for event, data in pending:
+                yield index, event, data
+                index += 1
+                if event in TERMINAL_EVENTS:
+                    return
+            if finished and not pending:
+                return
+            if waiter is not None:
+                try:
+                    await asyncio.wait_for(waiter.wait(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
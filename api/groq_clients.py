@@ -0,0 +1,84 @@
+"""
+Shared, long-lived Groq client for transcription.
+
+One Groq client (and its httpx connection pool) is created lazily and reused
+by every job and chunk, so TLS handshakes happen once per connection instead
+of once per video. Connections use HTTP/2 when the `h2` package is installed.
+Connect and read timeouts are separate, and at most GROQ_MAX_IN_FLIGHT
+transcription requests are sent at a time across all jobs. `close()` is
+called on app shutdown.
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+
+GROQ_CONNECT_TIMEOUT = float(os.getenv("GROQ_CONNECT_TIMEOUT", "10"))
+GROQ_READ_TIMEOUT = float(os.getenv("GROQ_READ_TIMEOUT", "300"))
+GROQ_MAX_IN_FLIGHT = int(os.getenv("GROQ_MAX_IN_FLIGHT", "4"))
+GROQ_HTTP2 = os.getenv("GROQ_HTTP2", "true").lower() in ("1", "true", "yes")
+
+
+def _http2_available():
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class GroqClientManager:
+    def __init__(self, api_key=None, base_url=None, connect_timeout=GROQ_CONNECT_TIMEOUT,
+                 read_timeout=GROQ_READ_TIMEOUT, max_in_flight=GROQ_MAX_IN_FLIGHT, http2=GROQ_HTTP2):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_in_flight = max_in_flight
+        self.http2 = http2 and _http2_available()
+        if http2 and not self.http2:
+            print("⚠️ h2 is not installed, Groq connections fall back to HTTP/1.1 keep-alive")
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+        self._client = None
+
+    def client(self):
+        """The shared Groq client, created on first use (and again after `close()`)."""
+        with self._lock:
+            if self._client is None:
+                import httpx
+                from groq import Groq
+                http_client = httpx.Client(
+                    http2=self.http2,
+                    timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+                    limits=httpx.Limits(max_connections=self.max_in_flight, max_keepalive_connections=self.max_in_flight),
+                )
+                self._client = Groq(
+                    api_key=self.api_key or os.getenv("GROQ_API_KEY", "your-groq-api-key-here"),
+                    base_url=self.base_url,
+                    http_client=http_client,
+                    # transcribe_file() retries with its own backoff
+                    max_retries=0,
+                )
+            return self._client
+
+    @contextmanager
+    def slot(self):
+        """Hold one of the GROQ_MAX_IN_FLIGHT request slots."""
+        with self._slots:
+            yield self.client()
+
+    def transcribe(self, **params):
+        """`audio.transcriptions.create(**params)` within the in-flight cap."""
+        with self.slot() as client:
+            return client.audio.transcriptions.create(**params)
+
+    def close(self):
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+            print("🔌 Closed Groq connection pool")
+
+
+groq_clients = GroqClientManager()
@@ -0,0 +1,177 @@
+"""
+Background job queue for video analysis.
+
+Uploads submitted in job mode are processed by a bounded pool of worker
+threads; each job records its current stage and progress in
+`memory_store.job_records` so clients can poll `GET /jobs/{id}` until the
+result is stored. Every stage change and pipeline event is also published
+to `events` for the streaming endpoint.
+
+Jobs from POST /videos/batch run on their own worker pool with their own
+queue limit, so a backlog of hundreds of videos neither fails against
+MAX_QUEUED_JOBS nor delays interactive uploads queued behind it.
+"""
+
+import os
+import time
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+from memory_store import job_records, video_results, RESULT_STORE_MAX_ENTRIES, JOB_RECORDS_MAX_ENTRIES
+from events import JobEventLog
+import metrics
+
+MAX_JOB_WORKERS = int(os.getenv("MAX_JOB_WORKERS", "2"))
+MAX_QUEUED_JOBS = int(os.getenv("MAX_QUEUED_JOBS", "20"))
+MAX_BATCH_WORKERS = int(os.getenv("MAX_BATCH_WORKERS", "2"))
+MAX_QUEUED_BATCH_JOBS = int(os.getenv("MAX_QUEUED_BATCH_JOBS", "1000"))
+
+if min(RESULT_STORE_MAX_ENTRIES, JOB_RECORDS_MAX_ENTRIES) <= MAX_QUEUED_JOBS + MAX_QUEUED_BATCH_JOBS:
+    print(f"⚠️ RESULT_STORE_MAX_ENTRIES / JOB_RECORDS_MAX_ENTRIES should be well above the {MAX_QUEUED_JOBS + MAX_QUEUED_BATCH_JOBS} "
+          "jobs that can be queued, or results are evicted before clients read them")
+
+# Overall progress reported when a job enters each stage
+STAGE_PROGRESS = {
+    "queued": 0.0,
+    "waiting_for_disk": 0.0,
+    "extracting_audio": 0.05,
+    "transcribing": 0.2,
+    "analyzing": 0.6,
+    "storing": 0.95,
+    "completed": 1.0,
+}
+
+
+class JobManager:
+    def __init__(self, max_workers=MAX_JOB_WORKERS, max_queued=MAX_QUEUED_JOBS,
+                 max_batch_workers=MAX_BATCH_WORKERS, max_queued_batch=MAX_QUEUED_BATCH_JOBS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job-worker")
+        self._batch_executor = ThreadPoolExecutor(max_workers=max_batch_workers, thread_name_prefix="batch-worker")
+        self._max_queued = max_queued
+        self._max_queued_batch = max_queued_batch
+        self._lock = threading.Lock()
+        # Jobs still queued or running in this process; finished jobs live only in job_records
+        self._jobs = {}
+        # The subset of _jobs that came from a batch
+        self._batch_jobs = set()
+        self.events = JobEventLog()
+
+    def _pending_count(self):
+        return len(self._jobs) - len(self._batch_jobs)
+
+    def batch_slots(self):
+        """How many more batch jobs can be queued right now."""
+        with self._lock:
+            return max(0, self._max_queued_batch - len(self._batch_jobs))
+
+    def create(self, job_id, filename, batch=False):
+        with self._lock:
+            if batch and len(self._batch_jobs) >= self._max_queued_batch:
+                raise HTTPException(status_code=503, detail="Too many batch videos are queued. Please try again later.")
+            if not batch and self._pending_count() >= self._max_queued:
+                raise HTTPException(status_code=503, detail="Too many videos are being processed. Please try again later.")
+            now = time.time()
+            job = {
+                "id": job_id,
+                "filename": filename,
+                "status": "queued",
+                "stage": "queued",
+                "progress": 0.0,
+                "detail": {},
+                "error": None,
+                "status_code": None,
+                "created_at": now,
+                "updated_at": now,
+            }
+            self._jobs[job_id] = job
+            if batch:
+                self._batch_jobs.add(job_id)
+            job_records[job_id] = job
+        self.events.open(job_id)
+        self.publish(job_id, "stage", stage="queued", progress=0.0)
+        return dict(job)
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id) or job_records.get(job_id)
+            if job is None:
+                return
+            previous_status = job["status"]
+            job.update(fields)
+            job["updated_at"] = time.time()
+            job_records[job_id] = job
+            if job["status"] in ("completed", "failed"):
+                self._jobs.pop(job_id, None)
+                self._batch_jobs.discard(job_id)
+        if job["status"] != previous_status:
+            if job["status"] == "completed":
+                self.publish(job_id, "completed", id=job_id, result_url=f"/video/{job_id}")
+            elif job["status"] == "failed":
+                self.publish(job_id, "failed", error=job["error"], status_code=job["status_code"])
+
+    def set_stage(self, job_id, stage, **info):
+        fields = {"stage": stage, "detail": info}
+        if stage in STAGE_PROGRESS:
+            fields["progress"] = STAGE_PROGRESS[stage]
+        self.update(job_id, **fields)
+        self.publish(job_id, "stage", **fields["detail"], stage=stage, progress=fields.get("progress"))
+
+    def publish(self, job_id, event, **data):
+        self.events.publish(job_id, event, data)
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return dict(job)
+        # Finished here, or owned by another worker process
+        return job_records.get(job_id)
+
+    def submit(self, job_id, pipeline, *args, **kwargs):
+        """Queue `pipeline(*args, progress=..., emit=..., **kwargs)` and store its result under `job_id`."""
+        with self._lock:
+            executor = self._batch_executor if job_id in self._batch_jobs else self._executor
+        return executor.submit(self._run, job_id, pipeline, *args, **kwargs)
+
+    def _run(self, job_id, pipeline, *args, **kwargs):
+        with metrics.job_context(job_id):
+            return self._run_pipeline(job_id, pipeline, *args, **kwargs)
+
+    def _run_pipeline(self, job_id, pipeline, *args, **kwargs):
+        self.update(job_id, status="running")
+        try:
+            with metrics.span("pipeline"):
+                result = pipeline(
+                    *args,
+                    progress=lambda stage, **info: self.set_stage(job_id, stage, **info),
+                    emit=lambda event, **data: self.publish(job_id, event, **data),
+                    **kwargs,
+                )
+            self.set_stage(job_id, "storing")
+            # The stored breakdown covers everything up to storage; the job record gets the final one
+            result = {**result, "timings": metrics.job_timings(job_id).to_dict()}
+            with metrics.span("storage"):
+                video_results[job_id] = result
+            self.set_stage(job_id, "completed")
+            self.update(job_id, status="completed", timings=metrics.finish_job(job_id))
+            print(f"💾 Results stored with ID: {job_id}")
+            return result
+        except HTTPException as e:
+            print(f"❌ Job {job_id} failed: {e.detail}")
+            self.update(job_id, status="failed", error=e.detail, status_code=e.status_code,
+                        timings=metrics.finish_job(job_id))
+            raise
+        except Exception as e:
+            print(f"❌ Job {job_id} failed unexpectedly: {e}")
+            traceback.print_exc()
+            self.update(job_id, status="failed", error=f"Video processing failed: {str(e)}", status_code=500,
+                        timings=metrics.finish_job(job_id))
+            raise
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._batch_executor.shutdown(wait=False, cancel_futures=True)
+
+
+job_manager = JobManager()
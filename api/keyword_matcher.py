@@ -0,0 +1,98 @@
+"""
+Compiled multi-pattern keyword matcher.
+
+All analyzer lexicons are merged into one trie, and the trie is compiled into
+a single regular expression wrapped in a lookahead. One `finditer` pass over
+the text (in C) then yields every position where some term starts. At each
+position the regex matches the longest term, and every shorter term that
+matches there is one of its prefixes. Enumerating those prefixes recovers
+all (overlapping) occurrences of every term, the same as `term in text`
+checked term by term.
+"""
+
+import re
+from collections import defaultdict
+
+
+def _trie_pattern(node):
+    """Render a trie node ({char: child, "": True at term ends}) as a regex."""
+    is_terminal = "" in node
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if is_terminal:
+        # Greedy optional group: try to extend to a longer term, else stop here
+        return "(?:" + body + ")?" if len(branches) == 1 else body + "?"
+    return body
+
+
+class KeywordHits:
+    """Occurrences of every term found by one scan."""
+
+    def __init__(self, lexicons, positions):
+        self._lexicons = lexicons
+        self.positions = positions  # term -> sorted list of start offsets
+
+    def present(self, term):
+        return term in self.positions
+
+    def count(self, term):
+        """Number of (possibly overlapping) occurrences."""
+        return len(self.positions.get(term, ()))
+
+    def count_non_overlapping(self, term):
+        """Occurrences counted like `str.count`, left to right without overlap."""
+        count = 0
+        next_free = 0
+        for start in self.positions.get(term, ()):
+            if start >= next_free:
+                count += 1
+                next_free = start + len(term)
+        return count
+
+    def found(self, lexicon):
+        """Terms of `lexicon` present in the text, in lexicon order."""
+        return [term for term in self._lexicons[lexicon] if term in self.positions]
+
+    def presence_count(self, lexicon):
+        """Same as `sum(1 for term in lexicon if term in text)`."""
+        return len(self.found(lexicon))
+
+    def any(self, lexicon):
+        return any(term in self.positions for term in self._lexicons[lexicon])
+
+
+class KeywordMatcher:
+    def __init__(self, lexicons):
+        """`lexicons` maps a lexicon name to its list of terms."""
+        self.lexicons = {name: list(terms) for name, terms in lexicons.items()}
+        self.terms = {term for terms in self.lexicons.values() for term in terms if term}
+        self._term_lengths = sorted({len(term) for term in self.terms})
+
+        trie = {}
+        for term in self.terms:
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[""] = True
+        self._regex = re.compile("(?=(" + _trie_pattern(trie) + "))") if self.terms else None
+        # longest match -> every term it contains as a prefix
+        self._expansions = {}
+
+    def _expand(self, longest):
+        terms = self._expansions.get(longest)
+        if terms is None:
+            terms = [longest[:length] for length in self._term_lengths
+                     if length <= len(longest) and longest[:length] in self.terms]
+            self._expansions[longest] = terms
+        return terms
+
+    def scan(self, text):
+        positions = defaultdict(list)
+        if self._regex is not None:
+            for match in self._regex.finditer(text):
+                start = match.start()
+                for term in self._expand(match.group(1)):
+                    positions[term].append(start)
+        return KeywordHits(self.lexicons, dict(positions))
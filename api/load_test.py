@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Load test for the AI Interview Analyzer API
+
+Measures `GET /` latency on an idle server, then again while several long
+video uploads are in flight. With the pipeline running off the event loop the
+health-check latency should stay flat.
+
+Usage: python load_test.py path/to/interview.mp4 [--uploads 4] [--base-url http://localhost:8000]
+"""
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+
+import requests
+
+
+def sample_latency(base_url, duration, interval=0.1):
+    latencies = []
+    deadline = time.time() + duration
+    while time.time() < deadline:
+        start = time.perf_counter()
+        requests.get(f"{base_url}/", timeout=30)
+        latencies.append((time.perf_counter() - start) * 1000)
+        time.sleep(interval)
+    return latencies
+
+
+def summarize(label, latencies):
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies)
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+    print(f"📊 {label}: n={len(latencies)} p50={p50:.1f}ms p95={p95:.1f}ms max={latencies[-1]:.1f}ms")
+    return p95
+
+
+def upload(base_url, video_path, results, index):
+    start = time.perf_counter()
+    try:
+        with open(video_path, "rb") as f:
+            response = requests.post(f"{base_url}/video", files={"video": f}, timeout=900)
+        results[index] = (response.status_code, time.perf_counter() - start)
+    except Exception as e:
+        results[index] = (str(e), time.perf_counter() - start)
+
+
+def run_load_test(base_url, video_path, uploads, idle_seconds, max_ratio):
+    print(f"🧪 Measuring idle health-check latency for {idle_seconds}s...")
+    idle_p95 = summarize("idle", sample_latency(base_url, idle_seconds))
+
+    print(f"📤 Starting {uploads} concurrent uploads of {video_path}...")
+    results = [None] * uploads
+    threads = [threading.Thread(target=upload, args=(base_url, video_path, results, i)) for i in range(uploads)]
+    for t in threads:
+        t.start()
+
+    # Sample until every upload has finished
+    loaded = []
+    while any(t.is_alive() for t in threads):
+        loaded.extend(sample_latency(base_url, 1.0))
+    for t in threads:
+        t.join()
+
+    loaded_p95 = summarize("under load", loaded)
+    for i, (status, elapsed) in enumerate(results):
+        print(f"   upload {i + 1}: {status} in {elapsed:.1f}s")
+
+    # Allow a small absolute floor so tiny idle latencies don't make the ratio noisy
+    limit = max(idle_p95 * max_ratio, idle_p95 + 50)
+    if loaded_p95 > limit:
+        print(f"❌ Health-check p95 grew from {idle_p95:.1f}ms to {loaded_p95:.1f}ms (limit {limit:.1f}ms)")
+        return False
+    print("✅ Health-check latency stayed flat while uploads were in flight")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video", help="video file to upload")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--uploads", type=int, default=4, help="number of concurrent uploads")
+    parser.add_argument("--idle-seconds", type=float, default=5.0)
+    parser.add_argument("--max-ratio", type=float, default=3.0, help="allowed p95 growth under load")
+    args = parser.parse_args()
+
+    print("🧪 Load testing AI Interview Analyzer API...")
+    ok = run_load_test(args.base_url, args.video, args.uploads, args.idle_seconds, args.max_ratio)
+    sys.exit(0 if ok else 1)
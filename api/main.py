@@ -1,22 +1,42 @@
 import os
 import uuid
 import asyncio
-import time
-import tempfile
-from fastapi import FastAPI, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse
-from fastapi.middleware.cors import CORSMiddleware
-from utils import extract_audio
-from analysis import analyze_all
-from groq import Groq
-from memory_store import video_results
 
 # Load environment variables from .env file
 from dotenv import load_dotenv
 load_dotenv()
 
+import json
+from typing import List, Optional
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse
+from fastapi.middleware.cors import CORSMiddleware
+from memory_store import video_results
+from pipeline import run_pipeline, analysis_cache_key
+from jobs import job_manager
+from utils import save_upload, file_sha256, RequestSizeLimit, MAX_UPLOAD_BYTES
+from cache import result_cache
+from groq_clients import groq_clients
+from workspace import workspace_manager, estimate_reservation, estimate_scratch, WORKSPACE_WAIT_SECONDS
+from transcription import get_audio_duration
+from warmup import warmup
+import metrics
+
+# Most videos accepted by one POST /videos/batch
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "200"))
+# Largest request body POST /videos/batch accepts, all files together
+BATCH_MAX_UPLOAD_BYTES = int(os.getenv("BATCH_MAX_UPLOAD_MB", "4096")) * 1024 * 1024
+
 app = FastAPI()
 
+# Oversized uploads are refused while they stream in, before Starlette spools
+# them to a temporary file (added first so CORS headers still wrap the 413)
+app.add_middleware(RequestSizeLimit, limits={
+    "/video": MAX_UPLOAD_BYTES,
+    "/videos/batch": BATCH_MAX_UPLOAD_BYTES,
+})
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -36,38 +56,48 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Use temp directory instead of creating uploads folder
-UPLOAD_FOLDER = tempfile.gettempdir()
-print(f"📁 Using upload folder: {UPLOAD_FOLDER}")
+# Uploads and intermediate audio live in per-job workspaces (see workspace.py)
+print(f"📁 Using job workspaces under: {workspace_manager.root}")
 
-# Get API key from environment variable (more secure)
-GROQ_API_KEY = os.getenv("GROQ_API_KEY", "your-groq-api-key-here")
+# Directory server-side batch manifests may read from; manifests are refused when unset
+BATCH_INPUT_ROOT = os.getenv("BATCH_INPUT_ROOT", "")
 
-# Test if Groq client can be initialized
-try:
-    client = Groq(api_key=GROQ_API_KEY)
-    print("✅ Groq client initialized successfully")
-except Exception as e:
-    print(f"❌ Failed to initialize Groq client: {e}")
-    client = None
+# Largest custom sensitive-word watchlist accepted per upload
+SENSITIVE_WATCHLIST_MAX_TERMS = int(os.getenv("SENSITIVE_WATCHLIST_MAX_TERMS", "20000"))
+
+
+def get_groq_client():
+    """The shared Groq client (also used for transcription), created on first use or during warm-up."""
+    try:
+        return groq_clients.client()
+    except Exception as e:
+        print(f"❌ Failed to initialize Groq client: {e}")
+        return None
 
 
 @app.get("/")
-async def root():
-    return {"message": "AI Interview Analyzer API is running", "groq_available": client is not None}
+def root():
+    return {"message": "AI Interview Analyzer API is running", "groq_available": get_groq_client() is not None}
+
+
+@app.get("/ready")
+def ready():
+    """Readiness probe: 503 until the startup warm-up has loaded models and corpora."""
+    return JSONResponse(status_code=200 if warmup.ready else 503, content=warmup.to_dict())
 
 
 @app.get("/test")
 async def test_endpoint():
     """Test endpoint to check if the API is working"""
     groq_status = "available"
+    client = get_groq_client()
     if client is None:
         groq_status = "unavailable"
     else:
         # Test if we can actually use the Groq client
         try:
             # This is a simple test that doesn't use credits
-            models = client.models.list()
+            models = await run_in_threadpool(client.models.list)
             # Check if whisper-large-v3 is available
             model_names = [m.id for m in models.data]
             if "whisper-large-v3" in model_names:
@@ -84,147 +114,418 @@ async def test_endpoint():
     }
 
 
+def parse_list(raw, field, separators=("\n", ",")):
+    """Parse a form field given as a JSON list of strings or as separated values."""
+    if raw is None or not raw.strip():
+        return []
+    if raw.lstrip().startswith("["):
+        try:
+            items = json.loads(raw)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"{field} is not a valid JSON list")
+        if not isinstance(items, list) or not all(isinstance(t, str) for t in items):
+            raise HTTPException(status_code=400, detail=f"{field} must be a list of strings")
+    else:
+        for separator in separators[1:]:
+            raw = raw.replace(separator, separators[0])
+        items = raw.split(separators[0])
+    return list(dict.fromkeys(t.strip() for t in items if t.strip()))
+
+
+def parse_watchlist(raw):
+    """Parse a sensitive-word watchlist given as a JSON list or one term per line/comma."""
+    terms = parse_list(raw, "sensitive_words")
+    if len(terms) > SENSITIVE_WATCHLIST_MAX_TERMS:
+        raise HTTPException(status_code=400, detail=f"sensitive_words exceeds {SENSITIVE_WATCHLIST_MAX_TERMS} terms")
+    return terms or None
+
+
+def resolve_manifest(raw):
+    """Map a manifest of server-side paths (relative to BATCH_INPUT_ROOT) to `(entry, path or None)`."""
+    entries = parse_list(raw, "manifest", separators=("\n",))
+    if not entries:
+        return []
+    if not BATCH_INPUT_ROOT:
+        raise HTTPException(status_code=403, detail="Server-side manifests are disabled (BATCH_INPUT_ROOT is not set)")
+    root = os.path.realpath(BATCH_INPUT_ROOT)
+    resolved = []
+    for entry in entries:
+        path = os.path.realpath(os.path.join(root, entry))
+        inside = path.startswith(root + os.sep)
+        resolved.append((entry, path if inside and os.path.isfile(path) else None))
+    return resolved
+
+
+def _fail_job(result_id, error):
+    job_manager.update(result_id, status="failed", error=error.detail, status_code=error.status_code)
+
+
+def _queue_stored(result_id, video_path, content_hash, watchlist, workspace):
+    """Answer a stored video from the result cache or queue its pipeline.
+
+    Returns the job future, or None when the cached analysis was reused.
+    """
+    # Duplicate uploads are answered straight from the result cache
+    cached_result = result_cache.get(analysis_cache_key(content_hash, watchlist), "analysis")
+    if cached_result is not None:
+        print(f"♻️ Duplicate upload, reusing cached analysis for {content_hash[:12]}")
+        video_results[result_id] = {**cached_result, "timings": metrics.finish_job(result_id)}
+        job_manager.set_stage(result_id, "completed", cached=True)
+        job_manager.update(result_id, status="completed")
+        return None
+
+    # Every blocking stage (moviepy, Groq, translation) runs on the job
+    # worker pool so the event loop stays free for other requests
+    future = job_manager.submit(
+        result_id, run_pipeline, video_path,
+        content_hash=content_hash, sensitive_words=watchlist, work_dir=workspace.path,
+    )
+    # The workspace goes away however the job ends: success, failure or cancellation
+    future.add_done_callback(lambda _: workspace_manager.release(result_id))
+    return future
+
+
+async def queue_upload(video, watchlist, batch=False):
+    """Store an upload in its own workspace and queue it; returns `(job_id, future or None)`.
+
+    Batch uploads don't wait for disk budget: the batch checked that they fit before storing any.
+    """
+    # Reserve the job slot before storing the upload
+    result_id = uuid.uuid4().hex
+    job_manager.create(result_id, video.filename, batch=batch)
+
+    # Wait for disk budget, then store the upload in the job's own workspace
+    try:
+        workspace = await run_in_threadpool(workspace_manager.acquire, result_id, estimate_reservation(video.size),
+                                            0 if batch else WORKSPACE_WAIT_SECONDS)
+    except HTTPException as e:
+        _fail_job(result_id, e)
+        raise
+    future = None
+    try:
+        video_path = workspace.file(video.filename or "upload")
+
+        print(f"💾 Saving video to: {video_path}")
+        try:
+            with metrics.job_context(result_id), metrics.span("upload"):
+                size, content_hash = await save_upload(video, video_path)
+                metrics.count("upload_bytes", size)
+        except HTTPException as e:
+            _fail_job(result_id, e)
+            raise
+        job_manager.update(result_id, size=size, sha256=content_hash)
+        job_manager.publish(result_id, "upload_saved", size=size, sha256=content_hash)
+        print(f"✅ Video saved successfully, size: {size} bytes, sha256: {content_hash[:12]}")
+
+        future = await run_in_threadpool(_queue_stored, result_id, video_path, content_hash, watchlist, workspace)
+    finally:
+        if future is None:
+            metrics.finish_job(result_id)
+            await run_in_threadpool(workspace_manager.release, result_id)
+    return result_id, future
+
+
+def run_server_file(result_id, path, watchlist, progress, emit):
+    """Job for a video read in place: hash it, reserve scratch space and run the pipeline.
+
+    Runs on a batch worker, so it waits for disk budget as long as it takes
+    instead of holding up the request that queued it.
+    """
+    with metrics.span("hash_input"):
+        size, content_hash = file_sha256(path)
+    job_manager.update(result_id, size=size, sha256=content_hash)
+    emit("upload_saved", size=size, sha256=content_hash)
+    # The workspace only holds the extracted audio, chunks and decoded samples
+    progress("waiting_for_disk")
+    workspace = workspace_manager.acquire(result_id, estimate_scratch(get_audio_duration(path)), timeout=None)
+    try:
+        return run_pipeline(path, progress=progress, emit=emit, content_hash=content_hash,
+                            sensitive_words=watchlist, work_dir=workspace.path)
+    finally:
+        workspace_manager.release(result_id)
+
+
+def queue_server_file(path, watchlist, batch=False):
+    """Queue a video already on the server's disk (read in place); returns the job id."""
+    result_id = uuid.uuid4().hex
+    job_manager.create(result_id, os.path.basename(path), batch=batch)
+    job_manager.submit(result_id, run_server_file, result_id, path, watchlist)
+    return result_id
+
+
+def _log_unexpected(e):
+    print(f"❌ Unexpected error processing video: {str(e)}")
+    print(f"🔍 Error type: {type(e).__name__}")
+    import traceback
+    traceback.print_exc()
+
+
 @app.post("/video")
-async def upload_video(video: UploadFile = File(...)):
+async def upload_video(video: UploadFile = File(...), background: bool = False, sensitive_words: Optional[str] = Form(None)):
+    """Upload and analyze a video.
+
+    With `?background=true` the request returns a job id as soon as the upload
+    is stored; poll `GET /jobs/{id}` (or `GET /video/{id}`) for progress, or
+    follow `GET /jobs/{id}/events` for a live stream of partial results.
+    The optional `sensitive_words` form field replaces the default watchlist
+    (a JSON list, or terms separated by newlines or commas).
+    """
     try:
         print(f"📹 Received video upload: {video.filename}, size: {video.size}")
         
         # Check if Groq client is available
-        if client is None:
+        if await run_in_threadpool(get_groq_client) is None:
             raise HTTPException(status_code=500, detail="Groq API client is not available")
-        
-        filename = f"{uuid.uuid4().hex}_{video.filename}"
-        video_path = os.path.join(UPLOAD_FOLDER, filename)
 
-        print(f"💾 Saving video to: {video_path}")
-        with open(video_path, "wb") as f:
-            content = await video.read()
-            f.write(content)
-            print(f"✅ Video saved successfully, size: {len(content)} bytes")
+        watchlist = parse_watchlist(sensitive_words)
+        result_id, future = await queue_upload(video, watchlist)
+        if future is None:
+            return {"message": "Video processed successfully", "id": result_id, "cached": True}
 
-        print("🎵 Extracting audio from video...")
-        try:
-            audio_path = extract_audio(video_path)
-            print(f"✅ Audio extracted to: {audio_path}")
-        except Exception as e:
-            print(f"❌ Audio extraction failed: {e}")
-            raise HTTPException(status_code=500, detail=f"Audio extraction failed: {str(e)}")
+        if background:
+            print(f"📥 Queued job: {result_id}")
+            return JSONResponse(
+                status_code=202,
+                content={
+                    "message": "Video queued for processing",
+                    "id": result_id,
+                    "status_url": f"/jobs/{result_id}",
+                    "events_url": f"/jobs/{result_id}/events",
+                },
+            )
 
-        print("🗣️ Starting transcription with Groq...")
-        try:
-            # Check audio file size
-            audio_size = os.path.getsize(audio_path)
-            print(f"📊 Audio file size: {audio_size / (1024*1024):.2f} MB")
-            
-            # Groq has a 25MB limit for audio files
-            if audio_size > 25 * 1024 * 1024:
-                raise HTTPException(status_code=413, detail="Audio file too large (max 25MB)")
-            
-            with open(audio_path, "rb") as file:
-                audio_data = file.read()
-                print(f"📤 Sending {len(audio_data)} bytes to Groq API...")
-                
-                # Create a new Groq client with timeout settings
-                import httpx
-                timeout_client = Groq(
-                    api_key=GROQ_API_KEY,
-                    http_client=httpx.Client(timeout=300.0)  # 5 minutes timeout
-                )
-                
-                # Add retry logic for connection issues
-                max_retries = 3
-                for attempt in range(max_retries):
-                    try:
-                        print(f"🔄 Transcription attempt {attempt + 1}/{max_retries}")
-                        start_time = time.time()
-                        
-                        transcription = timeout_client.audio.transcriptions.create(
-                            file=(audio_path, audio_data),
-                            model="whisper-large-v3",
-                            temperature=0.09,
-                            language="ar",
-                            response_format="verbose_json",
-                            timestamp_granularities=["segment", "word"],
-                        )
-                        
-                        elapsed_time = time.time() - start_time
-                        print(f"✅ Transcription completed in {elapsed_time:.2f} seconds")
-                        break
-                        
-                    except Exception as retry_error:
-                        elapsed_time = time.time() - start_time
-                        print(f"❌ Transcription attempt {attempt + 1} failed after {elapsed_time:.2f}s: {retry_error}")
-                        
-                        if attempt == max_retries - 1:
-                            # Last attempt failed
-                            error_msg = str(retry_error).lower()
-                            if "timeout" in error_msg or "connection" in error_msg:
-                                raise HTTPException(
-                                    status_code=504, 
-                                    detail="Transcription timed out. The audio file might be too long or the server is busy. Please try with a shorter video or try again later."
-                                )
-                            elif "rate limit" in error_msg:
-                                raise HTTPException(status_code=429, detail="API rate limit exceeded. Please try again later.")
-                            elif "authentication" in error_msg or "unauthorized" in error_msg:
-                                raise HTTPException(status_code=401, detail="API authentication failed. Please check API key.")
-                            else:
-                                raise HTTPException(
-                                    status_code=500, 
-                                    detail=f"Transcription failed after {max_retries} attempts: {str(retry_error)}"
-                                )
-                        else:
-                            # Wait before retry with exponential backoff
-                            wait_time = 2 ** attempt  # 2, 4, 8 seconds
-                            print(f"⏳ Waiting {wait_time} seconds before retry...")
-                            time.sleep(wait_time)
-                            
-        except HTTPException:
-            raise
-        except Exception as e:
-            print(f"❌ Transcription failed: {e}")
-            print(f"🔍 Error type: {type(e).__name__}")
-            raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}")
+        await asyncio.wrap_future(future)
+        return {"message": "Video processed successfully", "id": result_id}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        _log_unexpected(e)
+        raise HTTPException(status_code=500, detail=f"Video processing failed: {str(e)}")
 
-        try:
-            transcript_dict = transcription.model_dump()
-            parsed_transcript = [
-                {"start": s["start"], "end": s["end"], "text": s["text"]}
-                for s in transcript_dict["segments"]
-            ]
-            print(f"📝 Parsed {len(parsed_transcript)} transcript segments")
-        except Exception as e:
-            print(f"❌ Transcript parsing failed: {e}")
-            raise HTTPException(status_code=500, detail=f"Transcript parsing failed: {str(e)}")
 
-        print("🔍 Starting analysis...")
+@app.post("/videos/batch")
+async def upload_batch(
+    videos: List[UploadFile] = File([]),
+    manifest: Optional[str] = Form(None),
+    sensitive_words: Optional[str] = Form(None),
+):
+    """Queue many videos at once as background jobs.
+
+    Send the files as repeated `videos` parts and/or a `manifest` of paths
+    relative to BATCH_INPUT_ROOT on the server (a JSON list or one per line),
+    which are read in place. Answers 202 with one item per input: its job id
+    and status URL, or the error that kept it from being queued.
+    """
+    if await run_in_threadpool(get_groq_client) is None:
+        raise HTTPException(status_code=500, detail="Groq API client is not available")
+    watchlist = parse_watchlist(sensitive_words)
+    paths = resolve_manifest(manifest)
+    if not videos and not paths:
+        raise HTTPException(status_code=400, detail="Send video files or a manifest of server-side paths")
+    if len(videos) + len(paths) > BATCH_MAX_FILES:
+        raise HTTPException(status_code=400, detail=f"A batch is limited to {BATCH_MAX_FILES} videos")
+    # Refuse the whole batch rather than queue part of it
+    if len(videos) + len(paths) > job_manager.batch_slots():
+        raise HTTPException(status_code=503, detail="Too many batch videos are queued. Please try again later.")
+    # Every upload is stored before any of them runs, so they must fit in the disk budget together;
+    # server-side paths reserve their scratch space once a worker picks them up
+    if sum(estimate_reservation(video.size) for video in videos) > workspace_manager.free_bytes:
+        raise HTTPException(status_code=503, detail="Server is out of working disk space for this batch. Please try again later.")
+
+    print(f"📦 Received batch of {len(videos)} uploads and {len(paths)} server-side paths")
+    inputs = [(video.filename, video, None) for video in videos] + [(entry, None, path) for entry, path in paths]
+    items = []
+    for name, video, path in inputs:
+        item = {"input": name}
         try:
-            result = analyze_all(parsed_transcript)
-            print("✅ Analysis completed")
+            if video is not None:
+                result_id, future = await queue_upload(video, watchlist, batch=True)
+                item.update(id=result_id, cached=future is None)
+            elif path is None:
+                raise HTTPException(status_code=404, detail="File not found under BATCH_INPUT_ROOT")
+            else:
+                item.update(id=queue_server_file(path, watchlist, batch=True))
+            item.update(status_url=f"/jobs/{item['id']}")
+        except HTTPException as e:
+            item.update(error=e.detail, status_code=e.status_code)
         except Exception as e:
-            print(f"❌ Analysis failed: {e}")
-            raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+            _log_unexpected(e)
+            item.update(error=f"Video processing failed: {str(e)}", status_code=500)
+        items.append(item)
 
-        result_id = uuid.uuid4().hex
-        video_results[result_id] = result
-        print(f"💾 Results stored with ID: {result_id}")
+    queued = sum(1 for item in items if "id" in item)
+    return JSONResponse(status_code=202, content={"message": f"{queued} of {len(items)} videos queued", "items": items})
 
-        return {"message": "Video processed successfully", "id": result_id}
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"❌ Unexpected error processing video: {str(e)}")
-        print(f"🔍 Error type: {type(e).__name__}")
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=f"Video processing failed: {str(e)}")
+@app.get("/metrics")
+def get_metrics():
+    """Prometheus metrics: per-stage latency histograms, work counters and memory."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job ID not found")
+    return job
+
+
+def _sse(index, event, data):
+    return f"id: {index}\nevent: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str, request: Request):
+    """Server-Sent Events stream of a job: stages, transcript chunks and analysis sections.
+
+    Events are replayed from the start (or after `Last-Event-ID` on reconnect)
+    and the stream ends with a `completed` or `failed` event.
+    """
+    if not job_manager.events.known(job_id):
+        # Finished long ago or handled by another worker process: send a snapshot
+        job = job_manager.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job ID not found")
+        if job["status"] == "completed":
+            snapshot = _sse(0, "completed", {"id": job_id, "result_url": f"/video/{job_id}"})
+        elif job["status"] == "failed":
+            snapshot = _sse(0, "failed", {"error": job["error"], "status_code": job["status_code"]})
+        else:
+            snapshot = _sse(0, "stage", {"stage": job["stage"], "progress": job["progress"], **job["detail"]})
+        return StreamingResponse(iter([snapshot]), media_type="text/event-stream")
+
+    last_event_id = request.headers.get("last-event-id", "")
+    after = int(last_event_id) + 1 if last_event_id.isdigit() else 0
+
+    async def event_stream():
+        async for item in job_manager.events.stream(job_id, after=after):
+            if await request.is_disconnected():
+                break
+            if item is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield _sse(*item)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# Long result sections that can be read page by page
+PAGED_SECTIONS = ("translation", "sensitive_words")
+
+
+def _stored_result(video_id):
+    """The stored analysis of a video, or the job record (202) while it is still being processed."""
+    result = video_results.get(video_id)
+    if result is None:
+        job = job_manager.get(video_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Video ID not found")
+        if job["status"] == "failed":
+            raise HTTPException(status_code=job["status_code"] or 500, detail=job["error"])
+        # Still queued or running
+        return None, JSONResponse(status_code=202, content=job)
+    return result, None
+
+
+def report_sections(video_id, result, sections=None):
+    """Build the requested comprehensive_report sections on first use and keep them with the result."""
+    # The analyzers are only needed once a report is asked for
+    from analysis import REPORT_SECTIONS, report_for_result
+    report = dict(result.get("comprehensive_report") or {})
+    missing = [name for name in (sections or REPORT_SECTIONS) if name not in report]
+    if missing:
+        with metrics.span("report"):
+            report.update(report_for_result(result, missing))
+        video_results[video_id] = {**result, "comprehensive_report": report}
+    return {name: report[name] for name in (sections or REPORT_SECTIONS)}
+
+
+def project_result(video_id, result, fields):
+    """Pick `fields` (top-level keys, or `key.subkey` inside a section) out of a stored result."""
+    from analysis import REPORT_SECTIONS
+    projected = {}
+    report_fields = []
+    for field in fields:
+        name, _, key = field.partition(".")
+        if name == "comprehensive_report":
+            if key and key not in REPORT_SECTIONS:
+                raise HTTPException(status_code=400, detail=f"Unknown report section: {key}")
+            report_fields.append(key)
+        elif name not in result:
+            if name != "stage_errors":
+                raise HTTPException(status_code=400, detail=f"Unknown field: {name}")
+        elif not key:
+            projected[name] = result[name]
+        elif isinstance(result[name], dict) and key in result[name]:
+            projected.setdefault(name, {})[key] = result[name][key]
+        else:
+            raise HTTPException(status_code=400, detail=f"Unknown field: {field}")
+    if report_fields:
+        # A bare `comprehensive_report` asks for every section
+        sections = None if "" in report_fields else list(dict.fromkeys(report_fields))
+        projected["comprehensive_report"] = report_sections(video_id, result, sections)
+    return projected
 
 
 @app.get("/video/{video_id}")
-def get_analysis(video_id: str):
-    if video_id not in video_results:
-        raise HTTPException(status_code=404, detail="Video ID not found")
-    return JSONResponse(content=video_results[video_id])
+def get_analysis(video_id: str, fields: Optional[str] = None):
+    """Get the analysis of a video.
+
+    `?fields=` limits the response to a comma-separated list of sections, or of
+    keys inside one (`sentiment.positive`, `comprehensive_report.executive_summary`).
+    The comprehensive report is built on first request and then kept with the result.
+    """
+    result, pending = _stored_result(video_id)
+    if pending is not None:
+        return pending
+    if fields is not None:
+        return JSONResponse(content=project_result(video_id, result, parse_list(fields, "fields", separators=(",",))))
+    return JSONResponse(content={**result, "comprehensive_report": report_sections(video_id, result)})
+
+
+@app.get("/video/{video_id}/{section}")
+def get_analysis_page(video_id: str, section: str, offset: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=1000)):
+    """Page through a long section of the analysis (`translation` or `sensitive_words`)."""
+    if section not in PAGED_SECTIONS:
+        raise HTTPException(status_code=404, detail=f"Section {section} can't be paged; use one of {', '.join(PAGED_SECTIONS)}")
+    result, pending = _stored_result(video_id)
+    if pending is not None:
+        return pending
+    items = result.get(section, [])
+    page = {
+        "id": video_id,
+        "section": section,
+        "total": len(items),
+        "offset": offset,
+        "limit": limit,
+        "items": items[offset:offset + limit],
+    }
+    error = result.get("stage_errors", {}).get(section)
+    if error:
+        page["error"] = error
+    return page
+
+
+@app.on_event("startup")
+def sweep_workspaces():
+    workspace_manager.sweep_orphans()
+
+
+@app.on_event("startup")
+def start_warmup():
+    warmup.start()
+
+
+@app.on_event("shutdown")
+def shutdown_jobs():
+    job_manager.shutdown()
+    groq_clients.close()
 
 
 if __name__ == "__main__":
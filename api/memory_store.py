@@ -1,3 +1,197 @@
-from typing import Dict
+"""
+Result storage backends.
 
-video_results: Dict[str, dict] = {}
+`video_results` holds finished analyses and `job_records` the status of
+background jobs. Both are bounded and expire entries after a TTL. The
+default in-memory backend is private to one process; set
+RESULT_STORE=sqlite to share results between uvicorn workers through a local
+SQLite file.
+"""
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+RESULT_STORE = os.getenv("RESULT_STORE", "memory")
+RESULT_STORE_PATH = os.getenv("RESULT_STORE_PATH", os.path.join(tempfile.gettempdir(), "interview-analyzer-results.sqlite3"))
+RESULT_TTL_SECONDS = int(os.getenv("RESULT_TTL_SECONDS", str(24 * 3600)))
+# Kept well above the queued-job limits (jobs.py) so a full batch can't evict its own results
+RESULT_STORE_MAX_ENTRIES = int(os.getenv("RESULT_STORE_MAX_ENTRIES", "4000"))
+JOB_RECORDS_MAX_ENTRIES = int(os.getenv("JOB_RECORDS_MAX_ENTRIES", "10000"))
+
+
+def _encode(value):
+    return zlib.compress(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+
+
+def _decode(blob):
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+class ResultStore(ABC):
+    """Dict-like interface shared by every backend."""
+
+    @abstractmethod
+    def get(self, key, default=None):
+        """Return the stored value, or `default` when missing or expired."""
+
+    @abstractmethod
+    def set(self, key, value):
+        """Store a JSON-serializable value for `ttl` seconds."""
+
+    @abstractmethod
+    def delete(self, key):
+        """Remove a key if present."""
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def __delitem__(self, key):
+        self.delete(key)
+
+
+class MemoryResultStore(ResultStore):
+    """Per-process LRU store with TTL expiry; values are kept compressed."""
+
+    def __init__(self, max_entries=RESULT_STORE_MAX_ENTRIES, ttl=RESULT_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, blob = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+        return _decode(blob)
+
+    def set(self, key, value):
+        blob = _encode(value)
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, blob)
+            self._entries.move_to_end(key)
+            self._cleanup()
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def _cleanup(self):
+        now = time.time()
+        for key in [k for k, (expires_at, _) in self._entries.items() if expires_at < now]:
+            del self._entries[key]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class SQLiteResultStore(ResultStore):
+    """Local-file store shared by every process on the host.
+
+    WAL journaling lets readers proceed while another worker writes, and the
+    busy timeout serializes concurrent writers instead of failing them.
+    """
+
+    CLEANUP_INTERVAL = 60  # seconds between expired-entry sweeps
+
+    def __init__(self, path=RESULT_STORE_PATH, namespace="results", max_entries=RESULT_STORE_MAX_ENTRIES, ttl=RESULT_TTL_SECONDS):
+        self.path = path
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._local = threading.local()
+        self._last_cleanup = 0.0
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL,"
+                " expires_at REAL NOT NULL, accessed_at REAL NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS results_expiry ON results (expires_at)")
+
+    def _connect(self):
+        # sqlite3 connections may not be shared across threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key, default=None):
+        now = time.time()
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT value FROM results WHERE namespace = ? AND key = ? AND expires_at >= ?",
+            (self.namespace, key, now),
+        ).fetchone()
+        if row is None:
+            return default
+        with conn:
+            conn.execute(
+                "UPDATE results SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (now, self.namespace, key),
+            )
+        return _decode(row[0])
+
+    def set(self, key, value):
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results (namespace, key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, key, _encode(value), now + self.ttl, now),
+            )
+        if now - self._last_cleanup > self.CLEANUP_INTERVAL:
+            self._last_cleanup = now
+            self.cleanup()
+
+    def delete(self, key):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM results WHERE namespace = ? AND key = ?", (self.namespace, key))
+
+    def cleanup(self):
+        """Drop expired entries and the least recently used ones beyond max_entries."""
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM results WHERE expires_at < ?", (time.time(),))
+            conn.execute(
+                "DELETE FROM results WHERE namespace = ? AND key IN ("
+                " SELECT key FROM results WHERE namespace = ? ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.namespace, self.namespace, self.max_entries),
+            )
+
+
+def create_result_store(namespace, max_entries=RESULT_STORE_MAX_ENTRIES, backend=RESULT_STORE):
+    if backend == "sqlite":
+        return SQLiteResultStore(namespace=namespace, max_entries=max_entries)
+    if backend == "memory":
+        return MemoryResultStore(max_entries=max_entries)
+    raise ValueError(f"Unknown RESULT_STORE backend: {backend}")
+
+
+video_results = create_result_store("results")
+job_records = create_result_store("jobs", JOB_RECORDS_MAX_ENTRIES)
@@ -0,0 +1,218 @@
+"""
+Per-stage timing spans, counters and memory samples.
+
+`span(name)` times a block of work and `count(name, n)` bumps a counter. Both
+feed the process-wide Prometheus metrics served on `/metrics` and, when a job
+is active in the current context (`job_context`), that job's own breakdown,
+which is stored with its result under "timings". Work handed to thread pools
+keeps its job context when submitted through `in_context(func)`.
+
+Metrics live in this process only; with several worker processes each one
+serves its own `/metrics`.
+"""
+
+import os
+import time
+import resource
+import threading
+import contextvars
+from contextlib import contextmanager
+
+# Histogram buckets in seconds, from quick analyzers up to long transcriptions
+DURATION_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_bytes():
+    """Current resident memory, or the peak when /proc is not available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return peak_rss_bytes()
+
+
+def peak_rss_bytes():
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in values)
+    return "{" + ",".join(f'{n}="{v}"' for n, v in zip(names, escaped)) + "}"
+
+
+class Histogram:
+    def __init__(self, name, help_text, labelnames=(), buckets=DURATION_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+
+    def observe(self, value, *labelvalues):
+        with self._lock:
+            series = self._series.setdefault(labelvalues, [0] * len(self.buckets) + [0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labelvalues, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series):
+                    lines.append(f"{self.name}_bucket{_labels(self.labelnames + ('le',), labelvalues + (bound,))} {count}")
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames + ('le',), labelvalues + ('+Inf',))} {series[-1]}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, labelvalues)} {series[-2]}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, labelvalues)} {series[-1]}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, amount=1, *labelvalues):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labelvalues, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, labelvalues)} {value}")
+        return lines
+
+
+STAGE_SECONDS = Histogram(
+    "interview_stage_duration_seconds", "Time spent in each pipeline stage and analyzer.", ["stage"])
+STAGE_FAILURES = Counter(
+    "interview_stage_failures_total", "Pipeline stages and analyzers that raised.", ["stage"])
+EVENTS = Counter(
+    "interview_events_total", "Work counters: bytes, segments, translation requests, retries.", ["name"])
+
+
+def render():
+    """All metrics in the Prometheus text exposition format."""
+    lines = STAGE_SECONDS.render() + STAGE_FAILURES.render() + EVENTS.render()
+    lines += [
+        "# HELP process_resident_memory_bytes Resident memory size in bytes.",
+        "# TYPE process_resident_memory_bytes gauge",
+        f"process_resident_memory_bytes {rss_bytes()}",
+        "# HELP process_peak_resident_memory_bytes Peak resident memory size in bytes.",
+        "# TYPE process_peak_resident_memory_bytes gauge",
+        f"process_peak_resident_memory_bytes {peak_rss_bytes()}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+class JobTimings:
+    """Timing breakdown of one job: spans in start order, counters and peak memory."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self.spans = []
+        self.counters = {}
+        self.peak_rss = 0
+
+    def add_span(self, name, start, seconds, rss, error=None):
+        with self._lock:
+            span = {
+                "name": name,
+                "start": round(start - self.started, 3),
+                "seconds": round(seconds, 3),
+                "rss_mb": round(rss / 1e6, 1),
+            }
+            if error is not None:
+                span["error"] = error
+            self.spans.append(span)
+            self.peak_rss = max(self.peak_rss, rss)
+
+    def count(self, name, amount):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "total_seconds": round(time.perf_counter() - self.started, 3),
+                "spans": sorted(self.spans, key=lambda span: span["start"]),
+                "counters": dict(self.counters),
+                "peak_rss_mb": round(self.peak_rss / 1e6, 1),
+            }
+
+
+_current_job = contextvars.ContextVar("current_job_timings", default=None)
+_jobs_lock = threading.Lock()
+_jobs = {}
+
+
+def job_timings(job_id):
+    """The breakdown collected for `job_id` so far (created on first use)."""
+    with _jobs_lock:
+        return _jobs.setdefault(job_id, JobTimings())
+
+
+def finish_job(job_id):
+    """Stop collecting for `job_id` and return its breakdown as a dict."""
+    with _jobs_lock:
+        timings = _jobs.pop(job_id, None)
+    return timings.to_dict() if timings is not None else None
+
+
+@contextmanager
+def job_context(job_id):
+    """Attribute spans and counters in this block (and `in_context` work) to `job_id`."""
+    token = _current_job.set(job_timings(job_id))
+    try:
+        yield
+    finally:
+        _current_job.reset(token)
+
+
+def in_context(func):
+    """Wrap `func` to run in a copy of the caller's context (for thread pools).
+
+    Each call gets its own copy, since one context can't be entered by two
+    threads at once.
+    """
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.copy().run(func, *args, **kwargs)
+
+
+@contextmanager
+def span(name):
+    timings = _current_job.get()
+    started = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = type(e).__name__
+        STAGE_FAILURES.inc(1, name)
+        raise
+    finally:
+        seconds = time.perf_counter() - started
+        STAGE_SECONDS.observe(seconds, name)
+        if timings is not None:
+            timings.add_span(name, started, seconds, rss_bytes(), error)
+
+
+def count(name, amount=1):
+    EVENTS.inc(amount, name)
+    timings = _current_job.get()
+    if timings is not None:
+        timings.count(name, amount)
@@ -0,0 +1,121 @@
+"""
+Video analysis pipeline: audio extraction -> Groq transcription -> analysis.
+
+The stages are plain blocking functions so they can run either inline in a
+request or on a background worker (see jobs.py).
+"""
+
+import os
+import hashlib
+from fastapi import HTTPException
+from utils import extract_audio
+from transcription import transcribe_audio, parse_transcript
+from cache import result_cache
+from sentiment import SENTIMENT_BACKEND
+from translation import TRANSLATION_PROVIDER
+from metrics import span, count
+
+
+def analysis_cache_key(content_hash, sensitive_words=None, sentiment_backend=None, translation_provider=None):
+    """Cache key of an analysis.
+
+    Results depend on the sentiment backend and translation provider in use, so
+    deployments sharing RESULT_CACHE_DIR with different settings don't serve each
+    other's labels; custom sensitive-word watchlists get their own entry too.
+    """
+    if not content_hash:
+        return content_hash
+    key = f"{content_hash}:{sentiment_backend or SENTIMENT_BACKEND}:{translation_provider or TRANSLATION_PROVIDER}"
+    if not sensitive_words:
+        return key
+    digest = hashlib.sha256("\n".join(sensitive_words).encode("utf-8")).hexdigest()
+    return f"{key}:{digest}"
+
+
+def _notify(progress, stage, **info):
+    if progress is not None:
+        progress(stage, **info)
+
+
+def _emit(emit, event, **data):
+    if emit is not None:
+        emit(event, **data)
+
+
+def extract_audio_stage(video_path, work_dir=None):
+    print("🎵 Extracting audio from video...")
+    try:
+        with span("extract_audio"):
+            audio_path = extract_audio(video_path, output_dir=work_dir)
+        count("audio_bytes", os.path.getsize(audio_path))
+        print(f"✅ Audio extracted to: {audio_path}")
+        return audio_path
+    except Exception as e:
+        print(f"❌ Audio extraction failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Audio extraction failed: {str(e)}")
+
+
+def analyze_transcript(parsed_transcript, sensitive_words=None, audio_path=None, on_section=None, work_dir=None):
+    print("🔍 Starting analysis...")
+    # numpy and the analyzers load on first use (or during the startup warm-up)
+    from analysis import analyze_all
+    try:
+        with span("analysis"):
+            result = analyze_all(parsed_transcript, sensitive_words=sensitive_words, audio_path=audio_path,
+                                 on_section=on_section, work_dir=work_dir)
+        print("✅ Analysis completed")
+        return result
+    except Exception as e:
+        print(f"❌ Analysis failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+
+
+def run_pipeline(video_path, progress=None, content_hash=None, sensitive_words=None, emit=None, work_dir=None):
+    """Run every stage for a stored video and return the analysis result.
+
+    `progress` is an optional callable `progress(stage, **info)` invoked as the
+    pipeline advances; stage failures are raised as HTTPException. `emit` is an
+    optional callable `emit(event, **data)` receiving intermediate output
+    (transcript chunks, the transcript, each analysis section). When the
+    upload's `content_hash` is given, cached transcripts and results are reused.
+    `sensitive_words` replaces the default sensitive-word watchlist.
+    Intermediate files (extracted audio, transcription chunks) are written to
+    `work_dir` (the job's workspace) when given.
+    """
+    analysis_key = analysis_cache_key(content_hash, sensitive_words)
+    cached_result = result_cache.get(analysis_key, "analysis")
+    if cached_result is not None:
+        print(f"♻️ Reusing cached analysis for {content_hash[:12]}")
+        return cached_result
+
+    parsed_transcript = result_cache.get(content_hash, "transcript")
+    if parsed_transcript is not None:
+        print(f"♻️ Reusing cached transcript for {content_hash[:12]}")
+        # No extracted audio yet; the acoustic analyzers decode the video directly
+        audio_path = video_path
+    else:
+        _notify(progress, "extracting_audio")
+        audio_path = extract_audio_stage(video_path, work_dir)
+        _emit(emit, "audio_extracted")
+
+        _notify(progress, "transcribing")
+        with span("transcription"):
+            transcript_dict = transcribe_audio(audio_path, progress, emit, work_dir=work_dir)
+            parsed_transcript = parse_transcript(transcript_dict)
+        result_cache.put(content_hash, "transcript", parsed_transcript)
+    count("segments", len(parsed_transcript))
+    _emit(emit, "transcript", segments=parsed_transcript)
+
+    _notify(progress, "analyzing", segments=len(parsed_transcript))
+    result = analyze_transcript(
+        parsed_transcript, sensitive_words, audio_path,
+        on_section=lambda name, value, error: _emit(emit, "analysis_section", name=name, value=value,
+                                                    **({"error": error} if error else {})),
+        work_dir=work_dir,
+    )
+    if result.get("stage_errors"):
+        # Partial results may be caused by transient failures, so don't keep them
+        print(f"⚠️ Analysis finished with failed stages: {', '.join(result['stage_errors'])}")
+    else:
+        result_cache.put(analysis_key, "analysis", result)
+    return result
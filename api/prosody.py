@@ -0,0 +1,251 @@
+"""
+Block-streaming prosody engine.
+
+Audio is fed in chunks of any size; complete analysis frames (10 ms hop) are
+processed a block at a time with a vectorized YIN F0 estimator, so memory
+stays bounded by the block size no matter how long the interview is. Per
+frame it computes F0 (voiced frames only) and RMS energy, and folds them
+straight into per-segment and overall running statistics. Pauses are runs of
+silent frames of at least `min_pause` seconds.
+
+F0 of speech stays under `fmax` (400 Hz), so input is first decimated to
+`analysis_rate` (8 kHz) by averaging groups of samples, which quarters the
+FFT work of the 16 kHz pipeline audio.
+"""
+
+import numpy as np
+
+
+def _fast_fft_size(n):
+    """Smallest 2^a * 3^b * 5^c >= n (sizes pocketfft handles fastest)."""
+    best = 1 << int(np.ceil(np.log2(n)))
+    power5 = 1
+    while power5 < best:
+        power35 = power5
+        while power35 < best:
+            size = power35
+            while size < n:
+                size *= 2
+            best = min(best, size)
+            power35 *= 3
+        power5 *= 5
+    return best
+
+
+class ProsodyEngine:
+    def __init__(self, segments=(), sample_rate=16000, fmin=60.0, fmax=400.0, hop_seconds=0.01,
+                 window_seconds=0.03, threshold=0.15, silence_db=-40.0, min_pause=0.3, block_frames=1024,
+                 analysis_rate=8000):
+        """`segments` are transcript items with `start`/`end` in seconds, sorted by start."""
+        self.decimation = max(1, sample_rate // analysis_rate) if sample_rate % analysis_rate == 0 else 1
+        self.sample_rate = sample_rate // self.decimation
+        self._decimation_rest = np.zeros(0, dtype=np.float32)
+        self.hop = int(round(self.sample_rate * hop_seconds))
+        self.tau_min = max(2, int(self.sample_rate / fmax))
+        self.tau_max = int(np.ceil(self.sample_rate / fmin))
+        self.window = max(int(round(self.sample_rate * window_seconds)), self.tau_max)
+        self.frame_length = self.window + self.tau_max + 1
+        self.n_fft = _fast_fft_size(self.frame_length + self.window)
+        self.threshold = threshold
+        self.silence_db = silence_db
+        self.min_pause = min_pause
+        self.block_frames = block_frames
+
+        self.segments = [(float(item["start"]), float(item["end"])) for item in segments]
+        self._starts = np.array([start for start, _ in self.segments])
+        self._ends = np.array([end for _, end in self.segments])
+        n = len(self.segments)
+        self._seg = {
+            "frames": np.zeros(n), "speech": np.zeros(n), "voiced": np.zeros(n),
+            "f0_sum": np.zeros(n), "f0_sumsq": np.zeros(n), "energy_sum": np.zeros(n),
+            "f0_min": np.full(n, np.inf), "f0_max": np.zeros(n),
+        }
+        self._total = {"frames": 0, "speech": 0, "voiced": 0, "f0_sum": 0.0, "f0_sumsq": 0.0, "energy_sum": 0.0}
+
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._frame_index = 0
+        self._silence_start = None  # frame index where the current silent run began
+        self.pauses = []  # (start, end) in seconds
+
+    def _frame_time(self, index):
+        return (index * self.hop + self.window / 2) / self.sample_rate
+
+    def feed(self, samples):
+        """Add mono float32 samples; every complete frame is analyzed immediately."""
+        samples = np.asarray(samples, dtype=np.float32)
+        if self.decimation > 1:
+            samples = np.concatenate([self._decimation_rest, samples])
+            usable = len(samples) // self.decimation * self.decimation
+            self._decimation_rest = samples[usable:]
+            samples = samples[:usable].reshape(-1, self.decimation).mean(axis=1)
+        for offset in range(0, len(samples), self.block_frames * self.hop):
+            buf = np.concatenate([self._pending, samples[offset:offset + self.block_frames * self.hop]])
+            n_frames = (len(buf) - self.frame_length) // self.hop + 1
+            if n_frames <= 0:
+                self._pending = buf
+                continue
+            self._process(buf, n_frames)
+            self._pending = buf[n_frames * self.hop:]
+
+    def finish(self):
+        """Analyze the tail (zero-padded for the lag range) and return the statistics."""
+        tail = self._pending
+        n_frames = (len(tail) - self.window) // self.hop + 1
+        if n_frames > 0:
+            padded = np.concatenate([tail, np.zeros(self.frame_length, dtype=np.float32)])
+            self._process(padded, n_frames)
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._close_pause(self._frame_index)
+        return self.summary()
+
+    def _yin(self, frames):
+        """Vectorized YIN over a (n_frames, frame_length) block; returns (f0 or 0, window energy)."""
+        frames = frames.astype(np.float64)
+        W, tau_max = self.window, self.tau_max
+        # Autocorrelation of the window against every lagged window, via FFT
+        spectrum = np.fft.rfft(frames, self.n_fft)
+        window_spectrum = np.fft.rfft(frames[:, :W], self.n_fft)
+        acf = np.fft.irfft(np.conj(window_spectrum) * spectrum, self.n_fft)[:, :tau_max + 1]
+        power = np.concatenate([np.zeros((len(frames), 1)), np.cumsum(frames ** 2, axis=1)], axis=1)
+        energy = power[:, W] - power[:, 0]
+        lagged_energy = power[:, W:W + tau_max + 1] - power[:, :tau_max + 1]
+        diff = np.maximum(energy[:, None] + lagged_energy - 2 * acf, 0.0)
+
+        # Cumulative mean normalized difference
+        cmnd = np.ones_like(diff)
+        running = np.cumsum(diff[:, 1:], axis=1)
+        taus = np.arange(1, tau_max + 1)
+        cmnd[:, 1:] = diff[:, 1:] * taus / np.maximum(running, 1e-12)
+
+        # First local minimum under the threshold within [tau_min, tau_max)
+        inner = cmnd[:, self.tau_min:tau_max]
+        is_min = inner <= cmnd[:, self.tau_min + 1:tau_max + 1]
+        candidates = (inner < self.threshold) & is_min
+        found = candidates.any(axis=1)
+        tau = np.argmax(candidates, axis=1) + self.tau_min
+
+        # Parabolic interpolation around the chosen lag
+        rows = np.arange(len(frames))
+        left = cmnd[rows, np.maximum(tau - 1, 1)]
+        center = cmnd[rows, tau]
+        right = cmnd[rows, np.minimum(tau + 1, tau_max)]
+        denominator = left - 2 * center + right
+        shift = np.where(np.abs(denominator) > 1e-12, (left - right) / (2 * np.where(denominator == 0, 1, denominator)), 0.0)
+        refined = tau + np.clip(shift, -1, 1)
+        f0 = np.where(found, self.sample_rate / refined, 0.0)
+        return f0, energy
+
+    def _process(self, buf, n_frames):
+        windows = np.lib.stride_tricks.sliding_window_view(buf, self.frame_length)[::self.hop][:n_frames]
+        f0, energy = self._yin(windows)
+        energy_db = 10 * np.log10(energy / self.window + 1e-10)
+        speech = energy_db > self.silence_db
+        voiced = speech & (f0 > 0)
+        f0 = np.where(voiced, f0, 0.0)
+
+        indices = self._frame_index + np.arange(n_frames)
+        self._track_pauses(indices, speech)
+        self._accumulate(self._frame_time(indices), speech, voiced, f0, energy_db)
+        self._frame_index += n_frames
+
+    def _accumulate(self, times, speech, voiced, f0, energy_db):
+        total = self._total
+        total["frames"] += len(times)
+        total["speech"] += int(speech.sum())
+        total["voiced"] += int(voiced.sum())
+        total["f0_sum"] += float(f0.sum())
+        total["f0_sumsq"] += float((f0 ** 2).sum())
+        total["energy_sum"] += float(energy_db.sum())
+
+        if not self.segments:
+            return
+        seg_index = np.searchsorted(self._starts, times, side="right") - 1
+        inside = (seg_index >= 0) & (times < self._ends[np.maximum(seg_index, 0)])
+        if not inside.any():
+            return
+        idx = seg_index[inside]
+        n = len(self.segments)
+        seg = self._seg
+        seg["frames"] += np.bincount(idx, minlength=n)
+        seg["speech"] += np.bincount(idx, weights=speech[inside], minlength=n)
+        seg["voiced"] += np.bincount(idx, weights=voiced[inside], minlength=n)
+        seg["f0_sum"] += np.bincount(idx, weights=f0[inside], minlength=n)
+        seg["f0_sumsq"] += np.bincount(idx, weights=f0[inside] ** 2, minlength=n)
+        seg["energy_sum"] += np.bincount(idx, weights=energy_db[inside], minlength=n)
+        voiced_inside = voiced[inside]
+        np.minimum.at(seg["f0_min"], idx[voiced_inside], f0[inside][voiced_inside])
+        np.maximum.at(seg["f0_max"], idx[voiced_inside], f0[inside][voiced_inside])
+
+    def _track_pauses(self, indices, speech):
+        # Frame indices where speech starts or stops, continuing the run from the previous block
+        previous = np.concatenate([[self._silence_start is None], speech[:-1]])
+        for position in np.flatnonzero(previous != speech):
+            if speech[position]:
+                self._close_pause(indices[position])
+            else:
+                self._silence_start = indices[position]
+
+    def _close_pause(self, end_index):
+        if self._silence_start is None:
+            return
+        start = self._frame_time(self._silence_start)
+        end = self._frame_time(end_index)
+        if end - start >= self.min_pause:
+            self.pauses.append((start, end))
+        self._silence_start = None
+
+    def summary(self):
+        total = self._total
+        voiced_total = total["voiced"]
+        mean_f0 = total["f0_sum"] / voiced_total if voiced_total else 0.0
+        std_f0 = np.sqrt(max(0.0, total["f0_sumsq"] / voiced_total - mean_f0 ** 2)) if voiced_total else 0.0
+
+        # Pauses are sorted and disjoint, so each segment's overlapping ones form a contiguous range
+        pause_starts = np.array([start for start, _ in self.pauses])
+        pause_ends = np.array([end for _, end in self.pauses])
+        first_pause = np.searchsorted(pause_ends, self._starts, side="right")
+        last_pause = np.searchsorted(pause_starts, self._ends, side="left")
+
+        segments = []
+        seg = self._seg
+        for i, (start, end) in enumerate(self.segments):
+            frames = seg["frames"][i]
+            voiced = seg["voiced"][i]
+            mean = seg["f0_sum"][i] / voiced if voiced else 0.0
+            std = np.sqrt(max(0.0, seg["f0_sumsq"][i] / voiced - mean ** 2)) if voiced else 0.0
+            pauses = [min(p_end, end) - max(p_start, start)
+                      for p_start, p_end in self.pauses[first_pause[i]:last_pause[i]]]
+            pauses = [p for p in pauses if p >= self.min_pause]
+            segments.append({
+                "start": start,
+                "end": end,
+                "pitch_mean_hz": round(float(mean), 2),
+                "pitch_std_hz": round(float(std), 2),
+                "pitch_min_hz": round(float(seg["f0_min"][i]), 2) if voiced else 0.0,
+                "pitch_max_hz": round(float(seg["f0_max"][i]), 2) if voiced else 0.0,
+                "energy_db": round(float(seg["energy_sum"][i] / frames), 2) if frames else None,
+                "voiced_ratio": round(float(voiced / frames), 3) if frames else 0.0,
+                "speech_ratio": round(float(seg["speech"][i] / frames), 3) if frames else 0.0,
+                "pause_count": len(pauses),
+                "pause_seconds": round(float(sum(pauses)), 2),
+            })
+
+        return {
+            "duration_seconds": round(self._frame_index * self.hop / self.sample_rate, 2),
+            "pitch_mean_hz": round(float(mean_f0), 2),
+            "pitch_std_hz": round(float(std_f0), 2),
+            "energy_db": round(total["energy_sum"] / total["frames"], 2) if total["frames"] else None,
+            "voiced_ratio": round(voiced_total / total["frames"], 3) if total["frames"] else 0.0,
+            "speech_ratio": round(total["speech"] / total["frames"], 3) if total["frames"] else 0.0,
+            "pause_count": len(self.pauses),
+            "pause_seconds": round(float(sum(end - start for start, end in self.pauses)), 2),
+            "segments": segments,
+        }
+
+
+def analyze_prosody(chunks, segments=(), sample_rate=16000, **options):
+    """Run the engine over an iterable of float32 sample chunks."""
+    engine = ProsodyEngine(segments, sample_rate=sample_rate, **options)
+    for chunk in chunks:
+        engine.feed(chunk)
+    return engine.finish()
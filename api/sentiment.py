@@ -0,0 +1,181 @@
+"""
+Backends for the translate + sentiment step of the analysis.
+
+- "network" (default): translate each segment to English (translation.py) and
+  score the English text with TextBlob.
+- "lexicon": score the Arabic text directly with a local sentiment lexicon and
+  negation handling. No network access, so latency is predictable; the
+  `translation` output is left untranslated.
+
+Select the backend per deployment with SENTIMENT_BACKEND.
+"""
+
+import os
+from translation import translate_segments
+from tokenization import normalize_arabic
+
+SENTIMENT_BACKEND = os.getenv("SENTIMENT_BACKEND", "network")
+# Optional TSV file of `word<TAB>score` lines (score in [-1, 1]) extending the built-in lexicon
+ARABIC_SENTIMENT_LEXICON = os.getenv("ARABIC_SENTIMENT_LEXICON", "")
+
+POLARITY_THRESHOLD = 0.1
+
+
+def polarity_label(polarity):
+    if polarity > POLARITY_THRESHOLD:
+        return "positive"
+    elif polarity < -POLARITY_THRESHOLD:
+        return "negative"
+    else:
+        return "neutral"
+
+
+class SentimentResult:
+    def __init__(self, labels, translations, unscored=0):
+        self.labels = labels
+        # English text per segment, or None where no translation is available
+        self.translations = translations
+        # Segments that defaulted to neutral because scoring failed
+        self.unscored = unscored
+
+
+class NetworkSentimentBackend:
+    name = "network"
+    translation_placeholder = "[Translation failed] Please check internet connection"
+
+    def warm_up(self):
+        """Load TextBlob and its sentiment lexicon before the first request."""
+        from textblob import TextBlob
+        TextBlob("good").sentiment
+
+    def analyze(self, texts, translations=None):
+        from textblob import TextBlob
+        if translations is None:
+            translations = translate_segments(texts)
+        labels = []
+        unscored = 0
+        for translated in translations:
+            if translated is None:
+                labels.append("neutral")
+                unscored += 1
+                continue
+            try:
+                labels.append(polarity_label(TextBlob(translated).sentiment.polarity))
+            except Exception:
+                labels.append("neutral")
+                unscored += 1
+        return SentimentResult(labels, translations, unscored)
+
+
+class ArabicLexiconBackend:
+    """Lexicon scorer for Arabic (MSA and common Egyptian/Levantine forms).
+
+    Each token is looked up with and without common clitics (و، ف، ب، ل، ال)
+    and suffixes (tanween alef, taa marbuta, attached pronouns). A negator
+    flips the polarity of the next two tokens and an intensifier ("جداً")
+    scales the preceding sentiment word by 1.5. The segment polarity is the
+    mean score of its sentiment-bearing tokens.
+    """
+
+    name = "lexicon"
+    translation_placeholder = "[Translation unavailable in offline mode]"
+
+    POSITIVE = [
+        "سعيد", "سعاده", "فرح", "فرحان", "مبسوط", "ممتاز", "رائع", "جميل", "جيد", "حلو",
+        "نجاح", "ناجح", "نجحت", "فخور", "احب", "حب", "احببت", "شكرا", "ممتن", "متحمس",
+        "حماس", "ثقه", "واثق", "امل", "متفائل", "تفاؤل", "افضل", "احسن", "مفيد", "مريح",
+        "مرتاح", "راحه", "انجاز", "تميز", "متميز", "ابداع", "مبدع", "تطور", "تقدم", "فرصه",
+        "طموح", "هدوء", "هادئ", "استمتع", "متعه", "رضا", "راضي", "موافق", "صحيح", "عظيم",
+        "كويس", "تمام", "منيح", "خير", "قادر", "قوه", "قوي", "دعم", "تعاون", "احترام",
+    ]
+    NEGATIVE = [
+        "حزين", "حزن", "زعلان", "سيء", "سيئ", "سئ", "وحش", "فشل", "فاشل", "فشلت",
+        "خوف", "خائف", "قلق", "قلقان", "توتر", "متوتر", "ضغط", "مشكله", "مشاكل", "صعب",
+        "صعوبه", "مؤلم", "الم", "ازمه", "غضب", "غاضب", "كره", "اكره", "يأس", "محبط",
+        "احباط", "ملل", "ممل", "تعب", "تعبان", "مرهق", "ضعيف", "ضعف", "خطا", "غلط",
+        "سلبي", "خساره", "خسرت", "ظلم", "مظلوم", "وحيد", "ندم", "اسف", "مستحيل", "رفض",
+        "مرفوض", "عنف", "تهديد", "خطر", "موت", "كارثه", "فوضي", "ازعاج", "مزعج", "خيبه",
+    ]
+    NEGATORS = ["لا", "لم", "لن", "ليس", "ليست", "لست", "غير", "بدون", "مش", "مو", "مب", "ماكان"]
+    INTENSIFIERS = ["جدا", "كثيرا", "للغايه", "تماما", "اوي", "كتير"]
+    PREFIXES = ["وال", "بال", "فال", "كال", "لل", "ال", "و", "ف", "ب", "ل", ""]
+    SUFFIXES = ["ها", "هم", "كم", "نا", "ا", "ه", "ي", "ك", ""]
+
+    def __init__(self, lexicon_path=ARABIC_SENTIMENT_LEXICON):
+        self.lexicon = {}
+        for word in self.POSITIVE:
+            self.lexicon[normalize_arabic(word)] = 1.0
+        for word in self.NEGATIVE:
+            self.lexicon[normalize_arabic(word)] = -1.0
+        if lexicon_path:
+            self._load(lexicon_path)
+        self.negators = {normalize_arabic(w) for w in self.NEGATORS}
+        self.intensifiers = {normalize_arabic(w) for w in self.INTENSIFIERS}
+
+    def _load(self, path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                parts = line.strip().split("\t")
+                if len(parts) == 2:
+                    self.lexicon[normalize_arabic(parts[0]).strip()] = float(parts[1])
+
+    def _lookup(self, token):
+        if token in self.lexicon:
+            return self.lexicon[token]
+        for prefix in self.PREFIXES:
+            if not token.startswith(prefix):
+                continue
+            for suffix in self.SUFFIXES:
+                if suffix and not token.endswith(suffix):
+                    continue
+                stem = token[len(prefix):len(token) - len(suffix)]
+                if len(stem) >= 2 and stem in self.lexicon:
+                    return self.lexicon[stem]
+        return None
+
+    def score(self, text):
+        tokens = normalize_arabic(text).split()
+        total = 0.0
+        hits = 0
+        negate_window = 0
+        last_value = 0.0
+        for token in tokens:
+            if token in self.negators:
+                negate_window = 2
+                continue
+            if token in self.intensifiers:
+                total += 0.5 * last_value
+                last_value = 0.0
+                continue
+            value = self._lookup(token)
+            last_value = 0.0
+            if value is not None:
+                if negate_window > 0:
+                    value = -value
+                total += value
+                hits += 1
+                last_value = value
+            if negate_window > 0:
+                negate_window -= 1
+        return total / hits if hits else 0.0
+
+    def warm_up(self):
+        self.score("جيد")
+
+    def analyze(self, texts, translations=None):
+        labels = [polarity_label(self.score(text)) for text in texts]
+        return SentimentResult(labels, translations or [None] * len(texts))
+
+
+_backends = {}
+
+
+def get_sentiment_backend(name=SENTIMENT_BACKEND):
+    if name not in _backends:
+        if name == "network":
+            _backends[name] = NetworkSentimentBackend()
+        elif name == "lexicon":
+            _backends[name] = ArabicLexiconBackend()
+        else:
+            raise ValueError(f"Unknown SENTIMENT_BACKEND: {name}")
+    return _backends[name]
@@ -0,0 +1,105 @@
+"""
+Small dependency graph runner for the analysis stages.
+
+Each Stage names the stages whose values it needs. Stages whose inputs are
+ready run concurrently on a thread pool; a stage that raises or exceeds its
+timeout is recorded in `errors` and every stage depending on it is skipped,
+so the caller can still return the stages that did finish. Stages marked
+`partial=True` run anyway and receive only the inputs that succeeded.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from metrics import span, in_context
+
+ANALYSIS_STAGE_WORKERS = int(os.getenv("ANALYSIS_STAGE_WORKERS", "4"))
+ANALYSIS_STAGE_TIMEOUT = float(os.getenv("ANALYSIS_STAGE_TIMEOUT", "120"))
+
+
+class Stage:
+    def __init__(self, name, func, deps=(), timeout=None, partial=False):
+        """`func` is called with the values of `deps` as keyword arguments."""
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.timeout = timeout
+        self.partial = partial
+
+
+def _timed(name, func):
+    def run(**kwargs):
+        with span(name):
+            return func(**kwargs)
+    return run
+
+
+def run_stages(stages, max_workers=ANALYSIS_STAGE_WORKERS, default_timeout=ANALYSIS_STAGE_TIMEOUT, on_done=None,
+               span_prefix=None):
+    """Run a stage graph and return `(values, errors)`, both keyed by stage name.
+
+    `on_done(name, value, error)` is called as each stage finishes, fails or is skipped.
+    With `span_prefix` every stage is timed as the metrics span `<prefix><name>`.
+    Stages run in the caller's context, so they count towards the caller's job.
+    """
+    pending = {stage.name: stage for stage in stages}
+    for stage in stages:
+        unknown = [dep for dep in stage.deps if dep not in pending]
+        if unknown:
+            raise ValueError(f"Stage {stage.name} depends on unknown stages: {unknown}")
+
+    values = {}
+    errors = {}
+
+    def finished(name, value=None, error=None):
+        if error is None:
+            values[name] = value
+        else:
+            errors[name] = error
+        if on_done is not None:
+            on_done(name, value, error)
+    running = {}  # future -> (stage, deadline)
+    # Threads of timed-out stages cannot be interrupted, so never wait for them on exit
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis-stage")
+    try:
+        while pending or running:
+            for name, stage in list(pending.items()):
+                failed = [dep for dep in stage.deps if dep in errors]
+                if failed and not stage.partial:
+                    del pending[name]
+                    finished(name, error=f"skipped: depends on failed stage {failed[0]}")
+                    continue
+                if all(dep in values or dep in errors for dep in stage.deps):
+                    kwargs = {dep: values[dep] for dep in stage.deps if dep in values}
+                    timeout = stage.timeout or default_timeout
+                    func = stage.func if span_prefix is None else _timed(span_prefix + stage.name, stage.func)
+                    future = executor.submit(in_context(func), **kwargs)
+                    running[future] = (stage, time.monotonic() + timeout)
+                    del pending[name]
+
+            if not running:
+                if pending:
+                    raise ValueError(f"Stage graph has a cycle: {sorted(pending)}")
+                break
+
+            next_deadline = min(deadline for _, deadline in running.values())
+            done, _ = wait(running, timeout=max(0.0, next_deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, _ = running.pop(future)
+                try:
+                    value = future.result()
+                except Exception as e:
+                    print(f"❌ Analysis stage {stage.name} failed: {e}")
+                    finished(stage.name, error=str(e) or type(e).__name__)
+                else:
+                    finished(stage.name, value)
+            now = time.monotonic()
+            for future, (stage, deadline) in list(running.items()):
+                if deadline <= now:
+                    running.pop(future)
+                    future.cancel()
+                    print(f"⏱️ Analysis stage {stage.name} timed out after {stage.timeout or default_timeout}s")
+                    finished(stage.name, error=f"timed out after {stage.timeout or default_timeout}s")
+    finally:
+        executor.shutdown(wait=False)
+    return values, errors
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Tests for batch processing: manifest resolution, queueing and skipping processed inputs.
+"""
+
+import asyncio
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import wave
+from pathlib import Path
+from fastapi import HTTPException, UploadFile
+import batch
+import main
+from jobs import JobManager
+from workspace import WorkspaceManager, estimate_scratch
+
+
+def test_manifest_paths_stay_under_the_input_root():
+    root = tempfile.mkdtemp()
+    os.makedirs(os.path.join(root, "sub"))
+    Path(root, "sub", "a.mp4").write_bytes(b"video")
+    previous, main.BATCH_INPUT_ROOT = main.BATCH_INPUT_ROOT, root
+    try:
+        resolved = dict(main.resolve_manifest("sub/a.mp4\n../../etc/passwd\nmissing.mp4\nsub/a.mp4"))
+    finally:
+        main.BATCH_INPUT_ROOT = previous
+    assert resolved == {
+        "sub/a.mp4": os.path.realpath(os.path.join(root, "sub", "a.mp4")),
+        "../../etc/passwd": None,
+        "missing.mp4": None,
+    }
+
+
+def test_manifests_are_refused_without_an_input_root():
+    previous, main.BATCH_INPUT_ROOT = main.BATCH_INPUT_ROOT, ""
+    try:
+        main.resolve_manifest('["a.mp4"]')
+        assert False, "expected 403"
+    except HTTPException as e:
+        assert e.status_code == 403
+    finally:
+        main.BATCH_INPUT_ROOT = previous
+    assert main.resolve_manifest(None) == []
+
+
+def test_inputs_already_processed_are_skipped():
+    input_dir = tempfile.mkdtemp()
+    Path(input_dir, "done.mp4").write_bytes(b"video")
+    Path(input_dir, "notes.txt").write_text("not a video")
+    output = os.path.join(tempfile.mkdtemp(), "results.jsonl")
+    key = batch.input_key(Path(input_dir, "done.mp4"), Path(input_dir))
+    with open(output, "w", encoding="utf-8") as f:
+        f.write(json.dumps({**key, "status": "error", "error": "earlier failure"}) + "\n")
+        f.write(json.dumps({**key, "status": "ok"}) + "\n")
+        f.write('{"path": "cut short')
+    assert batch.load_processed(output) == {(key["path"], key["size"], key["mtime"])}
+    assert batch.run_batch(input_dir, output) == (0, 0, 1)
+
+
+def test_batch_larger_than_the_upload_queue_is_queued_whole():
+    release = threading.Event()
+
+    def pipeline(video_path, **kwargs):
+        release.wait(10)
+        return {"total_words": 0}
+
+    manager = JobManager(max_workers=1, max_queued=2, max_batch_workers=1, max_queued_batch=8)
+    saved = main.job_manager, main.run_pipeline, main.get_groq_client
+    main.job_manager, main.run_pipeline, main.get_groq_client = manager, pipeline, lambda: object()
+    try:
+        videos = [UploadFile(io.BytesIO(f"video {i}".encode()), filename=f"{i}.mp4", size=7) for i in range(5)]
+        response = asyncio.run(main.upload_batch(videos=videos, manifest=None, sensitive_words=None))
+        items = json.loads(response.body)["items"]
+        assert response.status_code == 202 and all("id" in item for item in items), items
+        # Batch jobs don't use up the interactive queue...
+        manager.create("interactive", "upload.mp4")
+        # ...and a batch that doesn't fit in what's left is refused whole
+        more = [UploadFile(io.BytesIO(b"video"), filename=f"more{i}.mp4", size=5) for i in range(4)]
+        try:
+            asyncio.run(main.upload_batch(videos=more, manifest=None, sensitive_words=None))
+            assert False, "expected 503"
+        except HTTPException as e:
+            assert e.status_code == 503
+        assert manager.batch_slots() == 3
+    finally:
+        release.set()
+        main.job_manager, main.run_pipeline, main.get_groq_client = saved
+    manager.shutdown()
+
+
+def _swap(**replacements):
+    saved = {name: getattr(main, name) for name in replacements}
+    for name, value in replacements.items():
+        setattr(main, name, value)
+    return saved
+
+
+def test_manifest_inputs_reserve_disk_on_the_worker():
+    root = tempfile.mkdtemp()
+    for i in range(3):
+        with wave.open(os.path.join(root, f"{i}.wav"), "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(16000)
+            f.writeframes(bytes(32000 * (i + 1)))
+    reserved = []
+
+    def pipeline(video_path, work_dir=None, **kwargs):
+        reserved.append(workspaces.stats()["reserved_bytes"])
+        return {"total_words": 0}
+
+    # The disk budget is used up by another job when the batch arrives
+    workspaces = WorkspaceManager(root=tempfile.mkdtemp(), budget_bytes=estimate_scratch(0))
+    workspaces.acquire("upload", estimate_scratch(0))
+    manager = JobManager(max_workers=1, max_queued=2, max_batch_workers=1, max_queued_batch=8)
+    saved = _swap(job_manager=manager, workspace_manager=workspaces, run_pipeline=pipeline,
+                  get_groq_client=lambda: object(), BATCH_INPUT_ROOT=root)
+    try:
+        started = time.monotonic()
+        response = asyncio.run(main.upload_batch(videos=[], manifest='["0.wav", "1.wav", "2.wav"]', sensitive_words=None))
+        assert time.monotonic() - started < 1
+        items = json.loads(response.body)["items"]
+        assert response.status_code == 202 and all("id" in item for item in items), items
+        assert workspaces.stats()["active_workspaces"] == 1 and not reserved
+        workspaces.release("upload")
+        deadline = time.monotonic() + 10
+        while any(manager.get(item["id"])["status"] != "completed" for item in items):
+            assert time.monotonic() < deadline, [manager.get(item["id"]) for item in items]
+            time.sleep(0.05)
+        # Inputs read in place only reserve scratch space for their audio, one at a time on the worker
+        assert reserved == [estimate_scratch(0)] * 3
+        assert manager.get(items[2]["id"])["size"] == 32000 * 3 + 44
+    finally:
+        _swap(**saved)
+        manager.shutdown()
+
+
+def test_uploads_that_do_not_fit_the_disk_budget_are_refused_whole():
+    workspaces = WorkspaceManager(root=tempfile.mkdtemp(), budget_bytes=3 * estimate_scratch(0))
+    workspaces.acquire("upload", estimate_scratch(0))
+    manager = JobManager(max_workers=1, max_queued=2, max_batch_workers=1, max_queued_batch=8)
+    saved = _swap(job_manager=manager, workspace_manager=workspaces, run_pipeline=lambda *a, **kw: {"total_words": 0},
+                  get_groq_client=lambda: object())
+    try:
+        videos = [UploadFile(io.BytesIO(b"video"), filename=f"{i}.mp4", size=5) for i in range(3)]
+        try:
+            asyncio.run(main.upload_batch(videos=videos, manifest=None, sensitive_words=None))
+            assert False, "expected 503"
+        except HTTPException as e:
+            assert e.status_code == 503
+        assert manager.batch_slots() == 8
+        response = asyncio.run(main.upload_batch(videos=videos[:2], manifest=None, sensitive_words=None))
+        assert all("id" in item for item in json.loads(response.body)["items"])
+    finally:
+        _swap(**saved)
+        manager.shutdown()
+
+
+if __name__ == "__main__":
+    print("🧪 Testing batch processing...")
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for the result cache: keys never collide across backends or watchlists, and eviction stays cheap.
+"""
+
+import os
+import tempfile
+from cache import ResultCache
+from pipeline import analysis_cache_key
+
+CONTENT_HASH = "ab" * 32
+
+
+def test_key_depends_on_backend_provider_and_watchlist():
+    keys = {
+        analysis_cache_key(CONTENT_HASH, None, "network", "google"),
+        analysis_cache_key(CONTENT_HASH, None, "lexicon", "google"),
+        analysis_cache_key(CONTENT_HASH, None, "network", "local"),
+        analysis_cache_key(CONTENT_HASH, ["سرقة"], "network", "google"),
+        analysis_cache_key(CONTENT_HASH, ["رشوة"], "network", "google"),
+    }
+    assert len(keys) == 5
+    assert analysis_cache_key(CONTENT_HASH, ["سرقة"], "lexicon", "local") == analysis_cache_key(CONTENT_HASH, ["سرقة"], "lexicon", "local")
+    assert analysis_cache_key(None) is None
+
+
+def test_backends_sharing_a_cache_dir_keep_separate_results():
+    cache = ResultCache(directory=tempfile.mkdtemp(), max_bytes=1024 * 1024)
+    cache.put(analysis_cache_key(CONTENT_HASH, None, "network", "google"), "analysis", {"sentiment": {"backend": "network"}})
+    assert cache.get(analysis_cache_key(CONTENT_HASH, None, "lexicon", "google"), "analysis") is None
+    assert cache.get(analysis_cache_key(CONTENT_HASH, None, "network", "google"), "analysis") == {"sentiment": {"backend": "network"}}
+
+
+def test_writes_track_size_without_rescanning_the_directory():
+    cache = ResultCache(directory=tempfile.mkdtemp(), max_bytes=20_000)
+    scans = []
+    scan = cache._scan
+    cache._scan = lambda: scans.append(1) or scan()
+    payload = {"text": os.urandom(1000).hex()}  # ~2 KB that gzip can't shrink much
+    for i in range(40):
+        cache.put(f"video{i}", "analysis", payload)
+        assert cache._total <= 20_000
+    # One scan on the first write plus one per eviction, which trims to the low-water mark
+    assert len(scans) < 15, len(scans)
+    on_disk = sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(cache.directory) for name in names)
+    assert on_disk == cache._total
+    assert cache.get("video39", "analysis") == payload and cache.get("video0", "analysis") is None
+
+
+if __name__ == "__main__":
+    print("🧪 Testing analysis cache keys...")
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for chunked transcription: cut points on silences and merging chunk transcripts back together.
+"""
+
+import random
+from transcription import plan_chunks, merge_chunk_transcripts
+
+
+def synthetic_timeline(segments=40, seed=0):
+    """Segments of timed words separated by pauses; returns (segments, words, silences, duration)."""
+    rng = random.Random(seed)
+    clock = 0.0
+    items, words, silences = [], [], []
+    for index in range(segments):
+        start = clock
+        segment_words = []
+        for word_index in range(rng.randint(4, 12)):
+            length = rng.uniform(0.2, 0.6)
+            segment_words.append({"word": f"w{index}_{word_index}", "start": round(clock, 3), "end": round(clock + length, 3)})
+            clock += length
+        items.append({"text": " ".join(w["word"] for w in segment_words), "start": round(start, 3), "end": round(clock, 3)})
+        words.extend(segment_words)
+        pause = rng.uniform(0.5, 2.0)
+        silences.append((clock, clock + pause))
+        clock += pause
+    return items, words, silences[:-1], round(clock, 3)
+
+
+def fake_whisper(chunk, items, words):
+    """What Whisper returns for a chunk: everything audible in its range, on the chunk's own clock."""
+    def visible(item):
+        return item["end"] > chunk["start"] and item["start"] < chunk["end"]
+
+    def shift(item):
+        return {**item, "start": max(0.0, item["start"] - chunk["start"]), "end": min(chunk["end"], item["end"]) - chunk["start"]}
+
+    return {"segments": [shift(s) for s in items if visible(s)], "words": [shift(w) for w in words if visible(w)]}
+
+
+def test_cuts_land_on_silence_midpoints():
+    _, _, silences, duration = synthetic_timeline()
+    chunks = plan_chunks(duration, silences, target_seconds=60, overlap=2)
+    midpoints = {(start + end) / 2 for start, end in silences}
+    assert len(chunks) > 2
+    for chunk in chunks[:-1]:
+        assert chunk["own_end"] in midpoints
+        assert 30 <= chunk["own_end"] - chunk["own_start"] <= 60
+    assert [c["own_start"] for c in chunks[1:]] == [c["own_end"] for c in chunks[:-1]]
+    assert chunks[-1]["own_end"] == duration and chunks[-1]["last"]
+    assert not any(c["last"] for c in chunks[:-1])
+    assert chunks[0]["start"] == 0.0 and chunks[-1]["end"] == duration
+    assert all(c["start"] == max(0.0, c["own_start"] - 2) for c in chunks)
+
+
+def test_without_silences_cuts_fall_back_to_the_target_length():
+    chunks = plan_chunks(250, [], target_seconds=100, overlap=2)
+    assert [(c["own_start"], c["own_end"]) for c in chunks] == [(0.0, 100.0), (100.0, 200.0), (200.0, 250)]
+
+
+def test_merge_restores_every_segment_and_word_once():
+    items, words, silences, duration = synthetic_timeline()
+    chunks = plan_chunks(duration, silences, target_seconds=60, overlap=2)
+    # Out of order, as chunks finish on the thread pool
+    results = [(chunk, fake_whisper(chunk, items, words)) for chunk in reversed(chunks)]
+    merged = merge_chunk_transcripts(results)
+
+    assert [s["text"] for s in merged["segments"]] == [s["text"] for s in items]
+    assert [s["id"] for s in merged["segments"]] == list(range(len(items)))
+    assert [w["word"] for w in merged["words"]] == [w["word"] for w in words]
+    for original, restored in zip(words, merged["words"]):
+        assert abs(original["start"] - restored["start"]) < 1e-6 and abs(original["end"] - restored["end"]) < 1e-6
+    assert merged["text"] == " ".join(s["text"] for s in items)
+    assert merged["duration"] == duration
+
+
+def test_overlapping_chunks_keep_cut_straddling_items_once():
+    # A word straddling the cut appears in both chunks; the one owning its midpoint keeps it
+    chunks = plan_chunks(20, [], target_seconds=10, overlap=2)
+    straddling = {"word": "across", "start": 9.5, "end": 10.9}
+    items = [{"text": "across", "start": 9.5, "end": 10.9}]
+    merged = merge_chunk_transcripts([(chunk, fake_whisper(chunk, items, [straddling])) for chunk in chunks])
+    assert [w["word"] for w in merged["words"]] == ["across"]
+    assert len(merged["segments"]) == 1
+
+
+def test_last_chunk_keeps_items_ending_at_the_end():
+    chunks = plan_chunks(20, [], target_seconds=10, overlap=2)
+    final = {"word": "end", "start": 20.0, "end": 20.0}
+    transcripts = [{"segments": [], "words": [{**final, "start": final["start"] - c["start"], "end": final["end"] - c["start"]}]}
+                   if c["last"] else {"segments": [], "words": []} for c in chunks]
+    merged = merge_chunk_transcripts(list(zip(chunks, transcripts)))
+    assert [w["word"] for w in merged["words"]] == ["end"]
+
+
+if __name__ == "__main__":
+    print("🧪 Testing chunked transcription...")
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
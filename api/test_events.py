@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-job event log behind the progress stream.
+"""
+
+import asyncio
+import threading
+import time
+from events import JobEventLog
+
+
+async def collect(log, job_id, after=0):
+    return [item for item in [i async for i in log.stream(job_id, after=after, heartbeat=0.05)] if item is not None]
+
+
+def test_stream_receives_events_published_from_threads():
+    log = JobEventLog()
+    log.open("job")
+
+    def worker():
+        for i in range(3):
+            time.sleep(0.02)
+            log.publish("job", "analysis_section", {"name": f"section{i}"})
+        log.publish("job", "completed", {"id": "job"})
+
+    threading.Thread(target=worker).start()
+    events = asyncio.run(collect(log, "job"))
+    assert [event for _, event, _ in events] == ["analysis_section"] * 3 + ["completed"]
+    assert [index for index, _, _ in events] == [0, 1, 2, 3]
+
+
+def test_reconnect_replays_after_last_event_id():
+    log = JobEventLog()
+    log.open("job")
+    for name in ["stage", "transcript", "completed"]:
+        log.publish("job", name)
+    log.publish("job", "late")  # ignored once the job finished
+    assert [event for _, event, _ in asyncio.run(collect(log, "job", after=1))] == ["transcript", "completed"]
+
+
+if __name__ == "__main__":
+    print("🧪 Testing job event log...")
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared Groq client against a local mock transcription server.
+"""
+
+import json
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from groq_clients import GroqClientManager
+from transcription import transcribe_file
+
+
+class MockWhisper(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse is visible
+    delay = 0.1
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+    connections = set()
+    requests = 0
+
+    def do_POST(self):
+        cls = type(self)
+        self.rfile.read(int(self.headers["Content-Length"]))
+        with cls.lock:
+            cls.in_flight += 1
+            cls.requests += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+            cls.connections.add(self.client_address)
+        time.sleep(cls.delay)
+        with cls.lock:
+            cls.in_flight -= 1
+        body = json.dumps({
+            "text": "مرحبا",
+            "segments": [{"id": 0, "start": 0.0, "end": 1.0, "text": "مرحبا"}],
+            "words": [{"word": "مرحبا", "start": 0.0, "end": 1.0}],
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_mock(delay=0.1):
+    handler = type("Handler", (MockWhisper,), {"delay": delay, "connections": set(), "lock": threading.Lock()})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, handler
+
+
+def audio_file():
+    path = tempfile.mktemp(suffix=".flac")
+    with open(path, "wb") as f:
+        f.write(b"\0" * 1024)
+    return path
+
+
+def test_concurrent_transcriptions_share_capped_pool():
+    server, handler = start_mock()
+    manager = GroqClientManager(api_key="test", base_url=f"http://127.0.0.1:{server.server_port}", max_in_flight=2)
+    path = audio_file()
+    try:
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            results = list(executor.map(lambda _: transcribe_file(manager, path), range(6)))
+        assert all(result["text"] == "مرحبا" for result in results)
+        assert handler.requests == 6
+        assert handler.max_in_flight <= 2
+        # Six requests over at most two reused connections
+        assert len(handler.connections) <= 2
+    finally:
+        manager.close()
+        server.shutdown()
+
+
+def test_read_timeout_is_separate_from_connect_timeout():
+    server, _ = start_mock(delay=1.0)
+    manager = GroqClientManager(api_key="test", base_url=f"http://127.0.0.1:{server.server_port}",
+                                connect_timeout=5, read_timeout=0.2)
+    started = time.monotonic()
+    try:
+        manager.transcribe(file=("a.flac", b"\0"), model="whisper-large-v3")
+    except Exception as e:
+        assert "timed out" in str(e).lower() or "timeout" in type(e).__name__.lower()
+    else:
+        raise AssertionError("expected a read timeout")
+    finally:
+        manager.close()
+        server.shutdown()
+    assert time.monotonic() - started < 1.0
+
+
+def test_close_releases_client_and_reopens_on_demand():
+    manager = GroqClientManager(api_key="test", base_url="http://127.0.0.1:9")
+    first = manager.client()
+    assert manager.client() is first
+    manager.close()
+    assert first._client.is_closed
+    assert manager.client() is not first
+    manager.close()
+
+
+if __name__ == "__main__":
+    print("🧪 Testing shared Groq client...")
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
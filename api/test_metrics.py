@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests for per-stage spans, job timing breakdowns and the Prometheus output.
+"""
+
+import time
+import metrics
+from stages import Stage, run_stages
+
+
+def test_stage_spans_reach_the_job_breakdown_from_worker_threads():
+    with metrics.job_context("job-a"):
+        with metrics.span("upload"):
+            metrics.count("upload_bytes", 1024)
+        run_stages([
+            Stage("a", lambda: time.sleep(0.02) or 1),
+            Stage("b", lambda a: metrics.count("segments", a + 1), ["a"]),
+        ], span_prefix="test.")
+    timings = metrics.finish_job("job-a")
+    assert [span["name"] for span in timings["spans"]] == ["upload", "test.a", "test.b"]
+    assert timings["spans"][1]["seconds"] >= 0.02
+    assert timings["counters"] == {"upload_bytes": 1024, "segments": 2}
+    assert timings["peak_rss_mb"] > 0
+    assert metrics.finish_job("job-a") is None
+
+
+def test_failed_spans_are_recorded_and_counted():
+    with metrics.job_context("job-b"):
+        try:
+            with metrics.span("test_failing"):
+                raise ValueError("boom")
+        except ValueError:
+            pass
+    timings = metrics.finish_job("job-b")
+    assert timings["spans"][0]["error"] == "ValueError"
+    assert 'interview_stage_failures_total{stage="test_failing"} 1' in metrics.render()
+
+
+def test_prometheus_histogram_output():
+    for seconds in (0.003, 0.2, 7.0):
+        metrics.STAGE_SECONDS.observe(seconds, "test_histogram")
+    lines = metrics.render().splitlines()
+    assert "# TYPE interview_stage_duration_seconds histogram" in lines
+    assert 'interview_stage_duration_seconds_bucket{stage="test_histogram",le="0.01"} 1' in lines
+    assert 'interview_stage_duration_seconds_bucket{stage="test_histogram",le="0.25"} 2' in lines
+    assert 'interview_stage_duration_seconds_bucket{stage="test_histogram",le="+Inf"} 3' in lines
+    assert 'interview_stage_duration_seconds_count{stage="test_histogram"} 3' in lines
+    assert any(line.startswith("process_peak_resident_memory_bytes ") for line in lines)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing metrics...")
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming prosody engine on synthetic voiced/silent audio.
+"""
+
+import os
+import tempfile
+import wave
+import numpy as np
+from analysis import analyze_pitch_and_waveform, load_analysis_audio
+from prosody import ProsodyEngine, analyze_prosody
+
+SAMPLE_RATE = 16000
+
+
+def tone(f0, seconds):
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    return sum((0.3 / h) * np.sin(2 * np.pi * h * f0 * t) for h in range(1, 5)).astype(np.float32)
+
+
+AUDIO = np.concatenate([tone(120, 1.0), np.zeros(SAMPLE_RATE, dtype=np.float32), tone(220, 1.0)])
+SEGMENTS = [{"start": 0.0, "end": 1.0}, {"start": 1.0, "end": 2.0}, {"start": 2.0, "end": 3.0}]
+
+
+def test_per_segment_pitch_and_pauses():
+    result = analyze_prosody([AUDIO], SEGMENTS)
+    first, silent, last = result["segments"]
+    assert abs(first["pitch_mean_hz"] - 120) < 1 and abs(last["pitch_mean_hz"] - 220) < 1
+    assert silent["voiced_ratio"] == 0 and silent["pause_count"] == 1
+    assert 0.9 < result["pause_seconds"] < 1.1
+
+
+def test_chunk_size_does_not_change_results():
+    whole = analyze_prosody([AUDIO], SEGMENTS)
+    chunked = analyze_prosody((AUDIO[i:i + 1234] for i in range(0, len(AUDIO), 1234)), SEGMENTS)
+    assert whole == chunked
+
+
+def test_segment_pauses_match_a_full_scan():
+    # Alternating speech and silences of 0.2-0.8 s under overlapping, unevenly sized segments
+    rng = np.random.default_rng(0)
+    audio = np.concatenate([part for _ in range(30) for part in
+                            (tone(150, rng.uniform(0.2, 0.6)), np.zeros(int(SAMPLE_RATE * rng.uniform(0.2, 0.8)), dtype=np.float32))])
+    duration = len(audio) / SAMPLE_RATE
+    starts = np.sort(rng.uniform(0, duration, 80))
+    segments = [{"start": start, "end": min(duration, start + rng.uniform(0.1, 3.0))} for start in starts]
+    engine = ProsodyEngine(segments)
+    engine.feed(audio)
+    result = engine.finish()
+    assert len(engine.pauses) > 10
+    for item, segment in zip(segments, result["segments"]):
+        overlaps = [min(p_end, item["end"]) - max(p_start, item["start"]) for p_start, p_end in engine.pauses
+                    if p_start < item["end"] and p_end > item["start"]]
+        overlaps = [p for p in overlaps if p >= engine.min_pause]
+        assert segment["pause_count"] == len(overlaps)
+        assert segment["pause_seconds"] == round(float(sum(overlaps)), 2)
+
+
+def test_decoded_audio_is_mapped_from_the_work_dir():
+    work_dir = tempfile.mkdtemp()
+    path = os.path.join(tempfile.mkdtemp(), "interview.wav")
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes((AUDIO * 32767).astype(np.int16).tobytes())
+    audio = load_analysis_audio(path, work_dir)
+    # Backed by an unlinked scratch file, not a heap buffer, and nothing is left behind
+    assert isinstance(audio, np.memmap) and os.listdir(work_dir) == []
+    assert len(audio) == len(AUDIO) and np.abs(audio - AUDIO).max() < 1e-3
+    segments = analyze_pitch_and_waveform(audio, transcript=SEGMENTS)["segments"]
+    assert abs(segments[0]["pitch_mean_hz"] - 120) < 1 and segments[1]["pause_count"] == 1
+
+
+if __name__ == "__main__":
+    print("🧪 Testing prosody engine...")
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
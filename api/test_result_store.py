@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for the result store backends: TTL expiry, LRU eviction and sharing one SQLite file between workers.
+"""
+
+import multiprocessing
+import os
+import tempfile
+import time
+import memory_store
+from jobs import MAX_QUEUED_BATCH_JOBS, MAX_QUEUED_JOBS
+from memory_store import MemoryResultStore, ResultStore, SQLiteResultStore, create_result_store
+
+
+def _sqlite_path():
+    return os.path.join(tempfile.mkdtemp(), "results.sqlite3")
+
+
+def _backends(**kwargs):
+    return [MemoryResultStore(**kwargs), SQLiteResultStore(_sqlite_path(), **kwargs)]
+
+
+def _write_keys(path, worker, count):
+    store = SQLiteResultStore(path, namespace="results", max_entries=1000)
+    for i in range(count):
+        store.set(f"{worker}-{i}", {"worker": worker, "i": i})
+
+
+def test_stores_behave_like_dicts():
+    for store in _backends():
+        store["a"] = {"sentiment": {"positive": "60%"}, "words": ["مرحبا"]}
+        assert store["a"] == {"sentiment": {"positive": "60%"}, "words": ["مرحبا"]}
+        assert "a" in store and "b" not in store
+        assert store.get("b", "missing") == "missing"
+        del store["a"]
+        assert store.get("a") is None
+        try:
+            store["a"]
+            assert False, "expected KeyError"
+        except KeyError:
+            pass
+
+
+def test_result_store_is_abstract():
+    try:
+        ResultStore()
+        assert False, "expected TypeError"
+    except TypeError:
+        pass
+
+
+def test_entries_expire_after_ttl():
+    for store in _backends(ttl=0.2):
+        store.set("job", {"status": "running"})
+        assert store.get("job") == {"status": "running"}
+        time.sleep(0.3)
+        assert store.get("job") is None, type(store).__name__
+
+
+def test_least_recently_used_entries_are_evicted():
+    for store in _backends(max_entries=2):
+        for key in ("a", "b"):
+            store.set(key, key)
+            time.sleep(0.01)
+        store.get("a")  # a is now more recent than b
+        time.sleep(0.01)
+        store.set("c", "c")
+        if isinstance(store, SQLiteResultStore):
+            store.cleanup()
+        assert store.get("b") is None, type(store).__name__
+        assert store.get("a") == "a" and store.get("c") == "c"
+
+
+def test_sqlite_cleanup_only_trims_its_own_namespace():
+    path = _sqlite_path()
+    results = SQLiteResultStore(path, namespace="results", max_entries=1)
+    jobs = SQLiteResultStore(path, namespace="jobs", max_entries=10)
+    for key in ("x", "y", "z"):
+        jobs.set(key, key)
+        results.set(key, key)
+        time.sleep(0.01)
+    results.cleanup()
+    assert [results.get(k) for k in ("x", "y", "z")] == [None, None, "z"]
+    assert [jobs.get(k) for k in ("x", "y", "z")] == ["x", "y", "z"]
+
+
+def test_two_workers_share_one_sqlite_file():
+    path = _sqlite_path()
+    first = SQLiteResultStore(path, namespace="results")
+    second = SQLiteResultStore(path, namespace="results")
+    first.set("video", {"total_words": 12})
+    assert second.get("video") == {"total_words": 12}
+    second.set("video", {"total_words": 13})
+    assert first.get("video") == {"total_words": 13}
+    second.delete("video")
+    assert first.get("video") is None
+
+    # Separate processes writing at the same time, as uvicorn workers would
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_write_keys, args=(path, worker, 50)) for worker in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+        assert worker.exitcode == 0
+    assert all(first.get(f"{w}-{i}") == {"worker": w, "i": i} for w in range(3) for i in range(50))
+
+
+def test_results_and_job_records_have_separate_caps():
+    # A full batch queue fits in both stores, so no job's result is evicted before it is read
+    assert memory_store.video_results.max_entries > MAX_QUEUED_JOBS + MAX_QUEUED_BATCH_JOBS
+    assert memory_store.job_records.max_entries > MAX_QUEUED_JOBS + MAX_QUEUED_BATCH_JOBS
+    results = create_result_store("results", 2, backend="memory")
+    jobs = create_result_store("jobs", 5, backend="memory")
+    for i in range(5):
+        jobs.set(f"job{i}", {"status": "completed"})
+        results.set(f"job{i}", {"total_words": i})
+    assert all(jobs.get(f"job{i}") for i in range(5))
+    assert [results.get(f"job{i}") for i in range(5)] == [None, None, None, {"total_words": 3}, {"total_words": 4}]
+
+
+if __name__ == "__main__":
+    print("🧪 Testing result stores...")
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for reading stored results: field projection, paging and the lazily built report.
+"""
+
+import json
+from fastapi import HTTPException
+from memory_store import video_results
+from analysis import REPORT_SECTIONS
+import main
+
+RESULT = {
+    "sentiment": {"positive": "60.0%", "negative": "10.0%", "neutral": "30.0%"},
+    "total_words": 120,
+    "speech_rate_wps": 2.1,
+    "word_repetition_analysis": {"repetition_ratio": 4, "repetition_level": "منخفض"},
+    "translation": [{"start": i, "end": i + 1, "arabic": f"مقطع {i}", "english": f"segment {i}"} for i in range(250)],
+    "sensitive_words": [],
+}
+
+
+def _store(video_id):
+    video_results[video_id] = dict(RESULT)
+    return video_id
+
+
+def _body(response):
+    return json.loads(response.body)
+
+
+def test_fields_project_sections_and_report_is_built_once():
+    video_id = _store("projection")
+    body = _body(main.get_analysis(video_id, fields="total_words,sentiment.positive,comprehensive_report.executive_summary"))
+    assert list(body) == ["total_words", "sentiment", "comprehensive_report"]
+    assert body["sentiment"] == {"positive": "60.0%"}
+    assert list(body["comprehensive_report"]) == ["executive_summary"]
+    # Only the requested section was built, and it is kept with the result
+    assert list(video_results[video_id]["comprehensive_report"]) == ["executive_summary"]
+
+    full = _body(main.get_analysis(video_id))
+    assert list(full["comprehensive_report"]) == list(REPORT_SECTIONS)
+    assert full["comprehensive_report"]["executive_summary"] == body["comprehensive_report"]["executive_summary"]
+    assert full["translation"] == RESULT["translation"]
+
+
+def test_unknown_fields_are_rejected():
+    video_id = _store("unknown")
+    for fields in ("nope", "sentiment.nope", "comprehensive_report.nope"):
+        try:
+            main.get_analysis(video_id, fields=fields)
+            assert False, f"expected 400 for {fields}"
+        except HTTPException as e:
+            assert e.status_code == 400
+
+
+def test_long_sections_are_paged():
+    video_id = _store("paged")
+    page = main.get_analysis_page(video_id, "translation", offset=200, limit=100)
+    assert page["total"] == 250 and len(page["items"]) == 50
+    assert page["items"][0]["english"] == "segment 200"
+    try:
+        main.get_analysis_page(video_id, "frequent_words", offset=0, limit=10)
+        assert False, "expected 404"
+    except HTTPException as e:
+        assert e.status_code == 404
+
+
+if __name__ == "__main__":
+    print("🧪 Testing result projection and paging...")
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
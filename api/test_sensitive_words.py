@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Tests for sensitive-word detection offsets and word timestamps.
+"""
+
+from analysis import detect_sensitive_words
+
+SEGMENT = {
+    "start": 10.0,
+    "end": 14.0,
+    "text": "وجدوا عبوة ناسفة قرب الطريق",
+    "words": [
+        {"word": " وجدوا", "start": 10.0, "end": 10.5},
+        {"word": " عبوة", "start": 10.6, "end": 11.0},
+        {"word": " ناسفة", "start": 11.1, "end": 11.7},
+        {"word": " قرب", "start": 11.8, "end": 12.2},
+        {"word": " الطريق", "start": 12.3, "end": 13.0},
+    ],
+}
+
+
+def test_phrase_gets_offsets_and_word_timestamps():
+    alerts = detect_sensitive_words([SEGMENT])
+    assert [a["word"] for a in alerts] == ["عبوة ناسفة"]
+    occurrence = alerts[0]["occurrences"][0]
+    assert SEGMENT["text"][occurrence["char_start"]:occurrence["char_end"]] == "عبوة ناسفة"
+    assert (occurrence["start"], occurrence["end"], occurrence["timing"]) == (10.6, 11.7, "word")
+
+
+def test_custom_watchlist_replaces_default():
+    watchlist = ["الطريق", "قرب"] + [f"مصطلح{i}" for i in range(3000)]
+    alerts = detect_sensitive_words([SEGMENT], watchlist)
+    assert [a["word"] for a in alerts] == ["الطريق", "قرب"]
+
+
+def test_segments_without_words_get_estimated_timing():
+    segment = {"start": 0.0, "end": 2.0, "text": "تهديد"}
+    occurrence = detect_sensitive_words([segment])[0]["occurrences"][0]
+    assert (occurrence["start"], occurrence["end"], occurrence["timing"]) == (0.0, 2.0, "estimated")
+
+
+if __name__ == "__main__":
+    print("🧪 Testing sensitive word detection...")
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for the analysis stage graph runner.
+"""
+
+import time
+import analysis
+from stages import Stage, run_stages
+
+
+def test_independent_stages_run_concurrently():
+    stages = [Stage(name, lambda: time.sleep(0.2) or 1) for name in ["a", "b", "c"]]
+    stages.append(Stage("total", lambda a, b, c: a + b + c, ["a", "b", "c"]))
+    start = time.monotonic()
+    values, errors = run_stages(stages, max_workers=3)
+    assert values["total"] == 3 and not errors
+    assert time.monotonic() - start < 0.5
+
+
+def test_failed_stage_skips_dependents_only():
+    def broken():
+        raise RuntimeError("boom")
+
+    stages = [
+        Stage("broken", broken),
+        Stage("ok", lambda: "fine"),
+        Stage("needs_broken", lambda broken: broken, ["broken"]),
+        Stage("report", lambda **done: sorted(done), ["broken", "ok"], partial=True),
+    ]
+    values, errors = run_stages(stages)
+    assert errors["broken"] == "boom"
+    assert errors["needs_broken"].startswith("skipped")
+    assert values["report"] == ["ok"]
+
+
+def test_slow_stage_times_out_without_blocking_the_rest():
+    stages = [Stage("slow", lambda: time.sleep(2), timeout=0.1), Stage("fast", lambda: 42)]
+    start = time.monotonic()
+    values, errors = run_stages(stages)
+    assert values == {"fast": 42}
+    assert errors["slow"].startswith("timed out")
+    assert time.monotonic() - start < 1
+
+
+def test_failed_sections_keep_their_type():
+    class BrokenBackend:
+        translation_placeholder = ""
+
+        def analyze(self, texts):
+            raise RuntimeError("translation timed out")
+
+    original = analysis.get_sentiment_backend
+    analysis.get_sentiment_backend = lambda: BrokenBackend()
+    sections = []
+    try:
+        result = analysis.analyze_all([{"start": 0.0, "end": 2.0, "text": "أنا سعيد جداً"}],
+                                      on_section=lambda name, value, error: sections.append((name, value, error)))
+    finally:
+        analysis.get_sentiment_backend = original
+    assert result["translation"] == [] and result["sentiment"] == {}
+    assert result["stage_errors"]["sentiment_result"] == "translation timed out"
+    assert result["stage_errors"]["translation"].startswith("skipped")
+    assert result["total_words"] == 3
+    assert ("translation", [], result["stage_errors"]["translation"]) in sections
+
+
+if __name__ == "__main__":
+    print("🧪 Testing analysis stage graph...")
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
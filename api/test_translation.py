@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Offline tests for the batched translation engine, using the local stand-in
+translator instead of Google Translate.
+"""
+
+import os
+import tempfile
+
+os.environ.setdefault("TRANSLATION_CACHE_PATH", os.path.join(tempfile.mkdtemp(), "translations.sqlite3"))
+
+from translation import LocalTranslator, TranslationCache, TranslationEngine, make_batches, translate_segments
+
+
+class MergingTranslator(LocalTranslator):
+    """Joins every line into one, like a provider that ignores the delimiter."""
+
+    def translate(self, text, source, target):
+        return super().translate(text, source, target).replace("\n", " ")
+
+
+def test_batches_respect_character_limit():
+    texts = ["أ" * 40, "ب" * 40, "ج" * 40, "د" * 100]
+    batches = make_batches(texts, max_chars=100)
+    assert [len(b) for b in batches] == [2, 1, 1]
+    assert all(len("\n".join(b)) <= 100 for b in batches[:2])
+
+
+def test_batched_results_map_back_to_segments():
+    provider = LocalTranslator()
+    engine = TranslationEngine(provider, max_chars=1000)
+    texts = ["أنا سعيد", "العمل\nممتاز", "فريق رائع"]
+    result = engine.translate(texts)
+    assert result == {"أنا سعيد": "I happy", "العمل\nممتاز": "work excellent", "فريق رائع": "team great"}
+    assert provider.calls == 1
+
+
+def test_misaligned_batch_falls_back_to_single_segments():
+    provider = MergingTranslator()
+    engine = TranslationEngine(provider, max_chars=1000)
+    result = engine.translate(["سعيد", "حزين"])
+    assert result == {"سعيد": "happy", "حزين": "sad"}
+    assert provider.calls == 3
+
+
+def test_rate_limiting_lowers_concurrency_and_retries():
+    provider = LocalTranslator(rate_limit_every=2)
+    engine = TranslationEngine(provider, max_chars=5, concurrency=4)
+    texts = ["سعيد", "حزين", "جيد", "سيء"]
+    result = engine.translate(texts)
+    assert result == {"سعيد": "happy", "حزين": "sad", "جيد": "good", "سيء": "bad"}
+    assert engine.limiter.limit < 4
+
+
+def test_failed_batch_is_not_split_into_more_requests():
+    provider = LocalTranslator(rate_limit_every=1)
+    engine = TranslationEngine(provider, max_chars=1000, max_retries=3)
+    texts = [f"سعيد {i}" for i in range(10)]
+    result = engine.translate(texts)
+    assert result == {text: None for text in texts}
+    assert provider.calls == 3
+
+
+def test_translate_segments_keeps_order_and_caches():
+    provider = LocalTranslator()
+    engine = TranslationEngine(provider)
+    texts = ["نعم", "لا", "نعم", ""]
+    assert translate_segments(texts, engine=engine) == ["yes", "not", "yes", ""]
+    calls = provider.calls
+    assert translate_segments(texts, engine=engine) == ["yes", "not", "yes", ""]
+    assert provider.calls == calls
+
+
+def test_cached_translations_are_kept_per_provider():
+    cache = TranslationCache(os.path.join(tempfile.mkdtemp(), "translations.sqlite3"))
+    cache.put_many({"سعيد": "happy"}, "ar", "en", "local")
+    assert cache.get_many(["سعيد"], "ar", "en", "local") == {"سعيد": "happy"}
+    assert cache.get_many(["سعيد"], "ar", "en", "google") == {}
+
+
+if __name__ == "__main__":
+    print("🧪 Testing translation engine...")
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
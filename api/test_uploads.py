@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for upload size limits: oversized bodies are refused before they are spooled to disk.
+"""
+
+import asyncio
+from fastapi import FastAPI, File, UploadFile
+from utils import RequestSizeLimit
+
+BOUNDARY = "limit-test"
+
+
+def _app(max_bytes):
+    app = FastAPI()
+
+    @app.post("/video")
+    async def upload(video: UploadFile = File(...)):
+        return {"size": video.size}
+
+    app.add_middleware(RequestSizeLimit, limits={"/video": max_bytes}, overhead=0)
+    return app
+
+
+def _multipart_chunks(payload_bytes, chunk_size=1024):
+    head = (f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"video\"; filename=\"a.mp4\"\r\n"
+            f"Content-Type: video/mp4\r\n\r\n").encode()
+    body = head + b"x" * payload_bytes + f"\r\n--{BOUNDARY}--\r\n".encode()
+    return [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)]
+
+
+def _post(app, chunks, content_length=None):
+    """Send chunks through the ASGI app; returns (status, number of chunks the app read)."""
+    headers = [(b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode())]
+    if content_length is not None:
+        headers.append((b"content-length", str(content_length).encode()))
+    scope = {"type": "http", "method": "POST", "path": "/video", "headers": headers, "query_string": b"",
+             "http_version": "1.1", "scheme": "http", "server": ("test", 80), "client": ("test", 1), "root_path": ""}
+    pending = list(chunks)
+    read = []
+    status = []
+
+    async def receive():
+        chunk = pending.pop(0) if pending else b""
+        read.append(chunk)
+        return {"type": "http.request", "body": chunk, "more_body": bool(pending)}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    asyncio.run(app(scope, receive, send))
+    return status[0], len(read)
+
+
+def test_small_uploads_pass():
+    chunks = _multipart_chunks(2000)
+    assert _post(_app(10_000), chunks, sum(map(len, chunks))) == (200, len(chunks))
+
+
+def test_declared_length_over_the_limit_is_refused_unread():
+    chunks = _multipart_chunks(50_000)
+    status, read = _post(_app(10_000), chunks, sum(map(len, chunks)))
+    assert status == 413 and read == 0
+
+
+def test_streamed_body_is_cut_off_at_the_limit():
+    # No Content-Length (chunked transfer): the body is counted as it arrives
+    chunks = _multipart_chunks(50_000)
+    status, read = _post(_app(10_000), chunks)
+    assert status == 413
+    assert read <= 11 < len(chunks)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing upload size limits...")
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
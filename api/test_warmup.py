@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Tests for lazy imports and the startup warm-up behind `GET /ready`.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+from warmup import Warmup
+
+
+def test_importing_the_app_leaves_heavy_dependencies_unloaded():
+    code = "import sys, main; print([m for m in ('numpy', 'groq', 'textblob', 'analysis') if m in sys.modules])"
+    completed = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).parent, capture_output=True, text=True)
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_warmup_reports_steps_and_survives_failures():
+    calls = []
+
+    def broken():
+        raise RuntimeError("no corpus")
+
+    warmup = Warmup([("first", lambda: calls.append("first")), ("broken", broken), ("last", lambda: calls.append("last"))])
+    assert not warmup.ready
+    warmup.start(enabled=True)
+    assert warmup.wait(5)
+    state = warmup.to_dict()
+    assert calls == ["first", "last"]
+    assert state["ready"] and state["status"] == "ready"
+    assert state["steps"]["broken"]["error"] == "no corpus"
+    assert "error" not in state["steps"]["first"]
+
+
+def test_disabled_warmup_is_ready_immediately():
+    warmup = Warmup([("never", lambda: 1 / 0)])
+    assert warmup.start(enabled=False) is None
+    assert warmup.ready and warmup.to_dict()["status"] == "skipped"
+
+
+if __name__ == "__main__":
+    print("🧪 Testing warm-up...")
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for per-job workspaces: cleanup, disk-budget back-pressure and orphan sweeping.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from fastapi import HTTPException
+from workspace import WorkspaceManager
+
+
+def test_release_removes_job_directory():
+    manager = WorkspaceManager(root=tempfile.mkdtemp(), budget_bytes=100)
+    workspace = manager.acquire("job", 10)
+    with open(workspace.file("video.mp4"), "wb") as f:
+        f.write(b"x" * 32)
+    assert workspace.usage() == 32
+    manager.release("job")
+    manager.release("job")
+    assert not os.path.exists(workspace.path)
+    assert manager.stats()["reserved_bytes"] == 0
+
+
+def test_new_jobs_wait_for_disk_budget():
+    manager = WorkspaceManager(root=tempfile.mkdtemp(), budget_bytes=100)
+    manager.acquire("first", 80)
+    acquired = []
+    waiter = threading.Thread(target=lambda: acquired.append(manager.acquire("second", 50, timeout=5)))
+    waiter.start()
+    time.sleep(0.1)
+    assert not acquired
+    manager.release("first")
+    waiter.join(timeout=5)
+    assert acquired and acquired[0].job_id == "second"
+
+    try:
+        manager.acquire("third", 60, timeout=0.05)
+    except HTTPException as e:
+        assert e.status_code == 503
+    else:
+        raise AssertionError("expected 503 while the budget is exhausted")
+
+
+def test_oversized_job_runs_alone():
+    manager = WorkspaceManager(root=tempfile.mkdtemp(), budget_bytes=100)
+    assert manager.acquire("big", 500, timeout=0).reserved == 500
+
+
+def test_sweep_removes_workspaces_of_dead_processes():
+    root = tempfile.mkdtemp()
+    finished = subprocess.Popen([sys.executable, "-c", "pass"])
+    finished.wait()
+    dead = os.path.join(root, f"crashed.{finished.pid}")
+    alive = os.path.join(root, f"other-worker.{os.getppid()}")
+    for path in (dead, alive):
+        os.makedirs(path)
+
+    manager = WorkspaceManager(root=root)
+    current = manager.acquire("current", 1)
+    assert manager.sweep_orphans() == 1
+    assert not os.path.exists(dead)
+    assert os.path.exists(alive) and os.path.exists(current.path)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing job workspaces...")
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
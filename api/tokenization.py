@@ -0,0 +1,84 @@
+"""
+Normalized tokenization shared by the analyzers.
+
+The transcript is tokenized once per analysis: diacritics and tatweel are
+removed, punctuation separates words, Latin letters are lowercased and the
+alef, yaa and taa marbuta variants are unified, so every analyzer counts the
+same tokens. Keyword lexicons are still matched against the original text
+(see keyword_matcher.py).
+"""
+
+import re
+from collections import Counter
+
+_DIACRITICS_RE = re.compile(r"[\u064B-\u0652\u0670\u0640]")  # tashkeel + tatweel
+_NON_WORD_RE = re.compile(r"[^\w\s]")
+_LETTER_MAP = str.maketrans({"إ": "ا", "أ": "ا", "آ": "ا", "ٱ": "ا", "ى": "ي", "ة": "ه"})
+
+
+def normalize_letters(text):
+    return text.translate(_LETTER_MAP)
+
+
+def normalize_arabic(text):
+    text = _DIACRITICS_RE.sub("", text)
+    return _NON_WORD_RE.sub(" ", normalize_letters(text))
+
+
+def surface_words(text):
+    """Words of `text` without diacritics or punctuation, letters otherwise as spoken."""
+    return _NON_WORD_RE.sub(" ", _DIACRITICS_RE.sub("", text)).lower().split()
+
+
+def normalize_phrase(phrase):
+    """Token tuple a word or phrase from a lexicon is compared as."""
+    return tuple(normalize_letters(word) for word in surface_words(phrase))
+
+
+class TokenizedTranscript:
+    """Tokens, frequencies and per-segment offsets of a transcript, built once."""
+
+    def __init__(self, transcript):
+        self.segments = transcript
+        self.text = " ".join(item['text'] for item in transcript)
+        self.tokens = []
+        # Tokens of segment i are tokens[segment_offsets[i]:segment_offsets[i + 1]]
+        self.segment_offsets = [0]
+        self._surface = {}
+        for item in transcript:
+            for word in surface_words(item['text']):
+                token = normalize_letters(word)
+                self.tokens.append(token)
+                self._surface.setdefault(token, word)
+            self.segment_offsets.append(len(self.tokens))
+        self.frequencies = Counter(self.tokens)
+
+    @classmethod
+    def from_text(cls, text):
+        return cls([{"text": text}])
+
+    @property
+    def total_words(self):
+        return len(self.tokens)
+
+    @property
+    def unique_words(self):
+        return len(self.frequencies)
+
+    def segment_tokens(self, index):
+        return self.tokens[self.segment_offsets[index]:self.segment_offsets[index + 1]]
+
+    def surface(self, token):
+        """First spoken form of a normalized token, for display."""
+        return self._surface.get(token, token)
+
+    def count(self, phrase):
+        """Occurrences of a word or multi-word phrase, compared after normalization."""
+        key = normalize_phrase(phrase)
+        if not key:
+            return 0
+        if len(key) == 1:
+            return self.frequencies[key[0]]
+        n = len(key)
+        return sum(1 for i in range(len(self.tokens) - n + 1)
+                   if self.tokens[i] == key[0] and tuple(self.tokens[i:i + n]) == key)
@@ -0,0 +1,321 @@
+"""
+Groq Whisper transcription, optionally split into concurrent chunks.
+
+Audio longer than TRANSCRIBE_CHUNK_SECONDS (or larger than Groq's 25 MB
+limit) is cut on silence boundaries into slightly overlapping chunks, the
+chunks are transcribed in parallel, and the segments and word timestamps are
+merged back onto the original timeline.
+"""
+
+import os
+import re
+import shutil
+import tempfile
+import time
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from fastapi import HTTPException
+from groq_clients import groq_clients
+from metrics import span, count, in_context
+from utils import get_ffmpeg_exe, AUDIO_SAMPLE_RATE
+
+GROQ_MAX_AUDIO_BYTES = 25 * 1024 * 1024  # Groq has a 25MB limit for audio files
+
+# "auto" chunks only when needed, "single" always sends one request, "chunked" always splits
+TRANSCRIBE_MODE = os.getenv("TRANSCRIBE_MODE", "auto")
+TRANSCRIBE_CHUNK_SECONDS = float(os.getenv("TRANSCRIBE_CHUNK_SECONDS", "600"))
+TRANSCRIBE_CHUNK_OVERLAP = float(os.getenv("TRANSCRIBE_CHUNK_OVERLAP", "2"))
+TRANSCRIBE_CONCURRENCY = int(os.getenv("TRANSCRIBE_CONCURRENCY", "3"))
+
+SILENCE_NOISE_DB = -35
+SILENCE_MIN_DURATION = 0.4
+
+_DURATION_RE = re.compile(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)")
+_SILENCE_START_RE = re.compile(r"silence_start: (-?\d+(?:\.\d+)?)")
+_SILENCE_END_RE = re.compile(r"silence_end: (-?\d+(?:\.\d+)?)")
+
+
+def _notify(progress, stage, **info):
+    if progress is not None:
+        progress(stage, **info)
+
+
+def _run_ffmpeg(args, timeout=600):
+    ffmpeg = get_ffmpeg_exe()
+    if ffmpeg is None:
+        raise RuntimeError("ffmpeg executable not found")
+    completed = subprocess.run(
+        [ffmpeg, "-nostdin", "-hide_banner", *args],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=timeout,
+    )
+    return completed.returncode, completed.stderr.decode("utf-8", errors="replace")
+
+
+def get_audio_duration(audio_path):
+    # `ffmpeg -i` without an output exits non-zero but still prints the header
+    _, stderr = _run_ffmpeg(["-i", audio_path])
+    match = _DURATION_RE.search(stderr)
+    if not match:
+        raise RuntimeError(f"Could not read audio duration of {audio_path}")
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def detect_silences(audio_path, noise_db=SILENCE_NOISE_DB, min_duration=SILENCE_MIN_DURATION):
+    """Return a list of (start, end) silent intervals found by ffmpeg's silencedetect."""
+    returncode, stderr = _run_ffmpeg([
+        "-i", audio_path,
+        "-af", f"silencedetect=noise={noise_db}dB:d={min_duration}",
+        "-f", "null", "-",
+    ])
+    if returncode != 0:
+        raise RuntimeError(f"Silence detection failed: {stderr.strip()[-500:]}")
+    silences = []
+    start = None
+    for line in stderr.splitlines():
+        start_match = _SILENCE_START_RE.search(line)
+        if start_match:
+            start = max(0.0, float(start_match.group(1)))
+            continue
+        end_match = _SILENCE_END_RE.search(line)
+        if end_match and start is not None:
+            silences.append((start, float(end_match.group(1))))
+            start = None
+    return silences
+
+
+def plan_chunks(duration, silences, target_seconds=TRANSCRIBE_CHUNK_SECONDS, overlap=TRANSCRIBE_CHUNK_OVERLAP):
+    """Choose cut points near every `target_seconds`, preferring silence midpoints.
+
+    Returns dicts with the audio range to send (`start`/`end`, widened by
+    `overlap` on each side) and the range the chunk owns on the merged
+    timeline (`own_start`/`own_end`), used to drop duplicates.
+    """
+    midpoints = [(start + end) / 2 for start, end in silences]
+    cuts = [0.0]
+    while duration - cuts[-1] > target_seconds:
+        ideal = cuts[-1] + target_seconds
+        # Only accept silences in the second half of the window so chunks stay reasonably long
+        candidates = [m for m in midpoints if cuts[-1] + target_seconds / 2 <= m <= ideal]
+        cuts.append(max(candidates) if candidates else ideal)
+    cuts.append(duration)
+
+    chunks = []
+    for index in range(len(cuts) - 1):
+        own_start, own_end = cuts[index], cuts[index + 1]
+        chunks.append({
+            "index": index,
+            "own_start": own_start,
+            "own_end": own_end,
+            "start": max(0.0, own_start - overlap),
+            "end": min(duration, own_end + overlap),
+            "last": index == len(cuts) - 2,
+        })
+    return chunks
+
+
+def cut_chunk(audio_path, chunk, output_dir):
+    chunk_path = os.path.join(output_dir, f"chunk_{chunk['index']:04d}.flac")
+    returncode, stderr = _run_ffmpeg([
+        "-loglevel", "error", "-y",
+        "-ss", f"{chunk['start']:.3f}", "-t", f"{chunk['end'] - chunk['start']:.3f}",
+        "-i", audio_path,
+        "-ac", "1", "-ar", str(AUDIO_SAMPLE_RATE), "-c:a", "flac",
+        chunk_path,
+    ])
+    if returncode != 0:
+        raise RuntimeError(f"Cutting audio chunk {chunk['index']} failed: {stderr.strip()[-500:]}")
+    return chunk_path
+
+
+def transcribe_file(clients, audio_path, progress=None, label="audio"):
+    """Send one file to Whisper with retries and return the verbose_json dict."""
+    with open(audio_path, "rb") as file:
+        audio_data = file.read()
+    print(f"📤 Sending {len(audio_data)} bytes of {label} to Groq API...")
+
+    # Add retry logic for connection issues
+    max_retries = 3
+    for attempt in range(max_retries):
+        try:
+            print(f"🔄 Transcription attempt {attempt + 1}/{max_retries} ({label})")
+            _notify(progress, "transcribing", attempt=attempt + 1, max_attempts=max_retries)
+            start_time = time.time()
+            if attempt:
+                count("transcription_retries")
+            count("transcription_upload_bytes", len(audio_data))
+
+            with span("transcription_attempt"):
+                transcription = clients.transcribe(
+                    file=(os.path.basename(audio_path), audio_data),
+                    model="whisper-large-v3",
+                    temperature=0.09,
+                    language="ar",
+                    response_format="verbose_json",
+                    timestamp_granularities=["segment", "word"],
+                )
+
+            elapsed_time = time.time() - start_time
+            print(f"✅ Transcription of {label} completed in {elapsed_time:.2f} seconds")
+            return transcription.model_dump()
+
+        except Exception as retry_error:
+            elapsed_time = time.time() - start_time
+            print(f"❌ Transcription attempt {attempt + 1} failed after {elapsed_time:.2f}s: {retry_error}")
+
+            if attempt == max_retries - 1:
+                # Last attempt failed
+                error_msg = str(retry_error).lower()
+                if "timeout" in error_msg or "connection" in error_msg:
+                    raise HTTPException(
+                        status_code=504,
+                        detail="Transcription timed out. The audio file might be too long or the server is busy. Please try with a shorter video or try again later."
+                    )
+                elif "rate limit" in error_msg:
+                    raise HTTPException(status_code=429, detail="API rate limit exceeded. Please try again later.")
+                elif "authentication" in error_msg or "unauthorized" in error_msg:
+                    raise HTTPException(status_code=401, detail="API authentication failed. Please check API key.")
+                else:
+                    raise HTTPException(
+                        status_code=500,
+                        detail=f"Transcription failed after {max_retries} attempts: {str(retry_error)}"
+                    )
+            else:
+                # Wait before retry with exponential backoff
+                wait_time = 2 ** attempt  # 2, 4, 8 seconds
+                print(f"⏳ Waiting {wait_time} seconds before retry...")
+                time.sleep(wait_time)
+
+
+def _owns(chunk, start, end):
+    # The chunk that owns an item's midpoint keeps it; the neighbour drops it
+    midpoint = (start + end) / 2
+    return chunk["own_start"] <= midpoint and (midpoint < chunk["own_end"] or chunk["last"])
+
+
+def merge_chunk_transcripts(chunk_results):
+    """Merge (chunk, verbose_json) pairs into one transcript on the original timeline."""
+    segments = []
+    words = []
+    for chunk, transcript in sorted(chunk_results, key=lambda pair: pair[0]["index"]):
+        offset = chunk["start"]
+        for segment in transcript.get("segments") or []:
+            start, end = segment["start"] + offset, segment["end"] + offset
+            if _owns(chunk, start, end):
+                segments.append({**segment, "start": start, "end": end})
+        for word in transcript.get("words") or []:
+            start, end = word["start"] + offset, word["end"] + offset
+            if _owns(chunk, start, end):
+                words.append({**word, "start": start, "end": end})
+
+    segments.sort(key=lambda s: s["start"])
+    words.sort(key=lambda w: w["start"])
+    for index, segment in enumerate(segments):
+        segment["id"] = index
+    return {
+        "text": " ".join(s["text"].strip() for s in segments),
+        "segments": segments,
+        "words": words,
+        "duration": max((chunk["end"] for chunk, _ in chunk_results), default=0.0),
+    }
+
+
+def _transcribe_chunk(clients, audio_path, chunk, chunk_count, chunk_dir):
+    chunk_path = cut_chunk(audio_path, chunk, chunk_dir)
+    return chunk, transcribe_file(clients, chunk_path, label=f"chunk {chunk['index'] + 1}/{chunk_count}")
+
+
+def transcribe_chunked(clients, audio_path, duration, progress=None, emit=None, work_dir=None):
+    silences = detect_silences(audio_path)
+    chunks = plan_chunks(duration, silences)
+    print(f"✂️ Splitting {duration:.1f}s of audio into {len(chunks)} chunks ({len(silences)} silences found)")
+
+    chunk_dir = tempfile.mkdtemp(prefix="chunks_", dir=work_dir)
+    try:
+        chunk_results = []
+        with ThreadPoolExecutor(max_workers=TRANSCRIBE_CONCURRENCY, thread_name_prefix="transcribe") as executor:
+            futures = [
+                executor.submit(in_context(_transcribe_chunk), clients, audio_path, chunk, len(chunks), chunk_dir)
+                for chunk in chunks
+            ]
+            try:
+                for future in as_completed(futures):
+                    chunk_results.append(future.result())
+                    _notify(progress, "transcribing", chunks_done=len(chunk_results), chunks=len(chunks))
+                    if emit is not None:
+                        # Segments this chunk owns, already on the original timeline
+                        chunk, _ = chunk_results[-1]
+                        segments = parse_transcript(merge_chunk_transcripts([chunk_results[-1]]))
+                        emit("transcript_chunk", chunk=chunk["index"], chunks=len(chunks), segments=segments)
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+        return merge_chunk_transcripts(chunk_results)
+    finally:
+        shutil.rmtree(chunk_dir, ignore_errors=True)
+
+
+def transcribe_audio(audio_path, progress=None, emit=None, work_dir=None):
+    """Transcribe an audio file and return the Whisper verbose_json dict.
+
+    In chunked mode `emit("transcript_chunk", ...)` receives each chunk's
+    segments as soon as that chunk is transcribed, and the chunk files are
+    cut into a temporary directory under `work_dir`.
+    """
+    print("🗣️ Starting transcription with Groq...")
+    try:
+        # Check audio file size
+        audio_size = os.path.getsize(audio_path)
+        print(f"📊 Audio file size: {audio_size / (1024*1024):.2f} MB")
+
+        mode = TRANSCRIBE_MODE
+        duration = None
+        if mode == "auto":
+            duration = get_audio_duration(audio_path)
+            too_long = duration > TRANSCRIBE_CHUNK_SECONDS + TRANSCRIBE_CHUNK_OVERLAP
+            mode = "chunked" if audio_size > GROQ_MAX_AUDIO_BYTES or too_long else "single"
+
+        if mode == "chunked":
+            if duration is None:
+                duration = get_audio_duration(audio_path)
+            return transcribe_chunked(groq_clients, audio_path, duration, progress, emit, work_dir)
+
+        if audio_size > GROQ_MAX_AUDIO_BYTES:
+            raise HTTPException(status_code=413, detail="Audio file too large (max 25MB)")
+        return transcribe_file(groq_clients, audio_path, progress)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ Transcription failed: {e}")
+        print(f"🔍 Error type: {type(e).__name__}")
+        raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}")
+
+
+def parse_transcript(transcript_dict):
+    """Flatten verbose_json into `[{start, end, text, words}]` segments."""
+    try:
+        words = sorted(transcript_dict.get("words") or [], key=lambda w: w["start"])
+        parsed_transcript = []
+        word_index = 0
+        for s in transcript_dict["segments"]:
+            segment_words = []
+            # Attach each word to the first segment that ends after it starts
+            while word_index < len(words) and words[word_index]["start"] < s["end"]:
+                segment_words.append({
+                    "word": words[word_index]["word"],
+                    "start": words[word_index]["start"],
+                    "end": words[word_index]["end"],
+                })
+                word_index += 1
+            parsed_transcript.append({"start": s["start"], "end": s["end"], "text": s["text"], "words": segment_words})
+        if parsed_transcript:
+            parsed_transcript[-1]["words"].extend(
+                {"word": w["word"], "start": w["start"], "end": w["end"]} for w in words[word_index:]
+            )
+        print(f"📝 Parsed {len(parsed_transcript)} transcript segments")
+        return parsed_transcript
+    except Exception as e:
+        print(f"❌ Transcript parsing failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Transcript parsing failed: {str(e)}")
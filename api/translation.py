@@ -0,0 +1,335 @@
+"""
+Shared Arabic -> English translation stage.
+
+Every unique segment text is translated at most once per analysis, and
+successful translations are kept in a persistent SQLite cache so phrases
+repeated across interviews are never sent to the translator again. Both the
+sentiment analysis and the `translation` output consume the same results.
+
+Uncached segments go through TranslationEngine, which packs several segments
+into each provider request (one per line, up to TRANSLATION_BATCH_CHARS),
+reuses HTTP connections and lowers its concurrency when the provider answers
+429. TRANSLATION_PROVIDER=local swaps Google for an offline stand-in.
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from metrics import count, in_context
+
+TRANSLATION_CACHE_PATH = os.getenv(
+    "TRANSLATION_CACHE_PATH",
+    os.path.join(tempfile.gettempdir(), "interview-analyzer-translations.sqlite3"),
+)
+# "google" or "local"
+TRANSLATION_PROVIDER = os.getenv("TRANSLATION_PROVIDER", "google")
+TRANSLATION_BATCH_CHARS = int(os.getenv("TRANSLATION_BATCH_CHARS", "1500"))
+TRANSLATION_CONCURRENCY = int(os.getenv("TRANSLATION_CONCURRENCY", "8"))
+TRANSLATION_MAX_RETRIES = 4
+
+# Segments are joined one per line; newlines inside a segment are flattened first
+BATCH_DELIMITER = "\n"
+
+
+class RateLimitError(Exception):
+    def __init__(self, retry_after=None):
+        super().__init__("Translation provider rate limit exceeded")
+        self.retry_after = retry_after
+
+
+class GoogleTranslateProvider:
+    """Google Translate's mobile endpoint (the one deep_translator scrapes) over a pooled session."""
+
+    NAME = "google"
+    BASE_URL = "https://translate.google.com/m"
+    MAX_CHARS = 5000
+
+    def __init__(self, pool_size=TRANSLATION_CONCURRENCY):
+        import requests
+        from requests.adapters import HTTPAdapter
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+
+    def translate(self, text, source, target):
+        from bs4 import BeautifulSoup
+        response = self._session.get(self.BASE_URL, params={"sl": source, "tl": target, "q": text}, timeout=(5, 30))
+        if response.status_code == 429:
+            retry_after = response.headers.get("Retry-After")
+            raise RateLimitError(float(retry_after) if retry_after and retry_after.isdigit() else None)
+        response.raise_for_status()
+        soup = BeautifulSoup(response.text, "html.parser")
+        element = soup.find("div", {"class": "t0"}) or soup.find("div", {"class": "result-container"})
+        if element is None:
+            raise RuntimeError("Translation not found in provider response")
+        return element.get_text().strip()
+
+    def close(self):
+        self._session.close()
+
+
+class LocalTranslator:
+    """Offline stand-in provider for tests and benchmarks.
+
+    Translates word by word from a small dictionary (unknown words are kept),
+    preserves line structure like the real provider, and can simulate latency
+    and rate limiting.
+    """
+
+    NAME = "local"
+    MAX_CHARS = 5000
+
+    DICTIONARY = {
+        "أنا": "I", "سعيد": "happy", "حزين": "sad", "جيد": "good", "ممتاز": "excellent",
+        "سيء": "bad", "مشكلة": "problem", "أحب": "love", "العمل": "work", "فريق": "team",
+        "لا": "not", "نعم": "yes", "خوف": "fear", "قلق": "worried", "رائع": "great",
+    }
+
+    def __init__(self, latency=0.0, rate_limit_every=0):
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def translate(self, text, source, target):
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        if self.latency:
+            time.sleep(self.latency)
+        if self.rate_limit_every and call % self.rate_limit_every == 0:
+            raise RateLimitError(retry_after=0)
+        return BATCH_DELIMITER.join(
+            " ".join(self.DICTIONARY.get(word, word) for word in line.split())
+            for line in text.split(BATCH_DELIMITER)
+        )
+
+    def close(self):
+        pass
+
+
+class AdaptiveLimiter:
+    """Concurrency limit that halves on rate limiting and creeps back up on success."""
+
+    def __init__(self, max_limit):
+        self.max_limit = max(1, max_limit)
+        self.limit = self.max_limit
+        self._in_flight = 0
+        self._successes = 0
+        self._cond = threading.Condition()
+
+    def __enter__(self):
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+        return self
+
+    def __exit__(self, *exc):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self):
+        with self._cond:
+            self._successes += 1
+            if self.limit < self.max_limit and self._successes >= self.limit:
+                self.limit += 1
+                self._successes = 0
+                self._cond.notify_all()
+
+    def on_rate_limited(self):
+        with self._cond:
+            self.limit = max(1, self.limit // 2)
+            self._successes = 0
+
+
+def make_batches(texts, max_chars):
+    """Group texts into newline-joined batches no longer than `max_chars`."""
+    batches = []
+    current = []
+    length = 0
+    for text in texts:
+        extra = len(text) + (len(BATCH_DELIMITER) if current else 0)
+        if current and length + extra > max_chars:
+            batches.append(current)
+            current, length = [], 0
+            extra = len(text)
+        current.append(text)
+        length += extra
+    if current:
+        batches.append(current)
+    return batches
+
+
+class TranslationEngine:
+    def __init__(self, provider, max_chars=TRANSLATION_BATCH_CHARS, concurrency=TRANSLATION_CONCURRENCY, max_retries=TRANSLATION_MAX_RETRIES):
+        self.provider = provider
+        self.max_chars = min(max_chars, provider.MAX_CHARS)
+        self.limiter = AdaptiveLimiter(concurrency)
+        self.max_retries = max_retries
+
+    def _request(self, text, source, target):
+        for attempt in range(self.max_retries):
+            if attempt:
+                count("translation_retries")
+            try:
+                count("translation_requests")
+                with self.limiter:
+                    translated = self.provider.translate(text, source, target)
+                self.limiter.on_success()
+                return translated
+            except RateLimitError as e:
+                self.limiter.on_rate_limited()
+                wait_time = e.retry_after if e.retry_after is not None else 2 ** attempt
+                print(f"⏳ Translation rate limited, concurrency now {self.limiter.limit}, waiting {wait_time}s...")
+                time.sleep(wait_time)
+        raise RateLimitError()
+
+    def _translate_batch(self, batch, source, target):
+        """Translate one batch, returning a list aligned with `batch` (None on failure)."""
+        try:
+            translated = self._request(BATCH_DELIMITER.join(batch), source, target)
+        except Exception as e:
+            # Rate limited past the retries, or a transport error: splitting the batch
+            # would only send more requests to a provider that is already failing
+            print(f"Translation error: {e}")
+            return [None] * len(batch)
+
+        lines = translated.split(BATCH_DELIMITER)
+        if len(lines) == len(batch):
+            return [line.strip() for line in lines]
+
+        if len(batch) == 1:
+            return [translated.strip() or None]
+        # The provider merged or split lines, so the batch can't be realigned; retry each segment alone
+        return [self._translate_batch([text], source, target)[0] for text in batch]
+
+    def translate(self, texts, source='ar', target='en'):
+        """Translate unique, non-empty texts and return {text: translation or None}."""
+        flattened = {text: " ".join(text.split()) for text in texts}
+        batches = make_batches([flattened[text] for text in texts], self.max_chars)
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.limiter.max_limit, thread_name_prefix="translate") as executor:
+            for batch, translated in zip(batches, executor.map(in_context(lambda b: self._translate_batch(b, source, target)), batches)):
+                results.update(zip(batch, translated))
+        return {text: results.get(flattened[text]) for text in texts}
+
+
+class TranslationCache:
+    """Persistent (provider, source, target, text) -> translation map, safe across processes.
+
+    The provider is part of the key so the offline stand-in's output is never
+    served as a real translation from a shared cache file.
+    """
+
+    def __init__(self, path=TRANSLATION_CACHE_PATH):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                " key TEXT PRIMARY KEY, source TEXT NOT NULL, target TEXT NOT NULL,"
+                " text TEXT NOT NULL, translation TEXT NOT NULL)"
+            )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _key(provider, source, target, text):
+        return hashlib.sha256(f"{provider}:{source}:{target}:{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, texts, source, target, provider=TRANSLATION_PROVIDER):
+        keys = {self._key(provider, source, target, text): text for text in texts}
+        found = {}
+        conn = self._connect()
+        key_list = list(keys)
+        # Stay under SQLite's bound-parameter limit
+        for i in range(0, len(key_list), 500):
+            batch = key_list[i:i + 500]
+            rows = conn.execute(
+                f"SELECT key, translation FROM translations WHERE key IN ({','.join('?' * len(batch))})",
+                batch,
+            ).fetchall()
+            for key, translation in rows:
+                found[keys[key]] = translation
+        return found
+
+    def put_many(self, translations, source, target, provider=TRANSLATION_PROVIDER):
+        if not translations:
+            return
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO translations (key, source, target, text, translation) VALUES (?, ?, ?, ?, ?)",
+                [(self._key(provider, source, target, text), source, target, text, translation)
+                 for text, translation in translations.items()],
+            )
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_translation_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = TranslationCache()
+            except sqlite3.Error as e:
+                print(f"⚠️ Translation cache unavailable: {e}")
+                return None
+        return _cache
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def create_translation_provider(name=TRANSLATION_PROVIDER):
+    if name == "google":
+        return GoogleTranslateProvider()
+    if name == "local":
+        return LocalTranslator()
+    raise ValueError(f"Unknown TRANSLATION_PROVIDER: {name}")
+
+
+def get_translation_engine():
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = TranslationEngine(create_translation_provider())
+        return _engine
+
+
+def translate_segments(texts, source='ar', target='en', engine=None):
+    """Translate a list of texts, returning translations in the same order.
+
+    Failed translations are returned as None so callers can decide how to
+    degrade (neutral sentiment, placeholder text, ...).
+    """
+    unique_texts = [t for t in dict.fromkeys(texts) if t and t.strip()]
+    engine = engine or get_translation_engine()
+    cache = get_translation_cache()
+    results = cache.get_many(unique_texts, source, target, engine.provider.NAME) if cache else {}
+
+    missing = [t for t in unique_texts if t not in results]
+    if missing:
+        translated = engine.translate(missing, source, target)
+        fresh = {t: tr for t, tr in translated.items() if tr is not None}
+        if cache:
+            cache.put_many(fresh, source, target, engine.provider.NAME)
+        results.update(translated)
+
+    return [results.get(t) if t and t.strip() else t for t in texts]
@@ -1,12 +1,234 @@
-from moviepy.editor import VideoFileClip
 import os
 import uuid
+import shutil
+import hashlib
 import tempfile
+import threading
+import subprocess
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 
-def extract_audio(video_path):
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MB
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_MB", "500")) * 1024 * 1024
+# Room for multipart headers and the other form fields around the video
+UPLOAD_FORM_OVERHEAD = 1024 * 1024
+
+# "ffmpeg" (default) or "moviepy"
+AUDIO_EXTRACTOR = os.getenv("AUDIO_EXTRACTOR", "ffmpeg")
+# "flac" (lossless) or "opus" (smallest upload)
+AUDIO_FORMAT = os.getenv("AUDIO_FORMAT", "flac")
+AUDIO_SAMPLE_RATE = 16000  # Whisper resamples everything to 16 kHz mono
+AUDIO_EXTRACT_TIMEOUT = float(os.getenv("AUDIO_EXTRACT_TIMEOUT", "600"))
+
+# Codec arguments and file extension for each output format
+_AUDIO_CODECS = {
+    "flac": (["-c:a", "flac", "-f", "flac"], ".flac"),
+    "opus": (["-c:a", "libopus", "-b:a", "32k", "-application", "voip", "-f", "ogg"], ".ogg"),
+    "wav": (["-c:a", "pcm_s16le", "-f", "wav"], ".wav"),
+    # Raw samples, used when streaming audio into memory
+    "s16le": (["-c:a", "pcm_s16le", "-f", "s16le"], ".pcm"),
+    "f32le": (["-c:a", "pcm_f32le", "-f", "f32le"], ".pcm"),
+}
+
+def get_ffmpeg_exe():
+    """Return the ffmpeg binary on PATH, or the one bundled with moviepy."""
+    exe = shutil.which("ffmpeg")
+    if exe:
+        return exe
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return None
+
+def _ffmpeg_command(video_path, output, fmt, sample_rate):
+    ffmpeg = get_ffmpeg_exe()
+    if ffmpeg is None:
+        raise RuntimeError("ffmpeg executable not found")
+    if fmt not in _AUDIO_CODECS:
+        raise ValueError(f"Unsupported audio format: {fmt}")
+    codec_args, _ = _AUDIO_CODECS[fmt]
+    return [
+        ffmpeg, "-nostdin", "-hide_banner", "-loglevel", "error", "-y",
+        "-i", video_path,
+        "-vn", "-sn", "-dn",  # decode the audio stream only
+        "-ac", "1", "-ar", str(sample_rate),
+        *codec_args, output,
+    ]
+
+def extract_audio_ffmpeg(video_path, fmt=AUDIO_FORMAT, sample_rate=AUDIO_SAMPLE_RATE, timeout=AUDIO_EXTRACT_TIMEOUT, output_dir=None):
+    """Extract a mono, 16 kHz compressed audio track in one ffmpeg pass."""
+    _, extension = _AUDIO_CODECS.get(fmt, (None, ".audio"))
+    audio_filename = f"{uuid.uuid4().hex}_audio{extension}"
+    audio_output_path = os.path.join(output_dir or tempfile.gettempdir(), audio_filename)
+    command = _ffmpeg_command(video_path, audio_output_path, fmt, sample_rate)
+    try:
+        completed = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        if os.path.exists(audio_output_path):
+            os.remove(audio_output_path)
+        raise RuntimeError(f"ffmpeg timed out after {timeout:.0f} seconds")
+    if completed.returncode != 0:
+        if os.path.exists(audio_output_path):
+            os.remove(audio_output_path)
+        stderr = completed.stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"ffmpeg failed ({completed.returncode}): {stderr[-500:]}")
+    return audio_output_path
+
+def stream_audio(video_path, fmt="s16le", sample_rate=AUDIO_SAMPLE_RATE, chunk_size=64 * 1024, timeout=AUDIO_EXTRACT_TIMEOUT):
+    """Yield the decoded audio track as it is produced by ffmpeg.
+
+    The process is killed when the consumer stops iterating or when
+    `timeout` seconds have elapsed.
+    """
+    command = _ffmpeg_command(video_path, "pipe:1", fmt, sample_rate)
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    timer = threading.Timer(timeout, process.kill)
+    timer.start()
+    try:
+        while True:
+            chunk = process.stdout.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+        returncode = process.wait()
+        if not timer.is_alive():
+            raise RuntimeError(f"ffmpeg timed out after {timeout:.0f} seconds")
+        if returncode != 0:
+            stderr = process.stderr.read().decode("utf-8", errors="replace").strip()
+            raise RuntimeError(f"ffmpeg failed ({returncode}): {stderr[-500:]}")
+    finally:
+        timer.cancel()
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        process.stderr.close()
+
+def decode_audio(path, sample_rate=AUDIO_SAMPLE_RATE, timeout=AUDIO_EXTRACT_TIMEOUT, output_dir=None):
+    """Decode a media file once into a read-only, memory-mapped mono float32 array at `sample_rate`.
+
+    Samples are streamed to a scratch file in `output_dir` rather than held in
+    memory, so a long interview costs disk pages the OS can drop, not heap.
+    The file is unlinked as soon as it is mapped and disappears with the array.
+    """
+    import numpy as np
+    fd, scratch_path = tempfile.mkstemp(dir=output_dir, suffix=".f32")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in stream_audio(path, fmt="f32le", sample_rate=sample_rate, chunk_size=1024 * 1024, timeout=timeout):
+                f.write(chunk)
+            n_samples = f.tell() // 4
+        if n_samples == 0:
+            return np.zeros(0, dtype=np.float32)
+        return np.memmap(scratch_path, dtype=np.float32, mode="r", shape=(n_samples,))
+    finally:
+        os.remove(scratch_path)
+
+def extract_audio_moviepy(video_path, output_dir=None):
+    from moviepy.editor import VideoFileClip
     audio_filename = f"{uuid.uuid4().hex}_audio.wav"
     # Use temp directory instead of uploads folder
-    audio_output_path = os.path.join(tempfile.gettempdir(), audio_filename)
+    audio_output_path = os.path.join(output_dir or tempfile.gettempdir(), audio_filename)
     video_clip = VideoFileClip(video_path)
-    video_clip.audio.write_audiofile(audio_output_path, logger=None)
+    try:
+        video_clip.audio.write_audiofile(audio_output_path, logger=None)
+    finally:
+        video_clip.close()
     return audio_output_path
+
+def extract_audio(video_path, output_dir=None):
+    if AUDIO_EXTRACTOR == "moviepy" or get_ffmpeg_exe() is None:
+        return extract_audio_moviepy(video_path, output_dir=output_dir)
+    return extract_audio_ffmpeg(video_path, output_dir=output_dir)
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """Return `(size_in_bytes, sha256_hex)` of a file on disk."""
+    sha256 = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            size += len(chunk)
+            sha256.update(chunk)
+    return size, sha256.hexdigest()
+
+def _too_large(max_bytes, what="Video file"):
+    return HTTPException(status_code=413, detail=f"{what} too large (max {max_bytes // (1024 * 1024)}MB)")
+
+class RequestSizeLimit:
+    """ASGI middleware capping request bodies per path while they stream in.
+
+    Starlette spools a multipart form to a temporary file before the endpoint
+    runs, so the limit has to be applied here: a larger Content-Length is
+    refused straight away, and a body that grows past the limit (chunked, or
+    lying about its length) is cut off with a 413 as soon as it does.
+    `limits` maps a path to the most upload bytes it accepts; `overhead` is
+    allowed on top for the multipart framing and the other form fields.
+    """
+
+    def __init__(self, app, limits, overhead=UPLOAD_FORM_OVERHEAD):
+        self.app = app
+        self.limits = limits
+        self.overhead = overhead
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if not limit:
+            await self.app(scope, receive, send)
+            return
+        max_bytes = limit + self.overhead
+
+        length = dict(scope["headers"]).get(b"content-length", b"")
+        if length.isdigit() and int(length) > max_bytes:
+            error = _too_large(limit, "Upload")
+            print(f"🚫 Refused {int(length)} byte request to {scope['path']}")
+            await JSONResponse(status_code=error.status_code, content={"detail": error.detail})(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    raise _too_large(limit, "Upload")
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+async def save_upload(upload, destination, max_bytes=MAX_UPLOAD_BYTES, chunk_size=UPLOAD_CHUNK_SIZE):
+    """Copy a parsed UploadFile to `destination` chunk by chunk.
+
+    Returns `(size_in_bytes, sha256_hex)`. Raises a 413 HTTPException (and
+    removes the partial file) when the upload exceeds `max_bytes`; uploads
+    whose size is already known are refused before anything is copied.
+    RequestSizeLimit keeps oversized bodies from being received at all.
+    """
+    if max_bytes and upload.size is not None and upload.size > max_bytes:
+        raise _too_large(max_bytes)
+    sha256 = hashlib.sha256()
+    size = 0
+    f = await run_in_threadpool(open, destination, "wb")
+    try:
+        while True:
+            chunk = await upload.read(chunk_size)
+            if not chunk:
+                break
+            size += len(chunk)
+            if max_bytes and size > max_bytes:
+                raise _too_large(max_bytes)
+            sha256.update(chunk)
+            await run_in_threadpool(f.write, chunk)
+    except BaseException:
+        await run_in_threadpool(f.close)
+        if os.path.exists(destination):
+            os.remove(destination)
+        raise
+    await run_in_threadpool(f.close)
+    return size, sha256.hexdigest()
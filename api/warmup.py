@@ -0,0 +1,102 @@
+"""
+Background warm-up of the heavy parts of the pipeline.
+
+Importing the API stays cheap: the analyzers (numpy, prosody), the sentiment
+backend (TextBlob and its lexicon), the translator, the Groq client and the
+ffmpeg binary are loaded by the stages that use them. At startup `start()`
+loads them all on a background thread so the first upload doesn't pay for
+it; `GET /ready` reports 503 until that has finished. Set
+WARMUP_ON_STARTUP=false to skip it (the API is then ready immediately and
+loads everything on first use).
+"""
+
+import os
+import time
+import threading
+
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "true").lower() in ("1", "true", "yes")
+
+
+def _analysis():
+    import analysis
+    analysis.warm_up()
+
+
+def _sentiment():
+    from sentiment import get_sentiment_backend
+    get_sentiment_backend().warm_up()
+
+
+def _translation():
+    from translation import get_translation_cache, get_translation_engine, TRANSLATION_PROVIDER
+    get_translation_cache()
+    get_translation_engine()
+    if TRANSLATION_PROVIDER == "google":
+        import bs4  # noqa: F401  (parses every Google response)
+
+
+def _groq():
+    from groq_clients import groq_clients
+    groq_clients.client()
+
+
+def _ffmpeg():
+    from utils import get_ffmpeg_exe
+    get_ffmpeg_exe()
+
+
+STEPS = [
+    ("analysis", _analysis),
+    ("sentiment", _sentiment),
+    ("translation", _translation),
+    ("groq_client", _groq),
+    ("ffmpeg", _ffmpeg),
+]
+
+
+class Warmup:
+    def __init__(self, steps=STEPS):
+        self.steps = steps
+        self.status = "pending"
+        self.seconds = None
+        self.results = {}
+        self._done = threading.Event()
+
+    @property
+    def ready(self):
+        return self._done.is_set()
+
+    def run(self):
+        """Run every step; a failing step is reported but doesn't block readiness."""
+        self.status = "running"
+        started = time.perf_counter()
+        for name, step in self.steps:
+            step_started = time.perf_counter()
+            try:
+                step()
+                self.results[name] = {"seconds": round(time.perf_counter() - step_started, 3)}
+            except Exception as e:
+                print(f"⚠️ Warm-up step {name} failed: {e}")
+                self.results[name] = {"seconds": round(time.perf_counter() - step_started, 3), "error": str(e)}
+        self.seconds = round(time.perf_counter() - started, 3)
+        self.status = "ready"
+        self._done.set()
+        print(f"🔥 Warm-up finished in {self.seconds:.2f}s")
+
+    def start(self, enabled=WARMUP_ON_STARTUP):
+        if not enabled:
+            self.status = "skipped"
+            self._done.set()
+            return None
+        thread = threading.Thread(target=self.run, name="warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def to_dict(self):
+        return {"ready": self.ready, "status": self.status, "seconds": self.seconds, "steps": dict(self.results)}
+
+
+warmup = Warmup()
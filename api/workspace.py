@@ -0,0 +1,155 @@
+"""
+Per-job working directories with a shared disk budget.
+
+Every job gets its own directory under WORKSPACE_ROOT for the upload, the
+extracted audio and transcription chunks; the whole directory is removed when
+the job finishes, fails or is cancelled. Each workspace reserves an estimate
+of the disk it will use, and new jobs wait (up to WORKSPACE_WAIT_SECONDS)
+while the reservations would exceed WORKSPACE_DISK_BUDGET_MB. Directories
+left behind by crashed workers are swept at startup.
+"""
+
+import os
+import time
+import shutil
+import tempfile
+import threading
+from fastapi import HTTPException
+
+WORKSPACE_ROOT = os.getenv("WORKSPACE_ROOT", os.path.join(tempfile.gettempdir(), "interview-analyzer-jobs"))
+WORKSPACE_DISK_BUDGET_BYTES = int(os.getenv("WORKSPACE_DISK_BUDGET_MB", "4096")) * 1024 * 1024
+WORKSPACE_WAIT_SECONDS = float(os.getenv("WORKSPACE_WAIT_SECONDS", "300"))
+# Directories of live processes older than this are treated as orphans too
+WORKSPACE_ORPHAN_MAX_AGE = int(os.getenv("WORKSPACE_ORPHAN_MAX_AGE", str(24 * 3600)))
+
+# Disk reserved per job: the upload plus room for extracted audio and chunks
+RESERVE_FACTOR = 1.5
+MIN_RESERVE_BYTES = 64 * 1024 * 1024
+# Scratch per second of audio for a file read in place: decoded float32 samples
+# plus at most 16-bit samples each for the extracted track and its chunks
+SCRATCH_BYTES_PER_SECOND = 16000 * (4 + 2 + 2)
+
+
+def estimate_reservation(upload_bytes):
+    return max(MIN_RESERVE_BYTES, int((upload_bytes or 0) * RESERVE_FACTOR))
+
+
+def estimate_scratch(duration_seconds):
+    """Disk needed by a job whose input is read in place rather than copied into its workspace."""
+    return max(MIN_RESERVE_BYTES, int(duration_seconds * SCRATCH_BYTES_PER_SECOND))
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+class Workspace:
+    def __init__(self, job_id, path, reserved):
+        self.job_id = job_id
+        self.path = path
+        self.reserved = reserved
+
+    def file(self, name):
+        return os.path.join(self.path, os.path.basename(name))
+
+    def usage(self):
+        total = 0
+        for directory, _, files in os.walk(self.path):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(directory, name))
+                except OSError:
+                    pass
+        return total
+
+
+class WorkspaceManager:
+    def __init__(self, root=WORKSPACE_ROOT, budget_bytes=WORKSPACE_DISK_BUDGET_BYTES):
+        self.root = root
+        self.budget_bytes = budget_bytes
+        self._workspaces = {}
+        self._cond = threading.Condition()
+
+    @property
+    def reserved_bytes(self):
+        return sum(workspace.reserved for workspace in self._workspaces.values())
+
+    @property
+    def free_bytes(self):
+        with self._cond:
+            return max(0, self.budget_bytes - self.reserved_bytes)
+
+    def acquire(self, job_id, reserve_bytes, timeout=WORKSPACE_WAIT_SECONDS):
+        """Create the job's directory, blocking while the disk budget is exhausted.
+
+        A job larger than the whole budget still runs once nothing else holds
+        a reservation, so it cannot wait forever. `timeout=None` waits until
+        the space is freed, for jobs that are already on a worker.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._workspaces and self.reserved_bytes + reserve_bytes > self.budget_bytes:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise HTTPException(status_code=503, detail="Server is out of working disk space. Please try again later.")
+                print(f"⏳ Waiting for disk budget ({self.reserved_bytes / 1e6:.0f}/{self.budget_bytes / 1e6:.0f} MB reserved)")
+                self._cond.wait(remaining)
+            path = os.path.join(self.root, f"{job_id}.{os.getpid()}")
+            os.makedirs(path, exist_ok=True)
+            workspace = Workspace(job_id, path, reserve_bytes)
+            self._workspaces[job_id] = workspace
+            return workspace
+
+    def release(self, job_id):
+        """Delete the job's directory and free its reservation (safe to call twice)."""
+        with self._cond:
+            workspace = self._workspaces.pop(job_id, None)
+            self._cond.notify_all()
+        if workspace is not None:
+            shutil.rmtree(workspace.path, ignore_errors=True)
+            print(f"🧹 Removed workspace of job {job_id}")
+
+    def sweep_orphans(self):
+        """Remove workspaces of dead processes (and very old ones) left by crashes."""
+        if not os.path.isdir(self.root):
+            return 0
+        with self._cond:
+            active = {workspace.path for workspace in self._workspaces.values()}
+        removed = 0
+        now = time.time()
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if path in active or not os.path.isdir(path):
+                continue
+            _, _, pid = name.rpartition(".")
+            owner_alive = pid.isdigit() and int(pid) != os.getpid() and _pid_alive(int(pid))
+            try:
+                too_old = now - os.path.getmtime(path) > WORKSPACE_ORPHAN_MAX_AGE
+            except OSError:
+                continue
+            if owner_alive and not too_old:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+        if removed:
+            print(f"🧹 Swept {removed} orphaned job workspaces from {self.root}")
+        return removed
+
+    def stats(self):
+        with self._cond:
+            return {
+                "active_workspaces": len(self._workspaces),
+                "reserved_bytes": self.reserved_bytes,
+                "budget_bytes": self.budget_bytes,
+            }
+
+
+workspace_manager = WorkspaceManager()